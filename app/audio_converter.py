@@ -0,0 +1,156 @@
+"""
+Audio Converter for Voice Stream Application
+Converts any ffmpeg-readable audio to 16 kHz mono PCM in memory, spilling large inputs to disk
+"""
+
+import io
+import os
+import subprocess
+import tempfile
+import logging
+from typing import Optional, Union
+
+import numpy as np
+
+from app.audio_io import wav_header, to_pcm16
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AudioConversionError(Exception):
+    """Raised when ffmpeg cannot decode the input"""
+
+class ConvertedAudio:
+    """
+    Decoded mono audio held as 16-bit PCM, with float samples and WAV bytes derived on demand
+    """
+
+    def __init__(self, pcm: np.ndarray, sample_rate: int):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self._samples = None
+        self._wav_bytes = None
+
+    @classmethod
+    def from_samples(cls, samples, sample_rate: int) -> 'ConvertedAudio':
+        """Build from float samples in [-1, 1]"""
+        return cls(to_pcm16(samples), sample_rate)
+
+    @property
+    def samples(self) -> np.ndarray:
+        """Float32 samples in [-1, 1]"""
+        if self._samples is None:
+            self._samples = self.pcm.astype(np.float32) / 32768.0
+        return self._samples
+
+    @property
+    def wav_bytes(self) -> bytes:
+        """16-bit mono WAV encoding"""
+        if self._wav_bytes is None:
+            self._wav_bytes = wav_header(len(self.pcm), self.sample_rate) + self.pcm.tobytes()
+        return self._wav_bytes
+
+    def wav_file(self) -> io.BytesIO:
+        """WAV encoding as a fresh file-like object"""
+        buffer = io.BytesIO(self.wav_bytes)
+        buffer.name = 'audio.wav'
+        return buffer
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds"""
+        return len(self.pcm) / self.sample_rate
+
+class AudioConverter:
+    """
+    Pipes audio through ffmpeg and reads raw PCM back without temporary files
+    """
+
+    def __init__(self):
+        # Conversion configuration from environment variables
+        self.sample_rate = int(os.getenv('AUDIO_SAMPLE_RATE', '16000'))
+        # Inputs larger than this are written to a temp file instead of held in the pipe
+        self.spill_threshold = int(os.getenv('AUDIO_SPILL_THRESHOLD_BYTES', str(50 * 1024 * 1024)))
+        self.timeout = float(os.getenv('AUDIO_CONVERSION_TIMEOUT', '300'))
+
+    def _ffmpeg_command(self, input_spec: str):
+        return [
+            'ffmpeg', '-loglevel', 'error', '-i', input_spec,
+            '-vn', '-acodec', 'pcm_s16le', '-ar', str(self.sample_rate), '-ac', '1',
+            '-f', 's16le', 'pipe:1'
+        ]
+
+    def _run(self, input_spec: str, data: Optional[Union[bytes, memoryview]] = None) -> ConvertedAudio:
+        """Run ffmpeg and wrap its raw PCM output"""
+        try:
+            result = subprocess.run(
+                self._ffmpeg_command(input_spec),
+                input=data,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise AudioConversionError(f"ffmpeg timed out after {self.timeout}s")
+        except FileNotFoundError:
+            raise AudioConversionError("ffmpeg not found on PATH")
+
+        if result.returncode != 0 or not result.stdout:
+            raise AudioConversionError(result.stderr.decode(errors='replace').strip() or 'ffmpeg produced no audio')
+
+        pcm = np.frombuffer(result.stdout[:len(result.stdout) - len(result.stdout) % 2], dtype='<i2')
+        return ConvertedAudio(pcm, self.sample_rate)
+
+    def convert_bytes(self, data: Union[bytes, bytearray, memoryview], suffix: str = '') -> ConvertedAudio:
+        """
+        Decode in-memory audio
+
+        Small inputs are piped to ffmpeg. Inputs above the spill threshold, and
+        containers ffmpeg cannot read from a pipe (e.g. MP4 with a trailing moov
+        atom), go through a temp file that is always removed.
+
+        Args:
+            data: Encoded audio
+            suffix: File extension hint for the spill file
+
+        Returns:
+            ConvertedAudio: Decoded audio
+
+        Raises:
+            AudioConversionError: ffmpeg could not decode the input
+        """
+        if len(data) <= self.spill_threshold:
+            try:
+                return self._run('pipe:0', data)
+            except AudioConversionError as e:
+                logger.info(f"Pipe conversion failed ({e}), retrying from a seekable file")
+
+        fd, temp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return self._run(temp_path)
+        finally:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def convert_file(self, path: str) -> ConvertedAudio:
+        """
+        Decode an audio file on disk
+
+        Args:
+            path: Path to the audio file
+
+        Returns:
+            ConvertedAudio: Decoded audio
+
+        Raises:
+            AudioConversionError: ffmpeg could not decode the input
+        """
+        return self._run(path)
+
+# Global audio converter instance
+audio_converter = AudioConverter()
@@ -0,0 +1,69 @@
+"""
+Audio Frame protocol for Voice Stream Application
+Binary Socket.IO audio messages: a length-prefixed JSON metadata header followed by raw audio bytes
+"""
+
+import json
+import struct
+import logging
+from typing import Dict, Any, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Frame layout: [uint16 big-endian header length][UTF-8 JSON header][audio bytes]
+FRAME_PREFIX = struct.Struct('>H')
+MAX_HEADER_BYTES = 4096
+
+class AudioFrameError(ValueError):
+    """Raised for frames that are truncated or carry an unreadable header"""
+
+def encode_audio_frame(header: Dict[str, Any], audio: bytes) -> bytes:
+    """
+    Build a binary audio frame
+
+    Args:
+        header: Metadata such as session, seq, codec and processing options
+        audio: Encoded audio bytes
+
+    Returns:
+        bytes: Frame ready to emit
+    """
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    if len(header_bytes) > MAX_HEADER_BYTES:
+        raise AudioFrameError(f"Frame header is {len(header_bytes)} bytes, limit is {MAX_HEADER_BYTES}")
+    return FRAME_PREFIX.pack(len(header_bytes)) + header_bytes + bytes(audio)
+
+def decode_audio_frame(data) -> Tuple[Dict[str, Any], memoryview]:
+    """
+    Split a binary audio frame into its header and audio payload without copying the audio
+
+    Args:
+        data: Frame as received from Socket.IO (bytes, bytearray or memoryview)
+
+    Returns:
+        tuple: (header dict, memoryview over the audio bytes)
+
+    Raises:
+        AudioFrameError: The frame is malformed
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise AudioFrameError(f"Expected binary frame, got {type(data).__name__}")
+    view = memoryview(data).cast('B')
+    if len(view) < FRAME_PREFIX.size:
+        raise AudioFrameError("Frame shorter than its length prefix")
+
+    header_length = FRAME_PREFIX.unpack_from(view)[0]
+    header_end = FRAME_PREFIX.size + header_length
+    if header_length > MAX_HEADER_BYTES or header_end > len(view):
+        raise AudioFrameError(f"Invalid frame header length {header_length}")
+
+    try:
+        header = json.loads(bytes(view[FRAME_PREFIX.size:header_end]).decode('utf-8'))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise AudioFrameError(f"Unreadable frame header: {e}")
+    if not isinstance(header, dict):
+        raise AudioFrameError("Frame header must be a JSON object")
+
+    return header, view[header_end:]
@@ -0,0 +1,136 @@
+"""
+Audio I/O helpers for Voice Stream Application
+Builds in-memory WAV buffers from decoded audio so segments never touch the disk
+"""
+
+import io
+import struct
+import logging
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def wav_header(num_samples: int, sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    Build a canonical 44-byte RIFF/WAVE header for PCM data
+
+    Args:
+        num_samples: Number of samples per channel
+        sample_rate: Sample rate in Hz
+        channels: Number of interleaved channels
+        sample_width: Bytes per sample
+
+    Returns:
+        bytes: Header to prepend to the PCM payload
+    """
+    block_align = channels * sample_width
+    data_size = num_samples * block_align
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', data_size
+    )
+
+def read_wav_info(data, total_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse the chunks of a RIFF/WAVE file without decoding samples
+
+    Args:
+        data: WAV file content as bytes or memoryview (only the header chunks are read)
+        total_size: Size of the whole file when data holds only its first bytes
+
+    Returns:
+        dict: Format fields plus 'data_offset' and 'data_size', or None if not a WAV file
+    """
+    view = memoryview(data)
+    if len(view) < 12 or bytes(view[0:4]) != b'RIFF' or bytes(view[8:12]) != b'WAVE':
+        return None
+
+    if total_size is None:
+        total_size = len(view)
+
+    info: Dict[str, Any] = {}
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        chunk_size = struct.unpack_from('<I', view, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b'fmt ' and body + 16 <= len(view):
+            audio_format, channels, sample_rate, byte_rate, block_align, bits = struct.unpack_from('<HHIIHH', view, body)
+            info.update({
+                'audio_format': audio_format,
+                'channels': channels,
+                'sample_rate': sample_rate,
+                'byte_rate': byte_rate,
+                'block_align': block_align,
+                'bits_per_sample': bits
+            })
+        elif chunk_id == b'data':
+            # Streamed WAVs (e.g. ffmpeg writing to a pipe) leave the size as a placeholder
+            if chunk_size in (0, 0xFFFFFFFF) or body + chunk_size > total_size:
+                chunk_size = total_size - body
+            info['data_offset'] = body
+            info['data_size'] = chunk_size
+            break
+        offset = body + chunk_size + (chunk_size & 1)
+
+    if 'sample_rate' not in info or 'data_offset' not in info:
+        return None
+    return info
+
+def to_pcm16(samples) -> np.ndarray:
+    """
+    Convert float audio in [-1, 1] to mono little-endian 16-bit PCM
+
+    Args:
+        samples: Array or tensor shaped (samples,) or (channels, samples)
+
+    Returns:
+        np.ndarray: int16 samples
+    """
+    if hasattr(samples, 'detach'):
+        samples = samples.detach().cpu().numpy()
+    samples = np.asarray(samples)
+    if samples.ndim == 2:
+        samples = samples.mean(axis=0)
+    if samples.dtype == np.int16:
+        return samples.astype('<i2', copy=False)
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
+
+class PcmBuffer:
+    """
+    Decoded audio held once as 16-bit PCM and sliced into WAV buffers by time
+    """
+
+    def __init__(self, samples, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._pcm = memoryview(to_pcm16(samples).tobytes())
+        self.num_samples = len(self._pcm) // 2
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds"""
+        return self.num_samples / self.sample_rate
+
+    def slice_wav(self, start: float, end: Optional[float] = None) -> io.BytesIO:
+        """
+        Get a WAV file for the audio between two timestamps
+
+        Args:
+            start: Segment start in seconds
+            end: Segment end in seconds, or None for the end of the audio
+
+        Returns:
+            io.BytesIO: WAV file with a synthesized header over the PCM slice
+        """
+        start_sample = max(0, min(int(start * self.sample_rate), self.num_samples))
+        end_sample = self.num_samples if end is None else max(start_sample, min(int(end * self.sample_rate), self.num_samples))
+        payload = self._pcm[start_sample * 2:end_sample * 2]
+        buffer = io.BytesIO(wav_header(end_sample - start_sample, self.sample_rate) + payload)
+        buffer.name = 'segment.wav'
+        return buffer
@@ -0,0 +1,253 @@
+"""
+Audio Probe for Voice Stream Application
+Reads duration and format from container headers without decoding samples, falling back to ffprobe
+"""
+
+import os
+import struct
+import subprocess
+import logging
+from typing import Optional, Dict, Any, Union
+
+from app.audio_io import read_wav_info
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes read from the start of a file; enough for WAV/FLAC/MP3 headers and the WebM Info element
+PROBE_HEADER_BYTES = 64 * 1024
+
+# MPEG audio bitrate tables in kbps, indexed by [version is MPEG-1][layer][bitrate index]
+_MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+# Matroska/WebM element IDs
+_EBML_HEADER = 0x1A45DFA3
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_CLUSTER = 0x1F43B675
+
+def _probe_wav(view: memoryview, total_size: int) -> Optional[Dict[str, Any]]:
+    info = read_wav_info(view, total_size)
+    if not info or not info.get('block_align'):
+        return None
+    frames = info['data_size'] // info['block_align']
+    return {
+        'format': 'wav',
+        'duration': frames / info['sample_rate'],
+        'sample_rate': info['sample_rate'],
+        'channels': info['channels']
+    }
+
+def _probe_flac(view: memoryview) -> Optional[Dict[str, Any]]:
+    # STREAMINFO is always the first metadata block
+    if len(view) < 26 or bytes(view[0:4]) != b'fLaC' or (view[4] & 0x7F) != 0:
+        return None
+    packed = struct.unpack_from('>Q', view, 18)[0]
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        return None
+    return {
+        'format': 'flac',
+        'duration': total_samples / sample_rate,
+        'sample_rate': sample_rate,
+        'channels': ((packed >> 41) & 0x7) + 1
+    }
+
+def _probe_mp3(view: memoryview, total_size: int) -> Optional[Dict[str, Any]]:
+    offset = 0
+    scan = 0
+    if bytes(view[0:3]) == b'ID3' and len(view) >= 10:
+        tag_size = (view[6] << 21) | (view[7] << 14) | (view[8] << 7) | view[9]
+        offset = 10 + tag_size + (10 if view[5] & 0x10 else 0)
+        scan = 4096  # Encoders may pad between the tag and the first frame
+
+    # Find the first frame header
+    limit = min(len(view) - 4, offset + scan + 1)
+    while offset < limit and not (view[offset] == 0xFF and (view[offset + 1] & 0xE0) == 0xE0):
+        offset += 1
+    if offset >= limit:
+        return None
+
+    header = struct.unpack_from('>I', view, offset)[0]
+    version = (header >> 19) & 0x3
+    layer = 4 - ((header >> 17) & 0x3)
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 0x3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    channels = 1 if ((header >> 6) & 0x3) == 3 else 2
+    samples_per_frame = 384 if layer == 1 else (1152 if layer == 2 or mpeg1 else 576)
+
+    # A second frame header where the first frame ends rules out a chance sync match
+    padding = (header >> 9) & 0x1
+    if layer == 1:
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    following = offset + frame_length
+    if following + 2 <= len(view) and not (view[following] == 0xFF and (view[following + 1] & 0xE0) == 0xE0):
+        return None
+
+    # VBR files carry a frame count in a Xing/Info or VBRI header inside the first frame
+    side_info = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+    frames = None
+    xing = offset + 4 + side_info
+    if xing + 12 <= len(view) and bytes(view[xing:xing + 4]) in (b'Xing', b'Info'):
+        if struct.unpack_from('>I', view, xing + 4)[0] & 0x1:
+            frames = struct.unpack_from('>I', view, xing + 8)[0]
+    vbri = offset + 36
+    if frames is None and vbri + 18 <= len(view) and bytes(view[vbri:vbri + 4]) == b'VBRI':
+        frames = struct.unpack_from('>I', view, vbri + 14)[0]
+
+    if frames:
+        duration = frames * samples_per_frame / sample_rate
+    else:
+        # Constant bitrate: audio bytes over byte rate
+        duration = (total_size - offset) * 8 / bitrate
+    return {'format': 'mp3', 'duration': duration, 'sample_rate': sample_rate, 'channels': channels}
+
+def _read_vint(view: memoryview, offset: int, keep_marker: bool):
+    """Read an EBML variable-length integer, returning (value, length) or (None, 0)"""
+    if offset >= len(view):
+        return None, 0
+    first = view[offset]
+    length = 1
+    while length <= 8 and not (first & (0x80 >> (length - 1))):
+        length += 1
+    if length > 8 or offset + length > len(view):
+        return None, 0
+    value = first if keep_marker else first & (0xFF >> length)
+    for byte in view[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = -1  # Unknown size, as written by live recorders
+    return value, length
+
+def _probe_webm(view: memoryview) -> Optional[Dict[str, Any]]:
+    element_id, id_len = _read_vint(view, 0, True)
+    if element_id != _EBML_HEADER:
+        return None
+    size, size_len = _read_vint(view, id_len, False)
+    if size is None or size < 0:
+        return None
+    offset = id_len + size_len + size
+
+    element_id, id_len = _read_vint(view, offset, True)
+    size, size_len = _read_vint(view, offset + id_len, False)
+    if element_id != _EBML_SEGMENT or size is None:
+        return None
+    offset += id_len + size_len
+
+    # Walk the Segment's children up to the first Cluster looking for Info
+    while offset < len(view):
+        element_id, id_len = _read_vint(view, offset, True)
+        size, size_len = _read_vint(view, offset + id_len, False)
+        if element_id is None or size is None or element_id == _EBML_CLUSTER:
+            return None
+        body = offset + id_len + size_len
+        if element_id == _EBML_INFO:
+            if size < 0 or body + size > len(view):
+                return None
+            timecode_scale = 1000000
+            duration_ticks = None
+            child = body
+            while child < body + size:
+                child_id, child_id_len = _read_vint(view, child, True)
+                child_size, child_size_len = _read_vint(view, child + child_id_len, False)
+                if child_id is None or child_size is None or child_size < 0:
+                    return None
+                value = view[child + child_id_len + child_size_len:child + child_id_len + child_size_len + child_size]
+                if child_id == _EBML_TIMECODE_SCALE:
+                    timecode_scale = int.from_bytes(value, 'big')
+                elif child_id == _EBML_DURATION and child_size in (4, 8):
+                    duration_ticks = struct.unpack('>f' if child_size == 4 else '>d', value)[0]
+                child += child_id_len + child_size_len + child_size
+            # MediaRecorder output has no Duration element; only ffprobe can tell
+            if not duration_ticks:
+                return None
+            return {'format': 'webm', 'duration': duration_ticks * timecode_scale / 1e9, 'sample_rate': None, 'channels': None}
+        if size < 0:
+            return None
+        offset = body + size
+    return None
+
+def probe_header(data, total_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read format and duration from the first bytes of an audio file
+
+    Args:
+        data: File content, or only its first bytes (PROBE_HEADER_BYTES is enough)
+        total_size: Size of the whole file when data is a prefix
+
+    Returns:
+        dict: 'format', 'duration', 'sample_rate' and 'channels', or None if the header does not say
+    """
+    view = memoryview(data).cast('B')
+    if total_size is None:
+        total_size = len(view)
+    if len(view) < 12:
+        return None
+    try:
+        if bytes(view[0:4]) == b'RIFF':
+            return _probe_wav(view, total_size)
+        if bytes(view[0:4]) == b'fLaC':
+            return _probe_flac(view)
+        if bytes(view[0:4]) == b'\x1A\x45\xDF\xA3':
+            return _probe_webm(view)
+        return _probe_mp3(view, total_size)
+    except (struct.error, IndexError, ValueError) as e:
+        logger.warning(f"Header probe failed: {e}")
+        return None
+
+def _ffprobe_duration(source: Union[str, bytes]) -> Optional[float]:
+    """Ask ffprobe for the container duration"""
+    is_path = isinstance(source, str)
+    try:
+        result = subprocess.run([
+            'ffprobe', '-v', 'quiet', '-show_entries',
+            'format=duration', '-of', 'csv=p=0', source if is_path else 'pipe:0'
+        ], input=None if is_path else source, capture_output=True, timeout=30)
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+def probe_duration(source: Union[str, bytes, bytearray, memoryview]) -> float:
+    """
+    Get the duration of an audio file, reading only its header when possible
+
+    Args:
+        source: Path to the file, or its content
+
+    Returns:
+        float: Duration in seconds, or 0 if it cannot be determined
+    """
+    if isinstance(source, str):
+        try:
+            total_size = os.path.getsize(source)
+            with open(source, 'rb') as f:
+                header = f.read(PROBE_HEADER_BYTES)
+        except OSError:
+            return 0
+        info = probe_header(header, total_size)
+    else:
+        info = probe_header(source)
+        source = bytes(source)
+
+    if info:
+        return info['duration']
+    return _ffprobe_duration(source) or 0
@@ -4,16 +4,23 @@ Handles both SQLite3 and DynamoDB storage based on configuration
 """
 
 import os
+import base64
+import queue
 import sqlite3
-import boto3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from botocore.exceptions import ClientError, NoCredentialsError
 from dotenv import load_dotenv
 import logging
 from typing import Optional, Dict, List, Any
 import json
 from datetime import datetime
+from decimal import Decimal
 import time
 
+from app.ids import id_generator
+
 # Load environment variables
 load_dotenv()
 
@@ -21,6 +28,114 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# SQLite schema migrations as (version, statements); applied in order and tracked in PRAGMA user_version
+SQLITE_MIGRATIONS = [
+    (1, [
+        'CREATE INDEX IF NOT EXISTS idx_annotations_project_deleted_created ON annotations (project_id, deleted, created_at)',
+        'CREATE INDEX IF NOT EXISTS idx_annotations_audio_filename ON annotations (audio_filename)'
+    ]),
+    # Listings filter on deleted = 'N' so they can walk the project index in created_at order
+    (2, [
+        "UPDATE annotations SET deleted = 'N' WHERE deleted IS NULL"
+    ]),
+    # Per-project counters kept current by triggers, so listing projects does not aggregate annotations
+    (3, [
+        'ALTER TABLE projects ADD COLUMN annotation_count INTEGER NOT NULL DEFAULT 0',
+        'ALTER TABLE projects ADD COLUMN total_duration REAL NOT NULL DEFAULT 0',
+        'ALTER TABLE projects ADD COLUMN start_stop_count INTEGER NOT NULL DEFAULT 0',
+        'ALTER TABLE projects ADD COLUMN streaming_count INTEGER NOT NULL DEFAULT 0',
+        '''CREATE TRIGGER IF NOT EXISTS trg_annotations_count_insert AFTER INSERT ON annotations
+           WHEN NEW.deleted IS NULL OR NEW.deleted = 'N'
+           BEGIN
+               UPDATE projects SET annotation_count = annotation_count + 1,
+                                   total_duration = total_duration + COALESCE(NEW.duration, 0),
+                                   start_stop_count = start_stop_count + (NEW.recording_mode = 'start-stop'),
+                                   streaming_count = streaming_count + (NEW.recording_mode = 'streaming')
+               WHERE id = NEW.project_id;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_annotations_count_soft_delete AFTER UPDATE OF deleted ON annotations
+           WHEN (OLD.deleted IS NULL OR OLD.deleted = 'N') AND NEW.deleted = 'Y'
+           BEGIN
+               UPDATE projects SET annotation_count = annotation_count - 1,
+                                   total_duration = total_duration - COALESCE(OLD.duration, 0),
+                                   start_stop_count = start_stop_count - (OLD.recording_mode = 'start-stop'),
+                                   streaming_count = streaming_count - (OLD.recording_mode = 'streaming')
+               WHERE id = OLD.project_id;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_annotations_count_restore AFTER UPDATE OF deleted ON annotations
+           WHEN OLD.deleted = 'Y' AND (NEW.deleted IS NULL OR NEW.deleted = 'N')
+           BEGIN
+               UPDATE projects SET annotation_count = annotation_count + 1,
+                                   total_duration = total_duration + COALESCE(NEW.duration, 0),
+                                   start_stop_count = start_stop_count + (NEW.recording_mode = 'start-stop'),
+                                   streaming_count = streaming_count + (NEW.recording_mode = 'streaming')
+               WHERE id = NEW.project_id;
+           END''',
+        '''CREATE TRIGGER IF NOT EXISTS trg_annotations_count_delete AFTER DELETE ON annotations
+           WHEN OLD.deleted IS NULL OR OLD.deleted = 'N'
+           BEGIN
+               UPDATE projects SET annotation_count = annotation_count - 1,
+                                   total_duration = total_duration - COALESCE(OLD.duration, 0),
+                                   start_stop_count = start_stop_count - (OLD.recording_mode = 'start-stop'),
+                                   streaming_count = streaming_count - (OLD.recording_mode = 'streaming')
+               WHERE id = OLD.project_id;
+           END'''
+    ])
+]
+
+# Recomputes the SQLite project counters from the annotations table
+SQLITE_REBUILD_COUNTERS = '''
+    UPDATE projects SET
+        annotation_count = (SELECT COUNT(*) FROM annotations a WHERE a.project_id = projects.id AND a.deleted = 'N'),
+        total_duration = (SELECT COALESCE(SUM(a.duration), 0) FROM annotations a WHERE a.project_id = projects.id AND a.deleted = 'N'),
+        start_stop_count = (SELECT COUNT(*) FROM annotations a WHERE a.project_id = projects.id AND a.deleted = 'N' AND a.recording_mode = 'start-stop'),
+        streaming_count = (SELECT COUNT(*) FROM annotations a WHERE a.project_id = projects.id AND a.deleted = 'N' AND a.recording_mode = 'streaming')
+'''
+
+# Counter attributes kept on each project
+PROJECT_COUNTER_FIELDS = ('annotation_count', 'total_duration', 'start_stop_count', 'streaming_count')
+
+# DynamoDB index serving audio filename lookups
+FILENAME_INDEX_NAME = 'audio_filename-index'
+FILENAME_INDEX = {
+    'IndexName': FILENAME_INDEX_NAME,
+    'KeySchema': [
+        {'AttributeName': 'audio_filename', 'KeyType': 'HASH'}
+    ],
+    'Projection': {'ProjectionType': 'INCLUDE', 'NonKeyAttributes': ['audio_path', 'project_id']}
+}
+
+# DynamoDB index serving annotation listings newest-first
+PROJECT_CREATED_INDEX_NAME = 'project_id-created_at-index'
+PROJECT_CREATED_INDEX = {
+    'IndexName': PROJECT_CREATED_INDEX_NAME,
+    'KeySchema': [
+        {'AttributeName': 'project_id', 'KeyType': 'HASH'},
+        {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+    ],
+    'Projection': {'ProjectionType': 'ALL'}
+}
+
+# Indexes added to annotations tables created before them; every key attribute is a string
+MIGRATED_INDEXES = (FILENAME_INDEX, PROJECT_CREATED_INDEX)
+
+# Annotation fields that listings can project, in SQLite column order
+ANNOTATION_FIELDS = ('id', 'audio_filename', 'audio_path', 'transcript', 'original_transcript', 'recording_mode',
+                     'language', 'duration', 'created_at', 'updated_at')
+
+def _encode_cursor(position: Dict[str, Any]) -> str:
+    """Opaque URL-safe page cursor"""
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(position, dict):
+        raise ValueError('Invalid cursor')
+    return position
+
 class DatabaseManager:
     """
     Manages database operations for both SQLite3 and DynamoDB
@@ -28,10 +143,18 @@ class DatabaseManager:
 
     def __init__(self):
         # Database configuration from environment variables
-        self.db_mode = os.getenv('DATABASE_MODE', 'sqlite').lower()  # 'sqlite' or 'dynamodb'
+        self._db_mode = os.getenv('DATABASE_MODE', 'sqlite').lower()  # 'sqlite' or 'dynamodb'
 
         # SQLite Configuration
         self.sqlite_db_path = os.getenv('SQLITE_DB_PATH', 'audio_annotations.db')
+        self.sqlite_pool_size = max(1, int(os.getenv('SQLITE_POOL_SIZE', '8')))
+        self.sqlite_busy_timeout_ms = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+        self.sqlite_journal_mode = os.getenv('SQLITE_JOURNAL_MODE', 'WAL').upper()
+        self.sqlite_synchronous = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+        self.sqlite_statement_cache = int(os.getenv('SQLITE_STATEMENT_CACHE', '256'))
+        self._sqlite_pool: queue.LifoQueue = queue.LifoQueue(maxsize=self.sqlite_pool_size)
+        self.sqlite_connections_opened = 0
+        self._sqlite_stats_lock = threading.Lock()
 
         # DynamoDB Configuration
         self.dynamodb_region = os.getenv('DYNAMODB_REGION', 'us-east-1')
@@ -40,18 +163,55 @@ class DatabaseManager:
         self.projects_table = os.getenv('DYNAMODB_PROJECTS_TABLE', 'voice_stream_projects')
         self.annotations_table = os.getenv('DYNAMODB_ANNOTATIONS_TABLE', 'voice_stream_annotations')
 
-        # Initialize database client
+        # In-process LRU of audio filename lookups
+        self.filename_cache_size = int(os.getenv('ANNOTATION_FILENAME_CACHE_SIZE', '4096'))
+        self._filename_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._filename_cache_lock = threading.Lock()
+        self.filename_cache_hits = 0
+        self.filename_cache_misses = 0
+        self._active_indexes = set()
+        self._indexes_checked_at = 0.0
+
+        # Annotation listing page sizes
+        self.annotation_page_size = int(os.getenv('ANNOTATION_PAGE_SIZE', '50'))
+        self.annotation_max_page_size = int(os.getenv('ANNOTATION_MAX_PAGE_SIZE', '500'))
+
+        # Database clients are created on first use so importing this module stays fast
         self.dynamodb_client = None
         self.dynamodb_resource = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self.init_time_seconds = None
+
+    @property
+    def db_mode(self) -> str:
+        """Active backend ('sqlite' or 'dynamodb'), connecting to it on first access"""
+        self.ensure_initialized()
+        return self._db_mode
+
+    def ensure_initialized(self):
+        """Connect to the configured backend and create tables, once per process"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            start = time.perf_counter()
+            if self._db_mode == 'dynamodb':
+                self._initialize_dynamodb_client()
+            else:
+                self._initialize_sqlite_db()
+            self.init_time_seconds = time.perf_counter() - start
+            self._initialized = True
 
-        if self.db_mode == 'dynamodb':
-            self._initialize_dynamodb_client()
-        else:
-            self._initialize_sqlite_db()
+    def is_initialized(self) -> bool:
+        return self._initialized
 
     def _initialize_dynamodb_client(self):
         """Initialize AWS DynamoDB client with error handling"""
         try:
+            import boto3
+
             if self.dynamodb_access_key and self.dynamodb_secret_key:
                 self.dynamodb_client = boto3.client(
                     'dynamodb',
@@ -76,11 +236,11 @@ class DatabaseManager:
 
         except NoCredentialsError:
             logger.error("❌ AWS credentials not found. Falling back to SQLite.")
-            self.db_mode = 'sqlite'
+            self._db_mode = 'sqlite'
             self._initialize_sqlite_db()
         except Exception as e:
             logger.error(f"❌ Failed to initialize DynamoDB client: {str(e)}. Falling back to SQLite.")
-            self.db_mode = 'sqlite'
+            self._db_mode = 'sqlite'
             self._initialize_sqlite_db()
 
     def _setup_dynamodb_tables(self):
@@ -112,8 +272,13 @@ class DatabaseManager:
 
             # Create Annotations table
             try:
-                self.dynamodb_client.describe_table(TableName=self.annotations_table)
+                description = self.dynamodb_client.describe_table(TableName=self.annotations_table)['Table']
                 logger.info(f"✅ Annotations table '{self.annotations_table}' already exists")
+                try:
+                    self._migrate_indexes(description)
+                except ClientError as migration_error:
+                    # Reads fall back without the indexes; a missing UpdateTable permission must not disable DynamoDB
+                    logger.warning(f"Could not add annotation indexes: {str(migration_error)}")
             except ClientError as e:
                 if e.response['Error']['Code'] == 'ResourceNotFoundException':
                     logger.info(f"📝 Creating annotations table: {self.annotations_table}")
@@ -124,7 +289,9 @@ class DatabaseManager:
                         ],
                         AttributeDefinitions=[
                             {'AttributeName': 'id', 'AttributeType': 'S'},
-                            {'AttributeName': 'project_id', 'AttributeType': 'S'}
+                            {'AttributeName': 'project_id', 'AttributeType': 'S'},
+                            {'AttributeName': 'audio_filename', 'AttributeType': 'S'},
+                            {'AttributeName': 'created_at', 'AttributeType': 'S'}
                         ],
                         GlobalSecondaryIndexes=[
                             {
@@ -133,67 +300,186 @@ class DatabaseManager:
                                     {'AttributeName': 'project_id', 'KeyType': 'HASH'}
                                 ],
                                 'Projection': {'ProjectionType': 'ALL'}
-                            }
+                            },
+                            FILENAME_INDEX,
+                            PROJECT_CREATED_INDEX
                         ],
                         BillingMode='PAY_PER_REQUEST'
                     )
                     # Wait for table to be created
                     waiter = self.dynamodb_client.get_waiter('table_exists')
                     waiter.wait(TableName=self.annotations_table, WaiterConfig={'Delay': 2, 'MaxAttempts': 30})
+                    self._active_indexes = {FILENAME_INDEX_NAME, PROJECT_CREATED_INDEX_NAME}
                     logger.info(f"✅ Annotations table created successfully")
                 else:
                     raise e
 
+            try:
+                self._backfill_project_counters_dynamodb()
+            except ClientError as backfill_error:
+                # Projects still missing counters are rebuilt when they are first read
+                logger.warning(f"Could not backfill annotation counters: {str(backfill_error)}")
+
         except Exception as e:
             logger.error(f"❌ Failed to setup DynamoDB tables: {str(e)}")
             raise e
 
+    def _migrate_indexes(self, description: Dict[str, Any]):
+        """
+        Record which annotation indexes are ACTIVE and add the next missing one
+
+        DynamoDB builds one new index per table at a time and backfills it in
+        the background, so later missing indexes are added by the periodic
+        re-check once the previous one is done. Reads fall back until an index is ACTIVE.
+        """
+        indexes = {index['IndexName']: index for index in description.get('GlobalSecondaryIndexes', [])}
+        self._active_indexes = {name for name, index in indexes.items() if index['IndexStatus'] == 'ACTIVE'}
+        self._indexes_checked_at = time.monotonic()
+        if any(index['IndexStatus'] == 'CREATING' for index in indexes.values()):
+            return
+        missing = [index for index in MIGRATED_INDEXES if index['IndexName'] not in indexes]
+        if not missing:
+            return
+
+        index = dict(missing[0])
+        if description.get('BillingModeSummary', {}).get('BillingMode') != 'PAY_PER_REQUEST':
+            throughput = description['ProvisionedThroughput']
+            index['ProvisionedThroughput'] = {
+                'ReadCapacityUnits': throughput['ReadCapacityUnits'],
+                'WriteCapacityUnits': throughput['WriteCapacityUnits']
+            }
+        logger.info(f"📝 Adding {index['IndexName']} to {self.annotations_table}")
+        self.dynamodb_client.update_table(
+            TableName=self.annotations_table,
+            # UpdateTable needs a definition for every key attribute of the new index, not only new ones
+            AttributeDefinitions=[
+                {'AttributeName': key['AttributeName'], 'AttributeType': 'S'} for key in index['KeySchema']
+            ],
+            GlobalSecondaryIndexUpdates=[{'Create': index}]
+        )
+
+    def _index_ready(self, index_name: str) -> bool:
+        """Whether an annotations index is ACTIVE, re-checking pending indexes at most once a minute"""
+        if index_name in self._active_indexes:
+            return True
+        if time.monotonic() - self._indexes_checked_at < 60:
+            return False
+        try:
+            self._migrate_indexes(self.dynamodb_client.describe_table(TableName=self.annotations_table)['Table'])
+            if index_name in self._active_indexes:
+                logger.info(f"✅ {index_name} is active")
+        except Exception as e:
+            self._indexes_checked_at = time.monotonic()
+            logger.warning(f"Could not check annotation index status: {str(e)}")
+        return index_name in self._active_indexes
+
     def _initialize_sqlite_db(self):
         """Initialize SQLite database with required tables"""
         try:
-            conn = sqlite3.connect(self.sqlite_db_path)
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    workspace_path TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS annotations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_id INTEGER NOT NULL,
-                    audio_filename TEXT NOT NULL,
-                    audio_path TEXT NOT NULL,
-                    transcript TEXT NOT NULL,
-                    original_transcript TEXT,
-                    recording_mode TEXT NOT NULL,
-                    language TEXT DEFAULT 'en',
-                    duration REAL,
-                    deleted TEXT DEFAULT 'N',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES projects (id)
-                )
-            ''')
-
-            # Add deleted column if it doesn't exist
-            try:
-                conn.execute('ALTER TABLE annotations ADD COLUMN deleted TEXT DEFAULT "N"')
-                conn.commit()
-            except sqlite3.OperationalError:
-                pass  # Column already exists
-
-            conn.commit()
-            conn.close()
-            logger.info(f"✅ SQLite database initialized: {self.sqlite_db_path}")
+            with self._sqlite_connection() as conn:
+                self._create_sqlite_schema(conn)
+            logger.info(f"✅ SQLite database initialized: {self.sqlite_db_path} (journal_mode={self.sqlite_journal_mode})")
 
         except Exception as e:
             logger.error(f"❌ Failed to initialize SQLite database: {str(e)}")
             raise e
 
+    def _open_sqlite_connection(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent use"""
+        if self.sqlite_journal_mode not in ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'OFF'):
+            raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE: {self.sqlite_journal_mode}")
+        if self.sqlite_synchronous not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f"Unsupported SQLITE_SYNCHRONOUS: {self.sqlite_synchronous}")
+
+        conn = sqlite3.connect(
+            self.sqlite_db_path,
+            timeout=self.sqlite_busy_timeout_ms / 1000,
+            check_same_thread=False,  # Connections move between threads through the pool, never shared
+            cached_statements=self.sqlite_statement_cache
+        )
+        # WAL lets readers proceed while one writer commits; NORMAL only syncs at checkpoints
+        conn.execute(f'PRAGMA journal_mode = {self.sqlite_journal_mode}')
+        conn.execute(f'PRAGMA synchronous = {self.sqlite_synchronous}')
+        conn.execute(f'PRAGMA busy_timeout = {self.sqlite_busy_timeout_ms}')
+        with self._sqlite_stats_lock:
+            self.sqlite_connections_opened += 1
+        return conn
+
+    @contextmanager
+    def _sqlite_connection(self):
+        """
+        Borrow a pooled SQLite connection
+
+        Commits when the block succeeds and rolls back when it raises. Up to
+        sqlite_pool_size idle connections are kept; extra ones are closed.
+        """
+        try:
+            conn = self._sqlite_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_sqlite_connection()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            try:
+                self._sqlite_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _create_sqlite_schema(self, conn: sqlite3.Connection):
+        """Create tables and apply column additions"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS projects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                workspace_path TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS annotations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id INTEGER NOT NULL,
+                audio_filename TEXT NOT NULL,
+                audio_path TEXT NOT NULL,
+                transcript TEXT NOT NULL,
+                original_transcript TEXT,
+                recording_mode TEXT NOT NULL,
+                language TEXT DEFAULT 'en',
+                duration REAL,
+                deleted TEXT DEFAULT 'N',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (project_id) REFERENCES projects (id)
+            )
+        ''')
+
+        # Add deleted column if it doesn't exist
+        try:
+            conn.execute('ALTER TABLE annotations ADD COLUMN deleted TEXT DEFAULT "N"')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+        self._migrate_sqlite(conn)
+
+    def _migrate_sqlite(self, conn: sqlite3.Connection):
+        """Apply schema migrations newer than the database's user_version"""
+        current_version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for version, statements in SQLITE_MIGRATIONS:
+            if version <= current_version:
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            if version == 3:
+                conn.execute(SQLITE_REBUILD_COUNTERS)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+            logger.info(f"✅ Applied SQLite migration {version}")
+
     # Project Management Methods
     def get_projects(self) -> List[Dict[str, Any]]:
         """Get all projects with annotation counts"""
@@ -202,6 +488,13 @@ class DatabaseManager:
         else:
             return self._get_projects_sqlite()
 
+    def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Get one project by id without annotation counts, or None if it does not exist"""
+        if self.db_mode == 'dynamodb':
+            return self._get_project_dynamodb(project_id)
+        else:
+            return self._get_project_sqlite(project_id)
+
     def create_project(self, project_name: str, description: str, workspace_path: str) -> str:
         """Create a new project"""
         if self.db_mode == 'dynamodb':
@@ -216,6 +509,60 @@ class DatabaseManager:
         else:
             return self._get_project_annotations_sqlite(project_id)
 
+    def list_project_annotations(self, project_id: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get one page of a project's annotations
+
+        Args:
+            project_id: Project id
+            limit: Page size, clamped to annotation_max_page_size (default annotation_page_size)
+            cursor: next_cursor from the previous page, or None for the first page
+            fields: Annotation fields to return (id and created_at are always included), or None for all
+
+        Returns:
+            dict: 'annotations', 'next_cursor' (None on the last page) and 'has_more'
+
+        Raises:
+            ValueError: For an invalid cursor or unknown field, or a non-integer SQLite project id
+        """
+        limit = max(1, min(int(limit or self.annotation_page_size), self.annotation_max_page_size))
+        if fields:
+            unknown = [field for field in fields if field not in ANNOTATION_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            fields = [field for field in ANNOTATION_FIELDS if field in fields or field in ('id', 'created_at')]
+        else:
+            fields = list(ANNOTATION_FIELDS)
+        position = _decode_cursor(cursor) if cursor else None
+
+        if self.db_mode == 'dynamodb':
+            return self._list_project_annotations_dynamodb(project_id, limit, position, fields)
+        else:
+            return self._list_project_annotations_sqlite(project_id, limit, position, fields)
+
+    def get_annotation_summary(self, project_id: str) -> Dict[str, Any]:
+        """Get a project's annotation count, total duration and counts per recording mode"""
+        if self.db_mode == 'dynamodb':
+            return self._get_annotation_summary_dynamodb(project_id)
+        else:
+            return self._get_annotation_summary_sqlite(project_id)
+
+    def rebuild_annotation_counters(self, project_id: Optional[str] = None) -> int:
+        """
+        Recompute maintained project counters from the annotations, repairing any drift
+
+        Args:
+            project_id: Project to rebuild, or None for every project
+
+        Returns:
+            int: Number of projects rebuilt
+        """
+        if self.db_mode == 'dynamodb':
+            return self._rebuild_annotation_counters_dynamodb(project_id)
+        else:
+            return self._rebuild_annotation_counters_sqlite(project_id)
+
     def save_annotation(self, project_id: str, audio_filename: str, audio_path: str,
                        transcript: str, recording_mode: str, language: str, duration: float) -> str:
         """Save a new annotation"""
@@ -226,6 +573,25 @@ class DatabaseManager:
             return self._save_annotation_sqlite(project_id, audio_filename, audio_path,
                                               transcript, recording_mode, language, duration)
 
+    def save_annotations_bulk(self, project_id: str, annotations: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save many annotations to one project in a single write
+
+        Args:
+            project_id: Project the annotations belong to
+            annotations: Dicts with audio_filename, audio_path, transcript,
+                recording_mode, language and duration
+
+        Returns:
+            list: New annotation IDs, in the order given
+        """
+        if not annotations:
+            return []
+        if self.db_mode == 'dynamodb':
+            return self._save_annotations_bulk_dynamodb(project_id, annotations)
+        else:
+            return self._save_annotations_bulk_sqlite(project_id, annotations)
+
     def update_transcript(self, annotation_id: str, transcript: str) -> bool:
         """Update annotation transcript"""
         if self.db_mode == 'dynamodb':
@@ -241,27 +607,40 @@ class DatabaseManager:
             return self._delete_annotation_sqlite(annotation_id)
 
     def get_annotation_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
-        """Get annotation by audio filename"""
+        """Get annotation by audio filename, served from an in-process LRU after the first lookup"""
+        with self._filename_cache_lock:
+            cached = self._filename_cache.get(filename)
+            if cached is not None:
+                self._filename_cache.move_to_end(filename)
+                self.filename_cache_hits += 1
+                return dict(cached)
+            self.filename_cache_misses += 1
+
         if self.db_mode == 'dynamodb':
-            return self._get_annotation_by_filename_dynamodb(filename)
+            annotation = self._get_annotation_by_filename_dynamodb(filename)
         else:
-            return self._get_annotation_by_filename_sqlite(filename)
+            annotation = self._get_annotation_by_filename_sqlite(filename)
+
+        # Misses are not cached so a file saved moments later is still found
+        if annotation is not None and self.filename_cache_size > 0:
+            with self._filename_cache_lock:
+                self._filename_cache[filename] = dict(annotation)
+                self._filename_cache.move_to_end(filename)
+                while len(self._filename_cache) > self.filename_cache_size:
+                    self._filename_cache.popitem(last=False)
+        return annotation
 
     # SQLite Implementation Methods
     def _get_projects_sqlite(self) -> List[Dict[str, Any]]:
-        """SQLite implementation of get_projects"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT p.id, p.project_name, p.description, p.workspace_path, p.created_at,
-                   COUNT(CASE WHEN a.deleted IS NULL OR a.deleted = 'N' THEN a.id END) as annotation_count
-            FROM projects p
-            LEFT JOIN annotations a ON p.id = a.project_id
-            GROUP BY p.id, p.project_name, p.description, p.workspace_path, p.created_at
-            ORDER BY p.created_at DESC
-        ''')
+        """SQLite implementation of get_projects, reading the trigger-maintained counters"""
+        with self._sqlite_connection() as conn:
+            rows = conn.execute('''
+                SELECT id, project_name, description, workspace_path, created_at, annotation_count
+                FROM projects
+                ORDER BY created_at DESC
+            ''').fetchall()
         projects = []
-        for row in cursor.fetchall():
+        for row in rows:
             projects.append({
                 'id': str(row[0]),
                 'project_name': row[1],
@@ -270,36 +649,52 @@ class DatabaseManager:
                 'created_at': row[4],
                 'annotation_count': row[5]
             })
-        conn.close()
         return projects
 
+    def _get_project_sqlite(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """SQLite implementation of get_project"""
+        try:
+            key = int(project_id)
+        except (TypeError, ValueError):
+            return None
+        with self._sqlite_connection() as conn:
+            row = conn.execute('''
+                SELECT id, project_name, description, workspace_path, created_at
+                FROM projects
+                WHERE id = ?
+            ''', (key,)).fetchone()
+        if not row:
+            return None
+        return {
+            'id': str(row[0]),
+            'project_name': row[1],
+            'description': row[2],
+            'workspace_path': row[3],
+            'created_at': row[4]
+        }
+
     def _create_project_sqlite(self, project_name: str, description: str, workspace_path: str) -> str:
         """SQLite implementation of create_project"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO projects (project_name, description, workspace_path)
-            VALUES (?, ?, ?)
-        ''', (project_name, description, workspace_path))
-        project_id = str(cursor.lastrowid)
-        conn.commit()
-        conn.close()
-        return project_id
+        with self._sqlite_connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO projects (project_name, description, workspace_path)
+                VALUES (?, ?, ?)
+            ''', (project_name, description, workspace_path))
+            return str(cursor.lastrowid)
 
     def _get_project_annotations_sqlite(self, project_id: str) -> List[Dict[str, Any]]:
         """SQLite implementation of get_project_annotations"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT id, audio_filename, audio_path, transcript, original_transcript, recording_mode,
-                   language, duration, created_at, updated_at
-            FROM annotations
-            WHERE project_id = ? AND (deleted IS NULL OR deleted = 'N')
-            ORDER BY created_at DESC
-        ''', (int(project_id),))
+        with self._sqlite_connection() as conn:
+            rows = conn.execute('''
+                SELECT id, audio_filename, audio_path, transcript, original_transcript, recording_mode,
+                       language, duration, created_at, updated_at
+                FROM annotations
+                WHERE project_id = ? AND (deleted IS NULL OR deleted = 'N')
+                ORDER BY created_at DESC
+            ''', (int(project_id),)).fetchall()
 
         annotations = []
-        for row in cursor.fetchall():
+        for row in rows:
             annotations.append({
                 'id': str(row[0]),
                 'audio_filename': row[1],
@@ -312,60 +707,131 @@ class DatabaseManager:
                 'created_at': row[8],
                 'updated_at': row[9]
             })
-        conn.close()
         return annotations
 
+    @staticmethod
+    def _format_annotation(values: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalise a (possibly projected) annotation record from either backend"""
+        annotation = dict(values)
+        if 'id' in annotation:
+            annotation['id'] = str(annotation['id'])
+        if 'original_transcript' in annotation:
+            annotation['original_transcript'] = annotation['original_transcript'] or ''
+        if 'language' in annotation:
+            annotation['language'] = annotation['language'] or 'en'
+        if 'duration' in annotation:
+            annotation['duration'] = float(annotation['duration'] or 0)
+        if 'updated_at' in annotation and not annotation['updated_at']:
+            annotation['updated_at'] = annotation.get('created_at')
+        return annotation
+
+    def _list_project_annotations_sqlite(self, project_id: str, limit: int, position: Optional[Dict[str, Any]],
+                                         fields: List[str]) -> Dict[str, Any]:
+        """SQLite implementation of list_project_annotations, keyset-paginated on (created_at, id)"""
+        # Column names come from ANNOTATION_FIELDS, never from the request
+        query = f'''
+            SELECT {', '.join(fields)}
+            FROM annotations
+            WHERE project_id = ? AND deleted = 'N'
+        '''
+        try:
+            params: List[Any] = [int(project_id)]
+        except (TypeError, ValueError):
+            raise ValueError('Invalid project id')
+        if position is not None:
+            try:
+                params += [str(position['created_at']), int(position['id'])]
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('Invalid cursor')
+            query += ' AND (created_at, id) < (?, ?)'
+        query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+
+        with self._sqlite_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        has_more = len(rows) > limit
+        annotations = [self._format_annotation(dict(zip(fields, row))) for row in rows[:limit]]
+        next_cursor = None
+        if has_more:
+            last = annotations[-1]
+            next_cursor = _encode_cursor({'created_at': last['created_at'], 'id': int(last['id'])})
+        return {'annotations': annotations, 'next_cursor': next_cursor, 'has_more': has_more}
+
+    def _get_annotation_summary_sqlite(self, project_id: str) -> Dict[str, Any]:
+        """SQLite implementation of get_annotation_summary"""
+        with self._sqlite_connection() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(PROJECT_COUNTER_FIELDS)} FROM projects WHERE id = ?", (int(project_id),)
+            ).fetchone()
+        summary = dict(zip(PROJECT_COUNTER_FIELDS, row or (0, 0.0, 0, 0)))
+        summary['total_duration'] = float(summary['total_duration'])
+        return summary
+
+    def _rebuild_annotation_counters_sqlite(self, project_id: Optional[str]) -> int:
+        """SQLite implementation of rebuild_annotation_counters"""
+        with self._sqlite_connection() as conn:
+            if project_id is None:
+                cursor = conn.execute(SQLITE_REBUILD_COUNTERS)
+            else:
+                cursor = conn.execute(SQLITE_REBUILD_COUNTERS + ' WHERE id = ?', (int(project_id),))
+            return cursor.rowcount
+
     def _save_annotation_sqlite(self, project_id: str, audio_filename: str, audio_path: str,
                                transcript: str, recording_mode: str, language: str, duration: float) -> str:
         """SQLite implementation of save_annotation"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO annotations (project_id, audio_filename, audio_path, transcript,
-                                   original_transcript, recording_mode, language, duration)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (int(project_id), audio_filename, audio_path, transcript, transcript,
-              recording_mode, language, duration))
-        annotation_id = str(cursor.lastrowid)
-        conn.commit()
-        conn.close()
-        return annotation_id
+        with self._sqlite_connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO annotations (project_id, audio_filename, audio_path, transcript,
+                                       original_transcript, recording_mode, language, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (int(project_id), audio_filename, audio_path, transcript, transcript,
+                  recording_mode, language, duration))
+            return str(cursor.lastrowid)
+
+    def _save_annotations_bulk_sqlite(self, project_id: str, annotations: List[Dict[str, Any]]) -> List[str]:
+        """SQLite implementation of save_annotations_bulk, one executemany in one transaction"""
+        rows = [
+            (int(project_id), a['audio_filename'], a['audio_path'], a['transcript'], a['transcript'],
+             a['recording_mode'], a['language'], a['duration'])
+            for a in annotations
+        ]
+        with self._sqlite_connection() as conn:
+            conn.executemany('''
+                INSERT INTO annotations (project_id, audio_filename, audio_path, transcript,
+                                       original_transcript, recording_mode, language, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            # The transaction holds the write lock, so the new rows took consecutive ids ending at the last insert
+            last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+        return [str(annotation_id) for annotation_id in range(last_id - len(rows) + 1, last_id + 1)]
 
     def _update_transcript_sqlite(self, annotation_id: str, transcript: str) -> bool:
         """SQLite implementation of update_transcript"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE annotations 
-            SET transcript = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (transcript, int(annotation_id)))
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return success
+        with self._sqlite_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE annotations 
+                SET transcript = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (transcript, int(annotation_id)))
+            return cursor.rowcount > 0
 
     def _delete_annotation_sqlite(self, annotation_id: str) -> bool:
         """SQLite implementation of delete_annotation"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            UPDATE annotations 
-            SET deleted = 'Y', updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (int(annotation_id),))
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        return success
+        with self._sqlite_connection() as conn:
+            cursor = conn.execute('''
+                UPDATE annotations 
+                SET deleted = 'Y', updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (int(annotation_id),))
+            return cursor.rowcount > 0
 
     def _get_annotation_by_filename_sqlite(self, filename: str) -> Optional[Dict[str, Any]]:
         """SQLite implementation of get_annotation_by_filename"""
-        conn = sqlite3.connect(self.sqlite_db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT audio_path, project_id, id FROM annotations WHERE audio_filename = ?', (filename,))
-        result = cursor.fetchone()
-        conn.close()
+        with self._sqlite_connection() as conn:
+            result = conn.execute(
+                'SELECT audio_path, project_id, id FROM annotations WHERE audio_filename = ?', (filename,)
+            ).fetchone()
         if result:
             return {
                 'audio_path': result[0],
@@ -376,30 +842,32 @@ class DatabaseManager:
 
     # DynamoDB Implementation Methods
     def _get_projects_dynamodb(self) -> List[Dict[str, Any]]:
-        """DynamoDB implementation of get_projects"""
+        """DynamoDB implementation of get_projects, reading the counters kept on each project"""
         try:
             projects_table = self.dynamodb_resource.Table(self.projects_table)
-            annotations_table = self.dynamodb_resource.Table(self.annotations_table)
 
             # Get all projects
-            response = projects_table.scan()
-            projects = []
-
-            for item in response['Items']:
-                # Count annotations for this project
-                annotation_response = annotations_table.scan(
-                    FilterExpression='project_id = :pid AND attribute_not_exists(deleted)',
-                    ExpressionAttributeValues={':pid': item['id']}
-                )
-                annotation_count = annotation_response['Count']
+            items = []
+            scan_args = {}
+            while True:
+                response = projects_table.scan(**scan_args)
+                items.extend(response['Items'])
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
+            projects = []
+            for item in items:
+                if 'counters_ready' not in item:
+                    # Created by an older version after the startup backfill ran
+                    item.update(self._rebuild_project_counters_dynamodb(item['id']))
                 projects.append({
                     'id': item['id'],
                     'project_name': item['project_name'],
                     'description': item.get('description', ''),
                     'workspace_path': item['workspace_path'],
                     'created_at': item['created_at'],
-                    'annotation_count': annotation_count
+                    'annotation_count': int(item.get('annotation_count', 0))
                 })
 
             # Sort by created_at DESC
@@ -410,13 +878,48 @@ class DatabaseManager:
             logger.error(f"❌ DynamoDB get_projects failed: {str(e)}")
             raise e
 
+    def _add_to_project_counters_dynamodb(self, project_id: str, sign: int, duration, recording_mode: str):
+        """Atomically add (sign=1) or remove (sign=-1) one annotation from a project's counters"""
+        projects_table = self.dynamodb_resource.Table(self.projects_table)
+        projects_table.update_item(
+            Key={'id': project_id},
+            UpdateExpression='ADD annotation_count :count, total_duration :duration, '
+                             'start_stop_count :start_stop, streaming_count :streaming',
+            ExpressionAttributeValues={
+                ':count': sign,
+                ':duration': Decimal(str(duration or 0)) * sign,
+                ':start_stop': sign if recording_mode == 'start-stop' else 0,
+                ':streaming': sign if recording_mode == 'streaming' else 0
+            },
+            ConditionExpression='attribute_exists(id)'
+        )
+
+    def _get_project_dynamodb(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """DynamoDB implementation of get_project"""
+        try:
+            projects_table = self.dynamodb_resource.Table(self.projects_table)
+            item = projects_table.get_item(Key={'id': str(project_id)}).get('Item')
+            if not item:
+                return None
+            return {
+                'id': item['id'],
+                'project_name': item['project_name'],
+                'description': item.get('description', ''),
+                'workspace_path': item['workspace_path'],
+                'created_at': item['created_at']
+            }
+
+        except Exception as e:
+            logger.error(f"❌ DynamoDB get_project failed: {str(e)}")
+            raise e
+
     def _create_project_dynamodb(self, project_name: str, description: str, workspace_path: str) -> str:
         """DynamoDB implementation of create_project"""
         try:
             projects_table = self.dynamodb_resource.Table(self.projects_table)
 
             # Generate unique project ID
-            project_id = f"proj_{int(time.time() * 1000)}"
+            project_id = id_generator.new_id('proj_')
             created_at = datetime.utcnow().isoformat()
 
             projects_table.put_item(
@@ -425,7 +928,12 @@ class DatabaseManager:
                     'project_name': project_name,
                     'description': description,
                     'workspace_path': workspace_path,
-                    'created_at': created_at
+                    'created_at': created_at,
+                    'annotation_count': 0,
+                    'total_duration': Decimal(0),
+                    'start_stop_count': 0,
+                    'streaming_count': 0,
+                    'counters_ready': True
                 },
                 ConditionExpression='attribute_not_exists(id)'
             )
@@ -443,15 +951,23 @@ class DatabaseManager:
         try:
             annotations_table = self.dynamodb_resource.Table(self.annotations_table)
 
-            response = annotations_table.query(
-                IndexName='project_id-index',
-                KeyConditionExpression='project_id = :pid',
-                FilterExpression='attribute_not_exists(deleted)',
-                ExpressionAttributeValues={':pid': project_id}
-            )
+            query_args = {
+                'IndexName': 'project_id-index',
+                'KeyConditionExpression': 'project_id = :pid',
+                'FilterExpression': 'attribute_not_exists(deleted)',
+                'ExpressionAttributeValues': {':pid': project_id}
+            }
+            # Each query returns at most 1 MB; follow LastEvaluatedKey to read the whole project
+            items = []
+            while True:
+                response = annotations_table.query(**query_args)
+                items.extend(response['Items'])
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
             annotations = []
-            for item in response['Items']:
+            for item in items:
                 annotations.append({
                     'id': item['id'],
                     'audio_filename': item['audio_filename'],
@@ -473,6 +989,195 @@ class DatabaseManager:
             logger.error(f"❌ DynamoDB get_project_annotations failed: {str(e)}")
             raise e
 
+    def _list_project_annotations_dynamodb(self, project_id: str, limit: int, position: Optional[Dict[str, Any]],
+                                           fields: List[str]) -> Dict[str, Any]:
+        """
+        DynamoDB implementation of list_project_annotations
+
+        Pages follow the (project_id, created_at) index newest-first and resume
+        from the last (created_at, id) returned. Limit applies before the
+        deleted filter, so the index is read until the page is full or
+        exhausted. While the index is still being built, the project is read
+        through project_id-index and sorted in memory instead.
+        """
+        if position is not None:
+            if set(position) != {'created_at', 'id'} or not all(isinstance(value, str) for value in position.values()):
+                raise ValueError('Invalid cursor')
+        if not self._index_ready(PROJECT_CREATED_INDEX_NAME):
+            return self._list_project_annotations_unordered_dynamodb(project_id, limit, position, fields)
+
+        try:
+            annotations_table = self.dynamodb_resource.Table(self.annotations_table)
+            names = {f'#f{i}': field for i, field in enumerate(fields)}
+            query_args = {
+                'IndexName': PROJECT_CREATED_INDEX_NAME,
+                'KeyConditionExpression': 'project_id = :pid',
+                'FilterExpression': 'attribute_not_exists(deleted)',
+                'ExpressionAttributeValues': {':pid': project_id},
+                'ProjectionExpression': ', '.join(names),
+                'ExpressionAttributeNames': names,
+                'ScanIndexForward': False
+            }
+            start_key = dict(position, project_id=project_id) if position else None
+
+            items = []
+            while len(items) < limit:
+                if start_key:
+                    query_args['ExclusiveStartKey'] = start_key
+                query_args['Limit'] = limit - len(items)
+                response = annotations_table.query(**query_args)
+                items.extend(response['Items'])
+                start_key = response.get('LastEvaluatedKey')
+                if not start_key:
+                    break
+
+            annotations = [self._format_annotation(item) for item in items]
+            next_cursor = _encode_cursor({'created_at': start_key['created_at'], 'id': start_key['id']}) if start_key else None
+            return {'annotations': annotations, 'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+
+        except Exception as e:
+            logger.error(f"❌ DynamoDB list_project_annotations failed: {str(e)}")
+            raise e
+
+    def _list_project_annotations_unordered_dynamodb(self, project_id: str, limit: int,
+                                                     position: Optional[Dict[str, Any]],
+                                                     fields: List[str]) -> Dict[str, Any]:
+        """Newest-first page built by sorting the whole project, used until the created_at index is ACTIVE"""
+        try:
+            annotations_table = self.dynamodb_resource.Table(self.annotations_table)
+            names = {f'#f{i}': field for i, field in enumerate(fields)}
+            query_args = {
+                'IndexName': 'project_id-index',
+                'KeyConditionExpression': 'project_id = :pid',
+                'FilterExpression': 'attribute_not_exists(deleted)',
+                'ExpressionAttributeValues': {':pid': project_id},
+                'ProjectionExpression': ', '.join(names),
+                'ExpressionAttributeNames': names
+            }
+            items = []
+            while True:
+                response = annotations_table.query(**query_args)
+                items.extend(response['Items'])
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            items.sort(key=lambda item: (item['created_at'], item['id']), reverse=True)
+            if position is not None:
+                after = (position['created_at'], position['id'])
+                items = [item for item in items if (item['created_at'], item['id']) < after]
+
+            page = items[:limit]
+            has_more = len(items) > limit
+            next_cursor = _encode_cursor({'created_at': page[-1]['created_at'], 'id': page[-1]['id']}) if has_more else None
+            return {
+                'annotations': [self._format_annotation(item) for item in page],
+                'next_cursor': next_cursor,
+                'has_more': has_more
+            }
+
+        except Exception as e:
+            logger.error(f"❌ DynamoDB list_project_annotations failed: {str(e)}")
+            raise e
+
+    def _get_annotation_summary_dynamodb(self, project_id: str) -> Dict[str, Any]:
+        """DynamoDB implementation of get_annotation_summary"""
+        try:
+            projects_table = self.dynamodb_resource.Table(self.projects_table)
+            item = projects_table.get_item(
+                Key={'id': project_id},
+                ProjectionExpression=', '.join(PROJECT_COUNTER_FIELDS + ('id', 'counters_ready'))
+            ).get('Item', {})
+            if item and 'counters_ready' not in item:
+                item = self._rebuild_project_counters_dynamodb(project_id)
+            return {
+                'annotation_count': int(item.get('annotation_count', 0)),
+                'total_duration': float(item.get('total_duration', 0)),
+                'start_stop_count': int(item.get('start_stop_count', 0)),
+                'streaming_count': int(item.get('streaming_count', 0))
+            }
+
+        except Exception as e:
+            logger.error(f"❌ DynamoDB get_annotation_summary failed: {str(e)}")
+            raise e
+
+    def _scan_project_ids_dynamodb(self, filter_expression: Optional[str] = None) -> List[str]:
+        """IDs of all projects, optionally only those matching a filter expression"""
+        projects_table = self.dynamodb_resource.Table(self.projects_table)
+        scan_args = {'ProjectionExpression': 'id'}
+        if filter_expression:
+            scan_args['FilterExpression'] = filter_expression
+        project_ids = []
+        while True:
+            response = projects_table.scan(**scan_args)
+            project_ids.extend(item['id'] for item in response['Items'])
+            if 'LastEvaluatedKey' not in response:
+                return project_ids
+            scan_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _rebuild_project_counters_dynamodb(self, project_id: str) -> Dict[str, Any]:
+        """
+        Count one project's annotations through the project_id index and store the counters
+
+        Only the summed attributes are read. Saves that land during a rebuild
+        can be missed, so run it while the project is quiet.
+
+        Returns:
+            dict: The stored counters
+        """
+        annotations_table = self.dynamodb_resource.Table(self.annotations_table)
+        query_args = {
+            'IndexName': 'project_id-index',
+            'KeyConditionExpression': 'project_id = :pid',
+            'FilterExpression': 'attribute_not_exists(deleted)',
+            'ExpressionAttributeValues': {':pid': project_id},
+            'ProjectionExpression': '#duration, recording_mode',
+            'ExpressionAttributeNames': {'#duration': 'duration'}
+        }
+        counters = {'annotation_count': 0, 'total_duration': Decimal(0), 'start_stop_count': 0, 'streaming_count': 0}
+        while True:
+            response = annotations_table.query(**query_args)
+            for item in response['Items']:
+                counters['annotation_count'] += 1
+                counters['total_duration'] += Decimal(str(item.get('duration', 0)))
+                if item.get('recording_mode') == 'start-stop':
+                    counters['start_stop_count'] += 1
+                elif item.get('recording_mode') == 'streaming':
+                    counters['streaming_count'] += 1
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        # counters_ready marks projects whose counters are complete rather than started from zero by ADD
+        projects_table = self.dynamodb_resource.Table(self.projects_table)
+        projects_table.update_item(
+            Key={'id': project_id},
+            UpdateExpression='SET ' + ', '.join(f'{field} = :{field}' for field in PROJECT_COUNTER_FIELDS) +
+                             ', counters_ready = :ready',
+            ExpressionAttributeValues=dict({f':{field}': value for field, value in counters.items()}, **{':ready': True})
+        )
+        return counters
+
+    def _backfill_project_counters_dynamodb(self):
+        """Rebuild the counters of projects created before counters were maintained"""
+        project_ids = self._scan_project_ids_dynamodb('attribute_not_exists(counters_ready)')
+        for project_id in project_ids:
+            self._rebuild_project_counters_dynamodb(project_id)
+        if project_ids:
+            logger.info(f"✅ Backfilled annotation counters for {len(project_ids)} projects")
+
+    def _rebuild_annotation_counters_dynamodb(self, project_id: Optional[str]) -> int:
+        """DynamoDB implementation of rebuild_annotation_counters"""
+        try:
+            project_ids = [project_id] if project_id is not None else self._scan_project_ids_dynamodb()
+            for pid in project_ids:
+                self._rebuild_project_counters_dynamodb(pid)
+            return len(project_ids)
+
+        except Exception as e:
+            logger.error(f"❌ DynamoDB rebuild_annotation_counters failed: {str(e)}")
+            raise e
+
     def _save_annotation_dynamodb(self, project_id: str, audio_filename: str, audio_path: str,
                                  transcript: str, recording_mode: str, language: str, duration: float) -> str:
         """DynamoDB implementation of save_annotation"""
@@ -480,7 +1185,7 @@ class DatabaseManager:
             annotations_table = self.dynamodb_resource.Table(self.annotations_table)
 
             # Generate unique annotation ID
-            annotation_id = f"anno_{int(time.time() * 1000)}"
+            annotation_id = id_generator.new_id('anno_')
             created_at = datetime.utcnow().isoformat()
 
             annotations_table.put_item(
@@ -493,11 +1198,12 @@ class DatabaseManager:
                     'original_transcript': transcript,
                     'recording_mode': recording_mode,
                     'language': language,
-                    'duration': duration,
+                    'duration': Decimal(str(duration or 0)),
                     'created_at': created_at,
                     'updated_at': created_at
                 }
             )
+            self._add_to_project_counters_dynamodb(project_id, 1, duration, recording_mode)
 
             return annotation_id
 
@@ -505,6 +1211,65 @@ class DatabaseManager:
             logger.error(f"❌ DynamoDB save_annotation failed: {str(e)}")
             raise e
 
+    def _save_annotations_bulk_dynamodb(self, project_id: str, annotations: List[Dict[str, Any]]) -> List[str]:
+        """
+        DynamoDB implementation of save_annotations_bulk
+
+        Items go out through batch_writer in 25-item BatchWriteItem calls, with
+        unprocessed items retried, and the project counters take one ADD for
+        the whole batch.
+        """
+        try:
+            annotations_table = self.dynamodb_resource.Table(self.annotations_table)
+
+            created_at = datetime.utcnow().isoformat()
+            annotation_ids = []
+            counters = {'duration': Decimal(0), 'start-stop': 0, 'streaming': 0}
+
+            with annotations_table.batch_writer() as batch:
+                for annotation in annotations:
+                    annotation_id = id_generator.new_id('anno_')
+                    duration = Decimal(str(annotation['duration'] or 0))
+                    batch.put_item(
+                        Item={
+                            'id': annotation_id,
+                            'project_id': project_id,
+                            'audio_filename': annotation['audio_filename'],
+                            'audio_path': annotation['audio_path'],
+                            'transcript': annotation['transcript'],
+                            'original_transcript': annotation['transcript'],
+                            'recording_mode': annotation['recording_mode'],
+                            'language': annotation['language'],
+                            'duration': duration,
+                            'created_at': created_at,
+                            'updated_at': created_at
+                        }
+                    )
+                    annotation_ids.append(annotation_id)
+                    counters['duration'] += duration
+                    if annotation['recording_mode'] in counters:
+                        counters[annotation['recording_mode']] += 1
+
+            projects_table = self.dynamodb_resource.Table(self.projects_table)
+            projects_table.update_item(
+                Key={'id': project_id},
+                UpdateExpression='ADD annotation_count :count, total_duration :duration, '
+                                 'start_stop_count :start_stop, streaming_count :streaming',
+                ExpressionAttributeValues={
+                    ':count': len(annotation_ids),
+                    ':duration': counters['duration'],
+                    ':start_stop': counters['start-stop'],
+                    ':streaming': counters['streaming']
+                },
+                ConditionExpression='attribute_exists(id)'
+            )
+
+            return annotation_ids
+
+        except Exception as e:
+            logger.error(f"❌ DynamoDB save_annotations_bulk failed: {str(e)}")
+            raise e
+
     def _update_transcript_dynamodb(self, annotation_id: str, transcript: str) -> bool:
         """DynamoDB implementation of update_transcript"""
         try:
@@ -543,11 +1308,16 @@ class DatabaseManager:
                     ':deleted': 'Y',
                     ':updated_at': updated_at
                 },
-                ConditionExpression='attribute_exists(id)',
-                ReturnValues='UPDATED_NEW'
+                # Deleting twice must not decrement the project counters twice
+                ConditionExpression='attribute_exists(id) AND attribute_not_exists(deleted)',
+                ReturnValues='ALL_OLD'
             )
 
-            return 'Attributes' in response
+            old = response.get('Attributes')
+            if not old:
+                return False
+            self._add_to_project_counters_dynamodb(old['project_id'], -1, old.get('duration', 0), old.get('recording_mode'))
+            return True
 
         except ClientError as e:
             if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
@@ -560,13 +1330,29 @@ class DatabaseManager:
         try:
             annotations_table = self.dynamodb_resource.Table(self.annotations_table)
 
-            response = annotations_table.scan(
-                FilterExpression='audio_filename = :filename',
-                ExpressionAttributeValues={':filename': filename}
-            )
-
-            if response['Items']:
-                item = response['Items'][0]
+            if self._index_ready(FILENAME_INDEX_NAME):
+                response = annotations_table.query(
+                    IndexName=FILENAME_INDEX_NAME,
+                    KeyConditionExpression='audio_filename = :filename',
+                    ExpressionAttributeValues={':filename': filename},
+                    Limit=1
+                )
+                items = response['Items']
+            else:
+                # Index still backfilling: scan every page rather than stopping at the first 1 MB
+                scan_args = {
+                    'FilterExpression': 'audio_filename = :filename',
+                    'ExpressionAttributeValues': {':filename': filename}
+                }
+                while True:
+                    response = annotations_table.scan(**scan_args)
+                    items = response['Items']
+                    if items or 'LastEvaluatedKey' not in response:
+                        break
+                    scan_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            if items:
+                item = items[0]
                 return {
                     'audio_path': item['audio_path'],
                     'project_id': item['project_id'],
@@ -586,7 +1372,23 @@ class DatabaseManager:
             'dynamodb_region': self.dynamodb_region if self.db_mode == 'dynamodb' else None,
             'projects_table': self.projects_table if self.db_mode == 'dynamodb' else None,
             'annotations_table': self.annotations_table if self.db_mode == 'dynamodb' else None,
-            'dynamodb_available': self.dynamodb_client is not None
+            'dynamodb_available': self.dynamodb_client is not None,
+            'filename_cache': {
+                'size': len(self._filename_cache),
+                'max_size': self.filename_cache_size,
+                'hits': self.filename_cache_hits,
+                'misses': self.filename_cache_misses
+            },
+            'active_indexes': sorted(self._active_indexes) if self.db_mode == 'dynamodb' else None,
+            'sqlite_pool': {
+                'pool_size': self.sqlite_pool_size,
+                'idle_connections': self._sqlite_pool.qsize(),
+                'connections_opened': self.sqlite_connections_opened,
+                'journal_mode': self.sqlite_journal_mode,
+                'synchronous': self.sqlite_synchronous,
+                'busy_timeout_ms': self.sqlite_busy_timeout_ms
+            } if self.db_mode == 'sqlite' else None,
+            'init_time_seconds': self.init_time_seconds
         }
         return info
 
@@ -0,0 +1,422 @@
+"""
+Diarization Engine for Voice Stream Application
+Extracts batched ECAPA embeddings over sliding windows and clusters them into speaker turns
+"""
+
+import os
+import math
+import logging
+import threading
+from typing import Optional, Dict, List, Any, Tuple
+
+import numpy as np
+
+from app.model_registry import model_registry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ECAPA voxceleb models are trained on 16 kHz audio
+EMBEDDING_SAMPLE_RATE = 16000
+
+class SpeakerTracker:
+    """
+    Stable speaker labels across separately diarized chunks of one stream
+
+    Each chunk is clustered on its own, so its SPEAKER_n labels are local to
+    it. The tracker keeps one centroid per speaker heard so far and maps each
+    chunk's speakers onto them by cosine distance, closest pairs first and at
+    most one chunk speaker per known speaker. A chunk speaker farther than
+    distance_threshold from every free centroid becomes a new speaker, until
+    max_speakers is reached.
+    """
+
+    def __init__(self, distance_threshold: float, max_speakers: int):
+        self.distance_threshold = distance_threshold
+        self.max_speakers = max_speakers
+        self._centroids: List[np.ndarray] = []
+        self._weights: List[int] = []
+        self.last_label: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def assign(self, speakers: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Map one chunk's speakers to stream-wide labels, updating the centroids
+
+        Args:
+            speakers: Chunk speakers as returned by DiarizationEngine.diarize_with_speakers
+
+        Returns:
+            dict: Chunk label -> stream label
+        """
+        with self._lock:
+            labels = list(speakers)
+            mapping: Dict[str, int] = {}
+            if self._centroids and labels:
+                chunk = np.array([speakers[label]['embedding'] for label in labels])
+                distance = 1.0 - chunk @ np.array(self._centroids).T
+                taken = set()
+                for flat in np.argsort(distance, axis=None):
+                    i, j = divmod(int(flat), distance.shape[1])
+                    if distance[i, j] > self.distance_threshold:
+                        break
+                    if labels[i] not in mapping and j not in taken:
+                        mapping[labels[i]] = j
+                        taken.add(j)
+
+            for label in labels:
+                if label not in mapping:
+                    if len(self._centroids) < self.max_speakers:
+                        self._centroids.append(np.zeros_like(speakers[label]['embedding']))
+                        self._weights.append(0)
+                        mapping[label] = len(self._centroids) - 1
+                    else:
+                        mapping[label] = int(np.argmax(np.array(self._centroids) @ speakers[label]['embedding']))
+
+                # Fold the chunk's voice into the running centroid
+                j = mapping[label]
+                windows = speakers[label]['windows']
+                centroid = self._centroids[j] * self._weights[j] + speakers[label]['embedding'] * windows
+                self._centroids[j] = centroid / max(float(np.linalg.norm(centroid)), 1e-10)
+                self._weights[j] += windows
+
+            return {label: f"SPEAKER_{j}" for label, j in mapping.items()}
+
+    def relabel(self, turns: List[Dict[str, Any]], speakers: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Give a chunk's turns stream-wide speaker labels
+
+        Turns from a chunk with no speaker embeddings keep the last speaker heard.
+        """
+        mapping = self.assign(speakers)
+        fallback = self.last_label
+        turns = [dict(turn, speaker=mapping.get(turn['speaker'], fallback or turn['speaker'])) for turn in turns]
+        if turns:
+            self.last_label = turns[-1]['speaker']
+        return turns
+
+class DiarizationEngine:
+    """
+    Speaker diarization using ECAPA embeddings and agglomerative or spectral clustering
+    """
+
+    def __init__(self):
+        # Diarization configuration from environment variables
+        self.window_seconds = float(os.getenv('DIARIZATION_WINDOW_SECONDS', '1.5'))
+        self.hop_seconds = float(os.getenv('DIARIZATION_HOP_SECONDS', '0.75'))
+        self.batch_size = int(os.getenv('DIARIZATION_BATCH_SIZE', '64'))
+        self.clustering_method = os.getenv('DIARIZATION_CLUSTERING', 'agglomerative').lower()  # 'agglomerative' or 'spectral'
+        self.distance_threshold = float(os.getenv('DIARIZATION_DISTANCE_THRESHOLD', '0.6'))
+        self.max_speakers = int(os.getenv('DIARIZATION_MAX_SPEAKERS', '8'))
+        self.max_cluster_points = int(os.getenv('DIARIZATION_MAX_CLUSTER_POINTS', '1000'))
+        self.min_turn_seconds = float(os.getenv('DIARIZATION_MIN_TURN_SECONDS', '1.0'))
+        # Windows quieter than this (dB relative to the loudest window) are not clustered
+        self.silence_db = float(os.getenv('DIARIZATION_SILENCE_DB', '-40'))
+
+    def diarize(self, waveform, sample_rate: int, num_speakers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Split audio into speaker turns
+
+        Args:
+            waveform: Audio tensor shaped (channels, samples) as returned by torchaudio.load
+            sample_rate: Sample rate of the waveform
+            num_speakers: Fixed number of speakers, or None to estimate it
+
+        Returns:
+            list: Turns as {'speaker', 'start', 'end'} dicts ordered by time
+        """
+        return self.diarize_with_speakers(waveform, sample_rate, num_speakers)[0]
+
+    def diarize_with_speakers(self, waveform, sample_rate: int,
+                              num_speakers: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Split audio into speaker turns and describe each speaker's voice
+
+        Args:
+            waveform: Audio tensor shaped (channels, samples) as returned by torchaudio.load
+            sample_rate: Sample rate of the waveform
+            num_speakers: Fixed number of speakers, or None to estimate it
+
+        Returns:
+            tuple: (turns as from diarize(), {speaker label: {'embedding', 'windows'}}), where
+                embedding is the L2-normalized mean of the speaker's window embeddings.
+                Speakers are empty when the audio was too short or quiet to embed.
+        """
+        mono = self._prepare_waveform(waveform, sample_rate)
+        total_duration = mono.shape[0] / EMBEDDING_SAMPLE_RATE
+        if total_duration <= self.window_seconds:
+            return [{'speaker': 'SPEAKER_0', 'start': 0.0, 'end': round(total_duration, 3)}], {}
+
+        starts = self._window_starts(mono.shape[0])
+        speech = self._speech_mask(mono.numpy(), starts)
+        if not speech.any():
+            return [{'speaker': 'SPEAKER_0', 'start': 0.0, 'end': round(total_duration, 3)}], {}
+
+        embeddings = self.extract_embeddings(mono, starts[speech])
+        speech_labels = self.cluster(embeddings, num_speakers)
+
+        speakers = {}
+        for label in np.unique(speech_labels):
+            members = embeddings[speech_labels == label]
+            centroid = members.mean(axis=0)
+            speakers[f"SPEAKER_{int(label)}"] = {
+                'embedding': centroid / max(float(np.linalg.norm(centroid)), 1e-10),
+                'windows': len(members)
+            }
+
+        labels = self._fill_silence_labels(speech, speech_labels)
+        start_seconds = starts / EMBEDDING_SAMPLE_RATE
+        return self._labels_to_turns(labels, start_seconds, total_duration), speakers
+
+    def extract_embeddings(self, mono, starts: np.ndarray) -> np.ndarray:
+        """
+        Compute L2-normalized ECAPA embeddings for windows beginning at the given samples
+
+        Windows are stacked into batches so each batch is a single forward pass.
+
+        Args:
+            mono: 1-D 16 kHz audio tensor
+            starts: Window start offsets in samples
+
+        Returns:
+            np.ndarray: Embedding matrix shaped (windows, dim)
+        """
+        import torch
+
+        window = int(self.window_seconds * EMBEDDING_SAMPLE_RATE)
+        offsets = torch.arange(window)
+        batches = []
+        with model_registry.speaker_model() as verification, torch.inference_mode():
+            for i in range(0, len(starts), self.batch_size):
+                batch_starts = torch.as_tensor(starts[i:i + self.batch_size])
+                batch = mono[batch_starts[:, None] + offsets[None, :]]
+                embeddings = verification.encode_batch(batch)
+                batches.append(embeddings.squeeze(1).cpu().numpy())
+
+        embeddings = np.concatenate(batches, axis=0).astype(np.float64)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-10)
+
+    def cluster(self, embeddings: np.ndarray, num_speakers: Optional[int] = None) -> np.ndarray:
+        """
+        Assign a speaker index to each embedding
+
+        Args:
+            embeddings: L2-normalized embeddings in time order
+            num_speakers: Fixed number of speakers, or None to estimate it
+
+        Returns:
+            np.ndarray: Speaker indices numbered by order of first appearance
+        """
+        n = embeddings.shape[0]
+        if n == 1:
+            return np.zeros(1, dtype=int)
+
+        # Pool neighbouring windows so the distance matrix stays bounded on long files
+        pool = math.ceil(n / self.max_cluster_points)
+        if pool > 1:
+            pooled = self._pool_embeddings(embeddings, pool)
+            return np.repeat(self.cluster(pooled, num_speakers), pool)[:n]
+
+        if num_speakers is not None:
+            num_speakers = max(1, min(num_speakers, n))
+
+        if self.clustering_method == 'spectral':
+            labels = self._spectral(embeddings, num_speakers)
+        else:
+            labels = self._agglomerative(embeddings, num_speakers)
+        return self._relabel_by_appearance(labels)
+
+    def _agglomerative(self, embeddings: np.ndarray, num_speakers: Optional[int]) -> np.ndarray:
+        """Average-linkage agglomerative clustering with Lance-Williams distance updates"""
+        n = embeddings.shape[0]
+        dist = self._cosine_distance_matrix(embeddings)
+        np.fill_diagonal(dist, np.inf)
+        sizes = np.ones(n)
+        labels = np.arange(n)
+        n_clusters = n
+        target = num_speakers or 1
+
+        while n_clusters > target:
+            i, j = divmod(int(np.argmin(dist)), n)
+            if num_speakers is None and dist[i, j] > self.distance_threshold and n_clusters <= self.max_speakers:
+                break
+
+            # Merge cluster j into cluster i
+            merged = (sizes[i] * dist[i] + sizes[j] * dist[j]) / (sizes[i] + sizes[j])
+            dist[i, :] = merged
+            dist[:, i] = merged
+            dist[i, i] = np.inf
+            dist[j, :] = np.inf
+            dist[:, j] = np.inf
+            sizes[i] += sizes[j]
+            labels[labels == j] = i
+            n_clusters -= 1
+
+        return labels
+
+    def _spectral(self, embeddings: np.ndarray, num_speakers: Optional[int]) -> np.ndarray:
+        """Spectral clustering on the cosine affinity matrix with eigengap speaker counting"""
+        n = embeddings.shape[0]
+        affinity = np.clip(embeddings @ embeddings.T, 0.0, None)
+        np.fill_diagonal(affinity, 0.0)
+
+        degree = affinity.sum(axis=1)
+        d_inv_sqrt = 1.0 / np.sqrt(np.maximum(degree, 1e-10))
+        laplacian = np.eye(n) - d_inv_sqrt[:, None] * affinity * d_inv_sqrt[None, :]
+        eigvals, eigvecs = np.linalg.eigh(laplacian)
+
+        k = num_speakers
+        if k is None:
+            max_k = max(1, min(self.max_speakers, n - 1))
+            k = int(np.argmax(np.diff(eigvals[:max_k + 1]))) + 1
+
+        spectral = eigvecs[:, :k]
+        spectral = spectral / np.maximum(np.linalg.norm(spectral, axis=1, keepdims=True), 1e-10)
+        return self._kmeans(spectral, k)
+
+    def _kmeans(self, points: np.ndarray, k: int, iterations: int = 50) -> np.ndarray:
+        """Deterministic k-means with farthest-point initialization"""
+        centroids = [points[0]]
+        for _ in range(1, k):
+            d = np.min(((points[:, None, :] - np.array(centroids)[None, :, :]) ** 2).sum(axis=2), axis=1)
+            centroids.append(points[int(np.argmax(d))])
+        centroids = np.array(centroids)
+
+        labels = np.zeros(points.shape[0], dtype=int)
+        for iteration in range(iterations):
+            d = ((points[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+            new_labels = np.argmin(d, axis=1)
+            if iteration > 0 and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            for c in range(k):
+                members = points[labels == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+        return labels
+
+    def _prepare_waveform(self, waveform, sample_rate: int):
+        """Downmix to mono and resample to the embedding model rate"""
+        import torch
+        import torchaudio
+
+        if not isinstance(waveform, torch.Tensor):
+            waveform = torch.as_tensor(np.asarray(waveform, dtype=np.float32))
+        if waveform.dim() == 2:
+            waveform = waveform.mean(dim=0)
+        if sample_rate != EMBEDDING_SAMPLE_RATE:
+            waveform = torchaudio.functional.resample(waveform, sample_rate, EMBEDDING_SAMPLE_RATE)
+        return waveform.contiguous()
+
+    def _window_starts(self, num_samples: int) -> np.ndarray:
+        """Get sliding window start offsets, with a final window flush to the end"""
+        window = int(self.window_seconds * EMBEDDING_SAMPLE_RATE)
+        hop = int(self.hop_seconds * EMBEDDING_SAMPLE_RATE)
+        starts = np.arange(0, num_samples - window + 1, hop)
+        if starts[-1] + window < num_samples:
+            starts = np.append(starts, num_samples - window)
+        return starts
+
+    def _speech_mask(self, samples: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """Flag windows whose energy is within silence_db of the loudest window"""
+        window = int(self.window_seconds * EMBEDDING_SAMPLE_RATE)
+        cumulative = np.concatenate(([0.0], np.cumsum(samples.astype(np.float64) ** 2)))
+        energy = (cumulative[starts + window] - cumulative[starts]) / window
+        energy_db = 10.0 * np.log10(np.maximum(energy, 1e-12))
+        return energy_db >= energy_db.max() + self.silence_db
+
+    def _fill_silence_labels(self, speech: np.ndarray, speech_labels: np.ndarray) -> np.ndarray:
+        """Give silent windows the label of the nearest preceding (or following) speech window"""
+        speech_idx = np.flatnonzero(speech)
+        nearest = np.searchsorted(speech_idx, np.arange(len(speech)), side='right') - 1
+        nearest = np.clip(nearest, 0, len(speech_idx) - 1)
+        return speech_labels[nearest]
+
+    def _labels_to_turns(self, labels: np.ndarray, start_seconds: np.ndarray, total_duration: float) -> List[Dict[str, Any]]:
+        """Collapse per-window labels into contiguous speaker turns"""
+        centers = start_seconds + self.window_seconds / 2
+        bounds = np.concatenate(([0.0], (centers[:-1] + centers[1:]) / 2, [total_duration]))
+
+        change = np.flatnonzero(np.diff(labels)) + 1
+        turn_starts = np.concatenate(([0], change))
+        turn_ends = np.concatenate((change, [len(labels)]))
+
+        turns = []
+        for s, e in zip(turn_starts, turn_ends):
+            start, end, label = float(bounds[s]), float(bounds[e]), int(labels[s])
+            # Absorb blips shorter than min_turn_seconds into the previous turn
+            if turns and (end - start < self.min_turn_seconds or turns[-1]['label'] == label):
+                turns[-1]['end'] = end
+                continue
+            turns.append({'label': label, 'start': start, 'end': end})
+
+        return [{
+            'speaker': f"SPEAKER_{turn['label']}",
+            'start': round(turn['start'], 3),
+            'end': round(turn['end'], 3)
+        } for turn in turns]
+
+    def _pool_embeddings(self, embeddings: np.ndarray, pool: int) -> np.ndarray:
+        """Average consecutive groups of embeddings"""
+        n, dim = embeddings.shape
+        padded = math.ceil(n / pool) * pool
+        if padded > n:
+            embeddings = np.concatenate((embeddings, np.repeat(embeddings[-1:], padded - n, axis=0)))
+        pooled = embeddings.reshape(-1, pool, dim).mean(axis=1)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-10)
+
+    @staticmethod
+    def _cosine_distance_matrix(embeddings: np.ndarray) -> np.ndarray:
+        """Pairwise cosine distance between L2-normalized embeddings"""
+        return 1.0 - embeddings @ embeddings.T
+
+    @staticmethod
+    def _relabel_by_appearance(labels: np.ndarray) -> np.ndarray:
+        """Renumber cluster ids so the first speaker heard is 0"""
+        _, first_index, inverse = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.empty(len(first_index), dtype=int)
+        rank[np.argsort(first_index)] = np.arange(len(first_index))
+        return rank[inverse]
+
+    @staticmethod
+    def dominant_speaker(turns: List[Dict[str, Any]], start: float, end: float) -> str:
+        """
+        Get the speaker with the most overlap with [start, end]
+
+        Args:
+            turns: Speaker turns from diarize()
+            start: Interval start in seconds
+            end: Interval end in seconds
+
+        Returns:
+            str: Speaker label
+        """
+        overlap: Dict[str, float] = {}
+        for turn in turns:
+            shared = min(end, turn['end']) - max(start, turn['start'])
+            if shared > 0:
+                overlap[turn['speaker']] = overlap.get(turn['speaker'], 0.0) + shared
+        if not overlap:
+            return turns[-1]['speaker'] if turns else 'SPEAKER_0'
+        return max(overlap, key=overlap.get)
+
+    def get_engine_info(self) -> Dict[str, Any]:
+        """Get current diarization configuration info"""
+        return {
+            'window_seconds': self.window_seconds,
+            'hop_seconds': self.hop_seconds,
+            'batch_size': self.batch_size,
+            'clustering_method': self.clustering_method,
+            'distance_threshold': self.distance_threshold,
+            'max_speakers': self.max_speakers,
+            'max_cluster_points': self.max_cluster_points
+        }
+
+    def create_speaker_tracker(self) -> SpeakerTracker:
+        """Tracker keeping speaker labels consistent across the chunks of one stream"""
+        return SpeakerTracker(self.distance_threshold, self.max_speakers)
+
+# Global diarization engine instance
+diarization_engine = DiarizationEngine()
@@ -0,0 +1,64 @@
+"""
+ID Generation for Voice Stream Application
+Monotonic, time-sortable unique IDs (ULID layout) for database keys and stored filenames
+"""
+
+import os
+import time
+import threading
+
+# Crockford base32: no I, L, O or U, so IDs are unambiguous and URL/filename safe
+ENCODING = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+RANDOM_BITS = 80
+
+class IdGenerator:
+    """
+    ULID-style ID generator
+
+    Each ID is 26 characters: a 48-bit millisecond timestamp followed by 80
+    random bits, so IDs sort lexicographically in creation order. IDs created
+    in the same millisecond by this process reuse the random part incremented
+    by one, which keeps them unique and ordered; other processes differ in
+    their random parts.
+    """
+
+    def __init__(self):
+        self._last_ms = -1
+        self._last_random = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(value: int, length: int) -> str:
+        chars = []
+        for _ in range(length):
+            chars.append(ENCODING[value & 31])
+            value >>= 5
+        return ''.join(reversed(chars))
+
+    def new_id(self, prefix: str = '') -> str:
+        """
+        Create a new ID
+
+        Args:
+            prefix: Optional text put in front of the ID, e.g. 'anno_'
+
+        Returns:
+            str: prefix followed by the 26-character ID
+        """
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+            else:
+                # Same millisecond, or the clock stepped back: stay on the last timestamp and count up
+                self._last_random += 1
+                if self._last_random >> RANDOM_BITS:
+                    self._last_ms += 1
+                    self._last_random = int.from_bytes(os.urandom(RANDOM_BITS // 8), 'big')
+            value = (self._last_ms << RANDOM_BITS) | self._last_random
+        return prefix + self._encode(value, 26)
+
+# Global ID generator instance
+id_generator = IdGenerator()
@@ -0,0 +1,165 @@
+"""
+Job Dispatcher for Voice Stream Application
+Runs Socket.IO audio jobs off the event loop with per-session ordering and queue limits
+"""
+
+import os
+import threading
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, Callable, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class JobDispatcher:
+    """
+    Per-session FIFO job queues drained by background tasks
+
+    Each job runs in a native thread (eventlet tpool, the gevent hub threadpool,
+    or the background thread itself in threading mode) so ffmpeg, HTTP calls and
+    model inference never block the event loop. Jobs of one session run one at a
+    time and in order, which the streaming decoder relies on. Events a job emits
+    are collected and sent from the event loop once it finishes. CPU-bound stages
+    can additionally be pushed to a process pool with run_cpu.
+    """
+
+    def __init__(self):
+        # Dispatcher configuration from environment variables
+        self.max_queue_per_session = max(1, int(os.getenv('AUDIO_JOB_MAX_QUEUE_PER_SESSION', '4')))
+        self.cpu_processes = max(0, int(os.getenv('AUDIO_JOB_CPU_PROCESSES', '0')))
+
+        self.socketio = None
+        self._queues: Dict[str, deque] = {}
+        self._active: set = set()
+        self._lock = threading.Lock()
+        self._cpu_executor: Optional[ProcessPoolExecutor] = None
+        self._cpu_lock = threading.Lock()
+
+        # Job counters
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    def init_app(self, socketio):
+        """Bind to the Socket.IO server whose async mode decides how jobs are run"""
+        self.socketio = socketio
+
+    def submit(self, session_id: str, job: Callable, *args) -> Tuple[bool, int]:
+        """
+        Queue a job for a session
+
+        Args:
+            session_id: Socket session id; events are emitted to this room
+            job: Callable invoked as job(emit, *args), where emit(event, data) queues an event for the session
+            *args: Job arguments
+
+        Returns:
+            tuple: (accepted, queue depth for the session including running job)
+        """
+        with self._lock:
+            queue = self._queues.setdefault(session_id, deque())
+            depth = len(queue) + (1 if session_id in self._active else 0)
+            if depth >= self.max_queue_per_session:
+                self.rejected += 1
+                return False, depth
+            queue.append((job, args))
+            self.submitted += 1
+            start_worker = session_id not in self._active
+            if start_worker:
+                self._active.add(session_id)
+
+        if start_worker:
+            self.socketio.start_background_task(self._drain, session_id)
+        return True, depth + 1
+
+    def discard(self, session_id: str):
+        """Drop a session's queued jobs, e.g. on disconnect; a running job finishes normally"""
+        with self._lock:
+            queue = self._queues.pop(session_id, None)
+        if queue:
+            logger.info(f"Discarded {len(queue)} queued audio jobs for session {session_id}")
+
+    def _drain(self, session_id: str):
+        """Background task running a session's jobs in order until its queue is empty"""
+        while True:
+            with self._lock:
+                queue = self._queues.get(session_id)
+                if not queue:
+                    self._queues.pop(session_id, None)
+                    self._active.discard(session_id)
+                    return
+                job, args = queue.popleft()
+
+            events = []
+            try:
+                self.run_blocking(job, lambda event, data: events.append((event, data)), *args)
+                with self._lock:
+                    self.completed += 1
+            except Exception as e:
+                logger.error(f"❌ Audio job failed for session {session_id}: {str(e)}")
+                with self._lock:
+                    self.failed += 1
+                events.append(('transcription_update', {'error': 'Error processing audio.'}))
+
+            for event, data in events:
+                self.socketio.emit(event, data, room=session_id)
+
+    def run_blocking(self, fn: Callable, *args):
+        """Run a blocking call without stalling the event loop"""
+        async_mode = getattr(self.socketio, 'async_mode', 'threading')
+        if async_mode == 'eventlet':
+            from eventlet import tpool
+            return tpool.execute(fn, *args)
+        if async_mode == 'gevent':
+            import gevent
+            return gevent.get_hub().threadpool.apply(fn, args)
+        # Threading mode: background tasks are already native threads
+        return fn(*args)
+
+    def run_cpu(self, fn: Callable, *args, **kwargs):
+        """
+        Run a CPU-bound function in the process pool, or inline when no pool is configured
+
+        The function and arguments must be picklable. Worker processes use the
+        spawn start method and load any models they need on first use.
+
+        Args:
+            fn: Module-level function or method of a picklable object
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The function's return value
+        """
+        if not self.cpu_processes:
+            return fn(*args, **kwargs)
+        with self._cpu_lock:
+            if self._cpu_executor is None:
+                self._cpu_executor = ProcessPoolExecutor(
+                    max_workers=self.cpu_processes,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.info(f"✅ Started CPU process pool with {self.cpu_processes} workers")
+        return self._cpu_executor.submit(fn, *args, **kwargs).result()
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'async_mode': getattr(self.socketio, 'async_mode', None),
+                'max_queue_per_session': self.max_queue_per_session,
+                'cpu_processes': self.cpu_processes,
+                'active_sessions': len(self._active),
+                'queued_jobs': sum(len(q) for q in self._queues.values()),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+# Global job dispatcher instance
+job_dispatcher = JobDispatcher()
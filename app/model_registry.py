@@ -0,0 +1,136 @@
+"""
+Model Registry for Voice Stream Application
+Loads speaker recognition models once per worker process and shares them across requests
+"""
+
+import os
+import threading
+import time
+import resource
+import logging
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """
+    Process-wide cache of the ECAPA speaker recognition model
+    """
+
+    def __init__(self):
+        # Model configuration from environment variables
+        self.speaker_model_source = os.getenv('SPEAKER_MODEL_SOURCE', 'speechbrain/spkrec-ecapa-voxceleb')
+        self.speaker_model_savedir = os.getenv('SPEAKER_MODEL_SAVEDIR', 'tmpdir_spkrec')
+        self.preload = os.getenv('PRELOAD_SPEAKER_MODEL', 'no').lower() == 'yes'
+
+        self._speaker_model = None
+        self._load_lock = threading.Lock()
+        # Forward passes are serialized so the shared module is never run re-entrantly
+        self._inference_lock = threading.Lock()
+
+        # Introspection data
+        self.load_time_seconds = None
+        self.loaded_at = None
+        self.load_error = None
+        self.peak_rss_before_load_kb = None
+        self.peak_rss_after_load_kb = None
+
+    def get_speaker_model(self):
+        """
+        Get the shared SpeakerRecognition model, loading it on first use
+
+        Returns:
+            SpeakerRecognition: The cached model instance
+        """
+        if self._speaker_model is not None:
+            return self._speaker_model
+
+        with self._load_lock:
+            # Another thread may have finished loading while we waited
+            if self._speaker_model is None:
+                self._speaker_model = self._load_speaker_model()
+        return self._speaker_model
+
+    @contextmanager
+    def speaker_model(self):
+        """
+        Context manager yielding the shared model while holding the inference lock
+
+        Usage:
+            with model_registry.speaker_model() as verification:
+                embeddings = verification.encode_batch(batch)
+        """
+        model = self.get_speaker_model()
+        with self._inference_lock:
+            yield model
+
+    def _load_speaker_model(self):
+        """Load the ECAPA model from hyperparameters and checkpoints"""
+        from speechbrain.inference import SpeakerRecognition
+
+        self.peak_rss_before_load_kb = self._peak_rss_kb()
+        start = time.perf_counter()
+        try:
+            model = SpeakerRecognition.from_hparams(
+                source=self.speaker_model_source,
+                savedir=self.speaker_model_savedir
+            )
+            model.eval()
+        except Exception as e:
+            self.load_error = str(e)
+            logger.error(f"❌ Failed to load speaker model: {str(e)}")
+            raise e
+
+        self.load_time_seconds = time.perf_counter() - start
+        self.loaded_at = time.time()
+        self.load_error = None
+        self.peak_rss_after_load_kb = self._peak_rss_kb()
+        logger.info(f"✅ Speaker model loaded in {self.load_time_seconds:.2f}s from {self.speaker_model_source}")
+        return model
+
+    def is_loaded(self) -> bool:
+        """Check whether the speaker model is resident in this process"""
+        return self._speaker_model is not None
+
+    def _peak_rss_kb(self) -> int:
+        """Get peak resident set size of this process in kilobytes"""
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def _parameter_bytes(self) -> Optional[int]:
+        """Get the memory held by the model parameters and buffers"""
+        if self._speaker_model is None:
+            return None
+        try:
+            total = 0
+            for module in self._speaker_model.mods.values():
+                for tensor in list(module.parameters()) + list(module.buffers()):
+                    total += tensor.numel() * tensor.element_size()
+            return total
+        except Exception:
+            return None
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get current model registry status info"""
+        peak_rss_delta = None
+        if self.peak_rss_before_load_kb is not None and self.peak_rss_after_load_kb is not None:
+            peak_rss_delta = self.peak_rss_after_load_kb - self.peak_rss_before_load_kb
+
+        return {
+            'pid': os.getpid(),
+            'speaker_model_source': self.speaker_model_source,
+            'speaker_model_savedir': self.speaker_model_savedir,
+            'loaded': self.is_loaded(),
+            'preload': self.preload,
+            'load_time_seconds': self.load_time_seconds,
+            'loaded_at': self.loaded_at,
+            'load_error': self.load_error,
+            'parameter_bytes': self._parameter_bytes(),
+            'peak_rss_delta_kb': peak_rss_delta,
+            'process_peak_rss_kb': self._peak_rss_kb()
+        }
+
+# Global model registry instance
+model_registry = ModelRegistry()
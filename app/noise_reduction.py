@@ -0,0 +1,199 @@
+"""
+Noise Reduction for Voice Stream Application
+Stateful spectral-gating denoiser with a per-session noise profile, run in memory on PCM chunks
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Optional, Dict, Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class StreamDenoiser:
+    """
+    Spectral subtraction over a 50%-overlap STFT that carries state between calls
+
+    The noise profile (mean power per frequency bin) is learned from the
+    quietest frames of the first chunk and then updated slowly, so later
+    chunks reuse it instead of estimating noise from scratch. process() keeps
+    the analysis and overlap-add tails between chunks, so a continuous stream
+    is filtered as one signal with a fixed delay of one frame; reduce()
+    handles standalone recordings with no delay.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: float, strength: float, max_reduction_db: float, adapt_rate: float):
+        self.sample_rate = sample_rate
+        self.frame_length = max(64, int(sample_rate * frame_ms / 1000) // 2 * 2)
+        self.hop = self.frame_length // 2
+        self.strength = strength
+        self.gain_floor = 10 ** (-max_reduction_db / 20)
+        self.adapt_rate = adapt_rate
+        # Square-root periodic Hann for analysis and synthesis sums to one at 50% overlap
+        self.window = np.sqrt(np.hanning(self.frame_length + 1)[:-1]).astype(np.float32)
+
+        self.noise_power: Optional[np.ndarray] = None
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._reset_stream()
+
+    @property
+    def delay_seconds(self) -> float:
+        """How far process() output lags its input"""
+        return self.frame_length / self.sample_rate
+
+    def _reset_stream(self):
+        # Priming with one frame of silence guarantees each call has as many output samples as input
+        self._pending = np.zeros(self.frame_length, dtype=np.float32)
+        self._overlap = np.zeros(self.hop, dtype=np.float32)
+        self._ready = np.zeros(0, dtype=np.float32)
+        self._last_gain: Optional[np.ndarray] = None
+
+    def _update_profile(self, power: np.ndarray):
+        """Fold the quietest 20% of frames into the noise profile"""
+        if len(power) < 5:
+            return
+        frame_energy = power.sum(axis=1)
+        quiet = power[frame_energy <= np.percentile(frame_energy, 20)]
+        estimate = quiet.mean(axis=0)
+        if self.noise_power is None:
+            self.noise_power = estimate
+            return
+        # Follow falling noise quickly and rising noise slowly; a chunk with no quiet frames
+        # (continuous speech) is far above the profile and is not learned as noise
+        ratio = estimate.sum() / max(float(self.noise_power.sum()), 1e-12)
+        if ratio > 4.0:
+            return
+        rate = min(1.0, self.adapt_rate * 4) if ratio < 1.0 else self.adapt_rate
+        self.noise_power += rate * (estimate - self.noise_power)
+
+    def _filter(self, samples: np.ndarray) -> np.ndarray:
+        """Run the STFT filter over buffered input, returning the completed output samples"""
+        buffer = np.concatenate((self._pending, samples))
+        n_frames = (len(buffer) - self.frame_length) // self.hop + 1 if len(buffer) >= self.frame_length else 0
+        if n_frames == 0:
+            self._pending = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        frames = sliding_window_view(buffer, self.frame_length)[::self.hop][:n_frames] * self.window
+        spectrum = np.fft.rfft(frames, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        self._update_profile(power)
+
+        gain = np.clip(1.0 - self.strength * self.noise_power / np.maximum(power, 1e-12), self.gain_floor, 1.0)
+        # Smooth the gain over neighbouring bins and the previous frame to avoid musical noise
+        gain[:, 1:-1] = (gain[:, :-2] + gain[:, 1:-1] + gain[:, 2:]) / 3
+        previous = np.vstack(([self._last_gain] if self._last_gain is not None else gain[:1], gain[:-1]))
+        self._last_gain = gain[-1].copy()
+        gain = (gain + previous) / 2
+
+        filtered = np.fft.irfft(spectrum * gain, n=self.frame_length, axis=1).astype(np.float32) * self.window
+
+        # Overlap-add: each output hop is the second half of one frame plus the first half of the next
+        output = np.zeros((n_frames + 1, self.hop), dtype=np.float32)
+        output[:-1] += filtered[:, :self.hop]
+        output[1:] += filtered[:, self.hop:]
+        output[0] += self._overlap
+        self._overlap = output[-1]
+        self._pending = buffer[n_frames * self.hop:]
+        return output[:-1].ravel()
+
+    def reset_stream(self):
+        """Start a new continuous stream, keeping the learned noise profile"""
+        with self._lock:
+            self._reset_stream()
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Denoise the next chunk of a continuous stream
+
+        Args:
+            samples: Float32 mono samples in [-1, 1]
+
+        Returns:
+            np.ndarray: Denoised samples, same length as the input, delayed by one frame
+        """
+        with self._lock:
+            self.last_used = time.monotonic()
+            ready = np.concatenate((self._ready, self._filter(np.asarray(samples, dtype=np.float32))))
+            self._ready = ready[len(samples):]
+            return ready[:len(samples)]
+
+    def reduce(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Denoise a standalone recording, keeping the learned noise profile
+
+        Args:
+            samples: Float32 mono samples in [-1, 1]
+
+        Returns:
+            np.ndarray: Denoised samples aligned with the input
+        """
+        with self._lock:
+            self.last_used = time.monotonic()
+            self._reset_stream()
+            samples = np.asarray(samples, dtype=np.float32)
+            output = self._filter(np.concatenate((samples, np.zeros(self.frame_length, dtype=np.float32))))
+            self._reset_stream()
+            return output[self.frame_length:self.frame_length + len(samples)]
+
+class NoiseReducerManager:
+    """
+    Per-socket-session registry of StreamDenoiser instances
+    """
+
+    def __init__(self):
+        # Noise reduction configuration from environment variables
+        self.frame_ms = float(os.getenv('NOISE_REDUCTION_FRAME_MS', '32'))
+        self.strength = float(os.getenv('NOISE_REDUCTION_STRENGTH', '1.5'))
+        self.max_reduction_db = float(os.getenv('NOISE_REDUCTION_MAX_DB', '15'))
+        self.adapt_rate = float(os.getenv('NOISE_PROFILE_ADAPT_RATE', '0.05'))
+        self.idle_timeout = float(os.getenv('NOISE_REDUCTION_IDLE_TIMEOUT', '300'))
+
+        self._denoisers: Dict[str, StreamDenoiser] = {}
+        self._lock = threading.Lock()
+
+    def create(self, sample_rate: int) -> StreamDenoiser:
+        """Create a denoiser not tied to any session"""
+        return StreamDenoiser(sample_rate, self.frame_ms, self.strength, self.max_reduction_db, self.adapt_rate)
+
+    def get(self, session_id: str, sample_rate: int) -> StreamDenoiser:
+        """Get the session's denoiser, creating it on first use or when the sample rate changes"""
+        self.evict_idle()
+        with self._lock:
+            denoiser = self._denoisers.get(session_id)
+            if denoiser is None or denoiser.sample_rate != sample_rate:
+                denoiser = self.create(sample_rate)
+                self._denoisers[session_id] = denoiser
+            return denoiser
+
+    def close(self, session_id: str):
+        with self._lock:
+            self._denoisers.pop(session_id, None)
+
+    def evict_idle(self):
+        """Forget denoisers whose session has not sent audio within idle_timeout"""
+        now = time.monotonic()
+        with self._lock:
+            for session_id in [sid for sid, d in self._denoisers.items() if now - d.last_used > self.idle_timeout]:
+                del self._denoisers[session_id]
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'active_denoisers': len(self._denoisers),
+                'frame_ms': self.frame_ms,
+                'strength': self.strength,
+                'max_reduction_db': self.max_reduction_db,
+                'adapt_rate': self.adapt_rate,
+                'idle_timeout': self.idle_timeout
+            }
+
+# Global noise reducer manager instance
+noise_reducers = NoiseReducerManager()
@@ -0,0 +1,149 @@
+"""
+Rate Control for Voice Stream Application
+Token-bucket rate limiting, jittered retry backoff and AIMD concurrency control for provider API calls
+"""
+
+import time
+import random
+import threading
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that blocks callers until a request may be sent
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while, e.g. after the provider sends Retry-After"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rate_per_second': self.rate,
+                'burst': self.capacity,
+                'tokens': round(self._tokens, 2),
+                'paused_for_seconds': round(max(0.0, self._paused_until - time.monotonic()), 2)
+            }
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight requests
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 32,
+                 decrease_factor: float = 0.5, decrease_cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot under the current limit"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False):
+        """
+        Free a slot and adapt the limit
+
+        Args:
+            throttled: The provider rejected the request for load (429/503)
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                # One decrease per cooldown so a burst of 429s from the same window counts once
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    logger.warning(f"Provider throttling, concurrency limit reduced to {int(self.limit)}")
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'minimum': self.minimum,
+                'maximum': self.maximum
+            }
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """
+    Full-jitter exponential backoff, never shorter than the server's Retry-After
+
+    Args:
+        attempt: Zero-based retry number
+        base: Delay scale in seconds
+        cap: Largest jittered delay in seconds
+        retry_after: Seconds requested by the server, if any
+
+    Returns:
+        float: Seconds to sleep before retrying
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given as seconds or an HTTP date
+
+    Args:
+        value: Header value
+
+    Returns:
+        float: Seconds to wait, or None if absent or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
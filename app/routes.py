@@ -1,19 +1,29 @@
 from flask import request, jsonify, render_template, Response, send_file
+from werkzeug.http import http_date
+import click
 from app import app, socketio
 from flask_socketio import emit
-import io
-import requests
 import os
+import sys
 import sqlite3
 import base64
-import time
 import json
 import zipfile
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv, find_dotenv
 from app.storage_manager import storage_manager
 from app.database_manager import database_manager
+from app.transcription_client import transcription_client
+from app.audio_converter import audio_converter, ConvertedAudio, AudioConversionError
+from app.audio_probe import probe_duration
+from app.job_dispatcher import job_dispatcher
+from app.streaming_session import streaming_store
+from app.transcript_merge import merge_overlapping_transcripts
+from app.vad import vad
+from app.noise_reduction import noise_reducers
+from app.ids import id_generator
 
 load_dotenv(find_dotenv())
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -21,18 +31,39 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 # Database initialization is now handled by database_manager
 # Remove the old init_annotation_db function and replace with database_manager initialization
 
-def transcribe_audio(audio_file, language='en'):
-    url = 'https://api.openai.com/v1/audio/transcriptions'
-    headers = {
-        'Authorization': f'Bearer {OPENAI_API_KEY}'
-    }
-    files = {
-        'file': ('audio.wav', audio_file, 'audio/wav'),
-        'model': (None, 'whisper-1'),
-        'language': (None, language)
-    }
-    r = requests.post(url, headers=headers, files=files)
-    return r.json()
+def transcribe_audio(audio_file, language='en', word_timestamps=False):
+    return transcription_client.transcribe(audio_file, language, word_timestamps)
+
+# Bounded pool shared by all segment transcription so concurrent uploads cannot exceed the cap
+TRANSCRIPTION_CONCURRENCY = transcription_client.concurrency
+transcription_executor = ThreadPoolExecutor(max_workers=TRANSCRIPTION_CONCURRENCY, thread_name_prefix='transcribe')
+
+def transcribe_segments(pcm, segments, language='en', word_timestamps=False):
+    """Transcribe (start, end) slices of a PcmBuffer in parallel, returning results in segment order"""
+    def _transcribe(segment):
+        start_time, end_time = segment
+        return transcribe_audio(pcm.slice_wav(start_time, end_time), language, word_timestamps)
+    return list(transcription_executor.map(_transcribe, segments))
+
+def denoise_audio(audio, session_id=None, continuous=False):
+    """
+    Denoise a ConvertedAudio in memory, returning the input unchanged on failure
+
+    Args:
+        audio: ConvertedAudio to clean
+        session_id: Session whose learned noise profile is reused and updated; None for a one-off profile
+        continuous: The audio continues the session's previous chunk (streaming), so filter state carries over
+    """
+    try:
+        if session_id is None:
+            denoiser = noise_reducers.create(audio.sample_rate)
+        else:
+            denoiser = noise_reducers.get(session_id, audio.sample_rate)
+        samples = denoiser.process(audio.samples) if continuous else denoiser.reduce(audio.samples)
+        return ConvertedAudio.from_samples(samples, audio.sample_rate)
+    except Exception as e:
+        print(f"[WARN] Denoising failed: {e}", file=sys.stderr)
+        return audio
 
 # Audio Annotation API Endpoints
 @app.route('/api/annotation/projects', methods=['GET'])
@@ -43,6 +74,13 @@ def get_projects():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.cli.command('rebuild-annotation-counters')
+@click.option('--project-id', default=None, help='Rebuild one project instead of all of them')
+def rebuild_annotation_counters(project_id):
+    """Recompute the maintained per-project annotation counters"""
+    rebuilt = database_manager.rebuild_annotation_counters(project_id)
+    click.echo(f"Rebuilt annotation counters for {rebuilt} project(s)")
+
 @app.route('/api/annotation/create-project', methods=['POST'])
 def create_project():
     try:
@@ -75,11 +113,30 @@ def create_project():
             return jsonify({'success': False, 'error': 'Project name already exists'})
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/annotation/project/<int:project_id>/annotations', methods=['GET'])
+@app.route('/api/annotation/project/<project_id>/annotations', methods=['GET'])
 def get_project_annotations(project_id):
+    """
+    One page of a project's annotations
+
+    Query parameters: limit (page size), cursor (next_cursor of the previous page)
+    and fields (comma-separated fields to return). The first page also carries
+    the project summary.
+    """
     try:
-        annotations = database_manager.get_project_annotations(str(project_id))
-        return jsonify({'success': True, 'annotations': annotations})
+        fields = [field.strip() for field in request.args.get('fields', '').split(',') if field.strip()]
+        cursor = request.args.get('cursor') or None
+        try:
+            page = database_manager.list_project_annotations(
+                str(project_id),
+                limit=request.args.get('limit', type=int),
+                cursor=cursor,
+                fields=fields or None
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        if cursor is None:
+            page['summary'] = database_manager.get_annotation_summary(str(project_id))
+        return jsonify(dict(page, success=True))
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -97,9 +154,8 @@ def save_annotation():
         if not all([project_id, audio_data, transcript]):
             return jsonify({'success': False, 'error': 'Missing required fields'})
 
-        # Get project workspace path from database manager
-        projects = database_manager.get_projects()
-        project = next((p for p in projects if str(p['id']) == str(project_id)), None)
+        # Get project workspace path by primary key
+        project = database_manager.get_project(project_id)
 
         if not project:
             return jsonify({'success': False, 'error': 'Project not found'})
@@ -107,12 +163,13 @@ def save_annotation():
         workspace_path = project['workspace_path']
 
         # Generate unique filename
-        timestamp = int(time.time() * 1000)
-        audio_filename = f"audio_{timestamp}.wav"
+        audio_filename = f"{id_generator.new_id('audio_')}.wav"
         audio_path = f"{workspace_path}/audio/{audio_filename}"
 
         # Decode audio data
         audio_bytes = base64.b64decode(audio_data)
+        if not duration:
+            duration = probe_duration(audio_bytes)
 
         # Create directories if they don't exist (for local storage)
         if storage_manager.storage_mode == 'local':
@@ -136,6 +193,64 @@ def save_annotation():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+def serve_stored_audio(audio_path, filename, file_info):
+    """
+    Build the response for a stored audio file, honouring conditional and range requests
+
+    A matching If-None-Match (or, without it, If-Modified-Since) gets 304. A
+    single byte range gets 206 with only that range read from storage, so
+    seeking in a long recording does not transfer the whole file. Multiple
+    ranges, or a range whose If-Range validator is stale, get the full file.
+
+    Returns:
+        Response, or None if the file disappeared after it was found
+    """
+    size = file_info['size']
+    etag = file_info['etag']
+    headers = {
+        'Content-Disposition': f'inline; filename="{filename}"',
+        'Accept-Ranges': 'bytes',
+        'ETag': f'"{etag}"',
+        'Last-Modified': http_date(file_info['last_modified']),
+        # Cache, but revalidate with the ETag before reuse
+        'Cache-Control': 'no-cache'
+    }
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        not_modified = since is not None and int(file_info['last_modified']) <= since.timestamp()
+    if not_modified:
+        return Response(status=304, headers=headers)
+
+    byte_range = request.range
+    if byte_range is not None and 'If-Range' in request.headers:
+        if_range = request.if_range
+        if if_range.etag is not None:
+            fresh = if_range.etag == etag
+        else:
+            fresh = if_range.date is not None and int(file_info['last_modified']) <= if_range.date.timestamp()
+        if not fresh:
+            byte_range = None
+
+    if byte_range is not None and len(byte_range.ranges) == 1:
+        span = byte_range.range_for_length(size)
+        if span is None:
+            headers['Content-Range'] = f'bytes */{size}'
+            return Response(status=416, headers=headers)
+        start, stop = span
+        content = storage_manager.load_file_range(audio_path, start, stop - 1)
+        if content is None:
+            return None
+        headers['Content-Range'] = f'bytes {start}-{start + len(content) - 1}/{size}'
+        return Response(content, status=206, mimetype='audio/wav', headers=headers)
+
+    content = storage_manager.load_file(audio_path)
+    if content is None:
+        return None
+    return Response(content, mimetype='audio/wav', headers=headers)
+
 @app.route('/api/annotation/audio/<filename>')
 def serve_annotation_audio(filename):
     import sys
@@ -157,16 +272,14 @@ def serve_annotation_audio(filename):
         audio_path = annotation['audio_path']
         print(f"[DEBUG] Audio path from database: {audio_path}", file=sys.stderr)
 
-        # Try to load file using storage manager
+        # Try to serve the file from the storage manager, reading only the requested range
         try:
-            file_content = storage_manager.load_file(audio_path)
-            if file_content:
-                print(f"[INFO] Audio file loaded via storage manager: {audio_path}", file=sys.stderr)
-                return Response(
-                    file_content,
-                    mimetype='audio/wav',
-                    headers={'Content-Disposition': f'inline; filename="{filename}"'}
-                )
+            file_info = storage_manager.stat_file(audio_path)
+            if file_info:
+                response = serve_stored_audio(audio_path, filename, file_info)
+                if response is not None:
+                    print(f"[INFO] Audio file served via storage manager: {audio_path} ({response.status_code})", file=sys.stderr)
+                    return response
         except Exception as storage_error:
             print(f"[WARN] Storage manager failed: {storage_error}", file=sys.stderr)
 
@@ -244,17 +357,7 @@ def tts():
     if not text:
         return jsonify({'error': 'No text provided'}), 400
     try:
-        url = 'https://api.openai.com/v1/audio/speech'
-        headers = {
-            'Authorization': f'Bearer {OPENAI_API_KEY}',
-        }
-        data = {
-            'model': 'tts-1',
-            'input': text,
-            'voice': 'alloy',
-            'response_format': 'mp3'
-        }
-        response = requests.post(url, headers=headers, json=data, stream=True)
+        response = transcription_client.speech(text)
         def generate():
             for chunk in response.iter_content(chunk_size=4096):
                 if chunk:
@@ -270,49 +373,20 @@ def tts_stream():
         audio_b64 = data.get('audio')
         language = data.get('language', 'en')
         noise_cancellation = data.get('noise_cancellation', False)
-        denoised_wav_path = None
         if not audio_b64:
             return jsonify({'error': 'No audio provided'}), 400
-        import tempfile
-        audio_bytes = base64.b64decode(audio_b64)
-        with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as temp_audio:
-            temp_audio.write(audio_bytes)
-            temp_audio.flush()
-            webm_path = temp_audio.name
-        wav_path = webm_path.replace('.webm', '.wav')
-        import subprocess
-        with open(webm_path, 'rb') as webm_in, open(wav_path, 'wb') as wav_out:
-            subprocess.run([
-                'ffmpeg', '-y', '-i', 'pipe:0', '-ar', '16000', '-ac', '1', '-f', 'wav', 'pipe:1'
-            ], input=webm_in.read(), stdout=wav_out)
+        audio = audio_converter.convert_bytes(base64.b64decode(audio_b64), suffix='.webm')
         if noise_cancellation:
-            denoised_wav_path = wav_path.replace('.wav', '_denoised.wav')
-            try:
-                import noisereduce as nr
-                import librosa
-                import soundfile as sf
-                audio_data, sample_rate = librosa.load(wav_path, sr=None)
-                reduced_noise = nr.reduce_noise(y=audio_data, sr=sample_rate)
-                sf.write(denoised_wav_path, reduced_noise, sample_rate)
-                wav_path = denoised_wav_path
-            except Exception as e:
-                print(f"[WARN] Denoising failed: {e}")
-        with open(wav_path, 'rb') as wav_file:
-            transcription = transcribe_audio(wav_file, language)
-        try:
-            os.remove(webm_path)
-            os.remove(wav_path)
-            if noise_cancellation and denoised_wav_path:
-                os.remove(denoised_wav_path)
-        except Exception:
-            pass
+            # Each request gets a one-off profile; the caller cannot create server-side state
+            audio = denoise_audio(audio)
+        if not vad.analyze(audio.pcm, audio.sample_rate).has_speech():
+            return jsonify({'partial_text': ''})
+        transcription = transcribe_audio(audio.wav_file(), language)
         return jsonify({'partial_text': transcription.get('text', '')})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# Speaker diarization utility functions
-import torch
-import torchaudio
+# Speaker diarization utility functions; torch and torchaudio are imported on first use
 import warnings
 
 warnings.filterwarnings("ignore", message=".*torchaudio._backend.list_audio_backends has been deprecated.*")
@@ -322,72 +396,85 @@ warnings.filterwarnings("ignore", message=".*torchaudio.save_with_torchcodec.*")
 warnings.filterwarnings("ignore", category=FutureWarning, module="speechbrain")
 warnings.filterwarnings("ignore", category=UserWarning, module="torchaudio")
 
-from speechbrain.inference import SpeakerRecognition
-
-def diarize_and_transcribe(wav_path, language='en'):
+from app.model_registry import model_registry
+from app.diarization_engine import diarization_engine
+from app.audio_io import PcmBuffer
+from app.stream_decoder import stream_decoders, STREAM_SAMPLE_RATE
+from app.audio_frame import decode_audio_frame, AudioFrameError
+from app.warmup import warmup
+
+def import_audio_stack():
+    """Import torch and torchaudio, which take seconds on a cold start"""
+    import torch
+    import torchaudio
+    return torch, torchaudio
+
+warmup.register('database', database_manager.ensure_initialized, database_manager.is_initialized)
+warmup.register('storage', storage_manager.ensure_initialized, storage_manager.is_initialized)
+warmup.register('torch', import_audio_stack, lambda: 'torchaudio' in sys.modules)
+warmup.register('speaker_model', model_registry.get_speaker_model, model_registry.is_loaded)
+
+def load_waveform(audio):
+    """Return (waveform tensor, sample rate) for a ConvertedAudio or anything torchaudio.load accepts"""
+    torch, torchaudio = import_audio_stack()
+    if isinstance(audio, ConvertedAudio):
+        return torch.from_numpy(audio.samples).unsqueeze(0), audio.sample_rate
+    return torchaudio.load(audio)
+
+def detect_speech(waveform, sample_rate):
+    """Run voice activity detection over a (channels, samples) waveform tensor"""
+    return vad.analyze(waveform.mean(dim=0).numpy(), sample_rate)
+
+def diarize_and_transcribe(audio, language='en'):
     try:
-        verification = SpeakerRecognition.from_hparams(
-            source="speechbrain/spkrec-ecapa-voxceleb",
-            savedir="tmpdir_spkrec"
-        )
-        waveform, sample_rate = torchaudio.load(wav_path)
+        waveform, sample_rate = load_waveform(audio)
+        speech = detect_speech(waveform, sample_rate)
+        if not speech.has_speech():
+            return []
         segment_duration = 10.0
-        total_duration = waveform.shape[1] / sample_rate
+        turns = job_dispatcher.run_cpu(diarization_engine.diarize, waveform, sample_rate)
+        pcm = PcmBuffer(waveform, sample_rate)
+        # Cut each speaker turn along its speech regions so silence is never transcribed
+        segments = [
+            {'speaker': turn['speaker'], 'start': start, 'end': end}
+            for turn in turns
+            for start, end in speech.segments(segment_duration, within=(turn['start'], turn['end']))
+        ]
+        transcriptions = transcribe_segments(pcm, [(seg['start'], seg['end']) for seg in segments], language)
         results = []
-        current_speaker_id = 0
-
-        for start_time in range(0, int(total_duration), int(segment_duration)):
-            end_time = min(start_time + segment_duration, total_duration)
-            segment_wav = f"{wav_path}_segment_{start_time:.2f}_{end_time:.2f}.wav"
-            start_sample = int(start_time * sample_rate)
-            end_sample = int(end_time * sample_rate)
-            segment_audio = waveform[:, start_sample:end_sample]
-            torchaudio.save(segment_wav, segment_audio, sample_rate)
-            speaker_label = f"SPEAKER_{current_speaker_id % 2}"
-
-            with open(segment_wav, 'rb') as seg_file:
-                transcription = transcribe_audio(seg_file, language)
+
+        for segment, transcription in zip(segments, transcriptions):
             text = transcription.get('text', '')
 
             if text.strip():
                 results.append({
-                    'speaker': speaker_label,
-                    'start': start_time,
-                    'end': end_time,
+                    'speaker': segment['speaker'],
+                    'start': segment['start'],
+                    'end': segment['end'],
                     'text': text
                 })
 
-            try:
-                os.remove(segment_wav)
-            except Exception:
-                pass
-            current_speaker_id += 1
-
         return results
     except Exception as e:
         print(f"[WARN] SpeechBrain diarization failed: {e}")
-        return simple_segmentation_fallback(wav_path, language)
+        return simple_segmentation_fallback(audio, language)
 
-def simple_segmentation_fallback(wav_path, language='en'):
+def simple_segmentation_fallback(audio, language='en'):
     try:
-        import librosa
-        audio_data, sample_rate = librosa.load(wav_path, sr=None)
-        total_duration = len(audio_data) / sample_rate
+        if isinstance(audio, ConvertedAudio):
+            pcm = PcmBuffer(audio.pcm, audio.sample_rate)
+            speech = vad.analyze(audio.pcm, audio.sample_rate)
+        else:
+            import librosa
+            audio_data, sample_rate = librosa.load(audio, sr=None)
+            pcm = PcmBuffer(audio_data, sample_rate)
+            speech = vad.analyze(audio_data, sample_rate)
         segment_duration = 15.0
+        segments = speech.segments(segment_duration)
+        transcriptions = transcribe_segments(pcm, segments, language)
         results = []
 
-        for start_time in range(0, int(total_duration), int(segment_duration)):
-            end_time = min(start_time + segment_duration, total_duration)
-            start_sample = int(start_time * sample_rate)
-            end_sample = int(end_time * sample_rate)
-            segment_audio = audio_data[start_sample:end_sample]
-            segment_wav = f"{wav_path}_fallback_segment_{start_time:.2f}_{end_time:.2f}.wav"
-
-            import soundfile as sf
-            sf.write(segment_wav, segment_audio, sample_rate)
-
-            with open(segment_wav, 'rb') as seg_file:
-                transcription = transcribe_audio(seg_file, language)
+        for (start_time, end_time), transcription in zip(segments, transcriptions):
             text = transcription.get('text', '')
 
             if text.strip():
@@ -398,61 +485,48 @@ def simple_segmentation_fallback(wav_path, language='en'):
                     'text': text
                 })
 
-            try:
-                os.remove(segment_wav)
-            except Exception:
-                pass
-
         return results
     except Exception as e:
         print(f"[ERROR] Fallback segmentation failed: {e}")
         return None
 
-def diarize_and_transcribe_streaming(wav_path, language='en', segment_offset=0):
+def diarize_and_transcribe_streaming(audio, language='en', segment_offset=0, speaker_tracker=None):
+    """
+    Diarize one streaming chunk
+
+    Args:
+        audio: The chunk's audio
+        language: Transcription language
+        segment_offset: The chunk's start time in the session stream
+        speaker_tracker: The stream's SpeakerTracker, which maps the chunk's speakers to stream-wide labels
+    """
     try:
-        verification = SpeakerRecognition.from_hparams(
-            source="speechbrain/spkrec-ecapa-voxceleb",
-            savedir="tmpdir_spkrec"
-        )
-        waveform, sample_rate = torchaudio.load(wav_path)
+        waveform, sample_rate = load_waveform(audio)
+        speech = detect_speech(waveform, sample_rate)
+        if not speech.has_speech():
+            return []
+        turns, speakers = job_dispatcher.run_cpu(diarization_engine.diarize_with_speakers, waveform, sample_rate)
+        if speaker_tracker is not None:
+            turns = speaker_tracker.relabel(turns, speakers)
+        pcm = PcmBuffer(waveform, sample_rate)
         chunk_duration = 5.0
         overlap_duration = 2.0
-        results = []
-        current_time = segment_offset
-
-        while current_time < (waveform.shape[1] / sample_rate):
-            end_time = min(current_time + chunk_duration, waveform.shape[1] / sample_rate)
-            start_sample = int(current_time * sample_rate)
-            end_sample = int(end_time * sample_rate)
-            audio_chunk = waveform[:, start_sample:end_sample]
-
-            if audio_chunk.numel() == 0:
-                current_time = end_time
-                continue
-
-            chunk_wav = f"{wav_path}_chunk_{current_time:.2f}_{end_time:.2f}.wav"
-            torchaudio.save(chunk_wav, audio_chunk, sample_rate)
+        # Windows follow speech and end in pauses; only speech longer than a window is split with overlap
+        chunks = speech.segments(chunk_duration, overlap_seconds=overlap_duration)
 
-            with open(chunk_wav, 'rb') as wav_file:
-                transcription = transcribe_audio(wav_file, language)
-            text = transcription.get('text', '')
-
-            speaker_label = f"SPEAKER_{len(results) % 2}"
-
-            if text.strip():
-                results.append({
-                    'speaker': speaker_label,
-                    'start': current_time,
-                    'end': end_time,
-                    'text': text
-                })
+        # Overlapping windows hear shared words twice; merge them on word timestamps
+        transcriptions = transcribe_segments(pcm, chunks, language, word_timestamps=True)
+        results = []
 
-            try:
-                os.remove(chunk_wav)
-            except Exception:
-                pass
+        for segment in merge_overlapping_transcripts(chunks, transcriptions):
+            speaker_label = diarization_engine.dominant_speaker(turns, segment['start'], segment['end'])
 
-            current_time += chunk_duration - overlap_duration
+            results.append({
+                'speaker': speaker_label,
+                'start': round(segment_offset + segment['start'], 3),
+                'end': round(segment_offset + segment['end'], 3),
+                'text': segment['text']
+            })
 
         return results
     except Exception as e:
@@ -479,31 +553,188 @@ def batch_upload():
 VOICE_UPLOAD_PERSIST = os.getenv('VOICE_UPLOAD_PERSIST', 'no').lower() == 'yes'
 
 def register_socketio_events(socketio):
-    # Session-based streaming state management
-    streaming_sessions = {}
+    job_dispatcher.init_app(socketio)
+
+    # Sockets whose webm stream lost a rejected chunk since their last accepted one
+    decoder_gaps = set()
+
+    def restart_decoder_then(emit, sid, job, *args):
+        """Restart the session's decoder where rejected chunks left a gap, then run the chunk's job"""
+        stream_decoders.get(sid).restart()
+        job(emit, *args)
+
+    def dispatch_audio_job(sid, job, *args, streaming=False):
+        """
+        Queue a job for the session and acknowledge at once, signalling backpressure when the queue is full
+
+        A rejected streaming chunk leaves a hole in the middle of the session's
+        webm stream, so the client is told to restart its recorder and the next
+        accepted chunk first restarts the decoder. The restart runs in the
+        session's job thread, in queue order, so the event loop never waits for
+        ffmpeg and chunks queued before the hole are still decoded.
+        """
+        import sys
+        restart = streaming and sid in decoder_gaps
+        if restart:
+            job, args = restart_decoder_then, (sid, job) + args
+        accepted, depth = job_dispatcher.submit(sid, job, *args)
+        if accepted and restart:
+            decoder_gaps.discard(sid)
+        if not accepted:
+            print(f"[WARN] Audio queue full for session {sid} ({depth} jobs), rejecting message", file=sys.stderr)
+            if streaming and stream_decoders.has(sid):
+                decoder_gaps.add(sid)
+            socketio.emit('audio_backpressure', {
+                'queue_depth': depth,
+                'max_queue_depth': job_dispatcher.max_queue_per_session,
+                'restart_stream': streaming
+            }, room=sid)
+        return {'accepted': accepted, 'queue_depth': depth}
+
+    def process_streaming_chunk(emit, sid, stream_id, webm_bytes, language, noise_cancellation):
+        """Decode a streaming diarization chunk with the session's ffmpeg process and emit new segments"""
+        import sys
+        session = streaming_store.get(stream_id)
+        decoder = stream_decoders.get(sid)
+        new_stream = decoder.stream_id != stream_id
+        samples, stream_offset = decoder.decode_chunk(webm_bytes, stream_id, base_offset=session.audio_end)
+        if new_stream and noise_cancellation:
+            # A new recording on this socket is not a continuation of the previous one's filter state
+            noise_reducers.get(sid, STREAM_SAMPLE_RATE).reset_stream()
+        session.audio_end = max(session.audio_end, stream_offset + len(samples) / STREAM_SAMPLE_RATE)
+        if len(samples) < STREAM_SAMPLE_RATE // 10:
+            print(f"[DEBUG] Chunk produced no audio yet for session: {sid}", file=sys.stderr)
+            return
+        print(f"[DEBUG] Decoded {len(samples) / STREAM_SAMPLE_RATE:.2f}s at stream offset {stream_offset:.2f}s", file=sys.stderr)
+
+        audio = ConvertedAudio(samples, STREAM_SAMPLE_RATE)
+        if noise_cancellation:
+            denoised = denoise_audio(audio, sid, continuous=True)
+            if denoised is not audio:
+                # The streaming denoiser's output lags its input by one STFT frame
+                stream_offset -= noise_reducers.get(sid, audio.sample_rate).delay_seconds
+            audio = denoised
+
+        # Only diarize chunks that contain speech; silence never reaches the API
+        if not vad.analyze(audio.pcm, audio.sample_rate).has_speech():
+            print(f"[DEBUG] No speech in chunk at {stream_offset:.2f}s, skipping", file=sys.stderr)
+            return
+
+        try:
+            if session.speaker_tracker is None:
+                session.speaker_tracker = diarization_engine.create_speaker_tracker()
+            diarization_results = diarize_and_transcribe_streaming(audio, language, stream_offset, session.speaker_tracker)
+        except Exception as e:
+            print(f"[WARN] Diarization failed: {e}", file=sys.stderr)
+            emit('transcription_update', {
+                'error': f'Diarization failed: {str(e)}',
+                'question': '',
+                'answer': '',
+                'diarization': []
+            })
+            return
+
+        if not diarization_results:
+            print(f"[WARN] No diarization results obtained", file=sys.stderr)
+            return
+
+        print(f"[DEBUG] Diarization results: {len(diarization_results)} segments", file=sys.stderr)
+        stored = session.append(diarization_results)
+
+        # Only the new segments; clients that miss an update resync from their last seq
+        emit('streaming_diarization_update', {
+            'stream_id': stream_id,
+            'diarization': stored,
+            'seq_start': stored[0]['seq'],
+            'last_seq': stored[-1]['seq']
+        })
+
+    @socketio.on('streaming_resync')
+    def handle_streaming_resync(data):
+        """Return the segments of a stream after the client's last sequence number via the ack"""
+        import sys
+        import json
+        from flask import request as flask_request
+        sid = flask_request.sid if hasattr(flask_request, 'sid') else None
+        try:
+            payload = json.loads(data) if isinstance(data, str) else (data or {})
+            stream_id = payload.get('stream_id') or sid
+            from_seq = int(payload.get('from_seq', -1))
+        except (ValueError, TypeError) as e:
+            return {'success': False, 'error': f'Invalid resync request: {str(e)}'}
+
+        session = streaming_store.get(stream_id, create=False)
+        if session is None:
+            return {'success': False, 'error': 'Unknown or expired stream'}
+        result = session.since(from_seq, streaming_store.resync_limit)
+        print(f"[DEBUG] Resync {stream_id} from seq {from_seq}: {len(result['segments'])} segments", file=sys.stderr)
+        return dict(result, success=True, stream_id=stream_id)
 
     @socketio.on('audio_blob')
     def handle_audio_blob(data):
-        import base64
         import sys
-        import os
         import json
-        import time
         from flask import request as flask_request
         sid = flask_request.sid if hasattr(flask_request, 'sid') else None
         print(f"[DEBUG] Received audio_blob event for session: {sid}", file=sys.stderr)
+        # Parse JSON payload
         try:
-            # Parse JSON payload
-            try:
-                payload = json.loads(data)
-            except Exception:
-                payload = None
+            payload = json.loads(data)
+        except Exception:
+            payload = None
+        streaming = bool(payload and payload.get('streaming_diarization'))
+        return dispatch_audio_job(sid, process_audio_message, sid, data, payload, streaming=streaming)
+
+    # Last sequence number seen per (socket, client stream) for binary frames
+    frame_sequences = {}
 
+    @socketio.on('audio_frame')
+    def handle_audio_frame(data):
+        """Binary counterpart of audio_blob: metadata header plus raw audio, no base64 or JSON body"""
+        import sys
+        from flask import request as flask_request
+        sid = flask_request.sid if hasattr(flask_request, 'sid') else None
+        try:
+            header, audio = decode_audio_frame(data)
+        except AudioFrameError as e:
+            print(f"[WARN] Rejected audio_frame from {sid}: {e}", file=sys.stderr)
+            socketio.emit('transcription_update', {'error': f'Invalid audio frame: {str(e)}'}, room=sid)
+            return {'accepted': False, 'error': str(e)}
+
+        seq = header.get('seq')
+        stream_key = (sid, header.get('session'))
+        if isinstance(seq, int):
+            last_seq = frame_sequences.get(stream_key)
+            if last_seq is not None and seq <= last_seq:
+                print(f"[WARN] Dropping duplicate or late frame {seq} (last {last_seq}) for session: {sid}", file=sys.stderr)
+                return {'accepted': False, 'duplicate': True}
+            if last_seq is not None and seq > last_seq + 1:
+                print(f"[WARN] Frames {last_seq + 1}-{seq - 1} missing for session: {sid}", file=sys.stderr)
+
+        print(f"[DEBUG] Received audio_frame seq={seq} codec={header.get('codec')} ({len(audio)} bytes) for session: {sid}", file=sys.stderr)
+        result = dispatch_audio_job(sid, process_audio_message, sid, None, header, audio,
+                                    streaming=bool(header.get('streaming_diarization')))
+        # A rejected frame may be retried with the same seq, so only accepted frames advance it
+        if isinstance(seq, int) and result['accepted']:
+            frame_sequences[stream_key] = seq
+        return result
+
+    def process_audio_message(emit, sid, data, payload, audio_view=None):
+        """
+        Shared handling for audio_blob and audio_frame messages, run by the job dispatcher
+
+        Args:
+            emit: Callable(event, data) sending an event to the session
+            sid: Socket session id
+            data: Raw audio_blob message, used by the legacy base64 text fallback
+            payload: Decoded JSON payload or binary frame header
+            audio_view: Audio bytes from a binary frame; JSON payloads carry base64 in payload['audio']
+        """
+        import base64
+        import sys
+        try:
             language = 'en'
             question = ''
-            webm_filename = None
-            wav_filename = None
-            denoised_wav_filename = None
             is_webm = False
             noise_cancellation = False
             diarization_results = None
@@ -522,167 +753,107 @@ def register_socketio_events(socketio):
 
                 print(f"[DEBUG] Mode - streaming: {streaming_diarization}, diarization_only: {diarization_only}", file=sys.stderr)
 
-                if 'audio' in payload:
+                if audio_view is not None or 'audio' in payload:
                     # Audio input
-                    audio_bytes = io.BytesIO(base64.b64decode(payload['audio']))
-                    header = audio_bytes.getbuffer()[:4]
-                    is_webm = header == b'\x1A\x45\xDF\xA3'
+                    if audio_view is None:
+                        audio_view = memoryview(base64.b64decode(payload['audio']))
+                    is_webm = audio_view[:4] == b'\x1A\x45\xDF\xA3'
+
+                    # Streaming chunks continue one webm stream per session (only the first carries
+                    # the EBML header) and are decoded in memory by a long-lived ffmpeg process
+                    if streaming_diarization and (is_webm or stream_decoders.has(sid)):
+                        process_streaming_chunk(emit, sid, payload.get('session') or sid, audio_view, language, noise_cancellation)
+                        return
+
                     if is_webm:
-                        # Use timestamp for unique filenames in streaming mode
-                        timestamp = int(time.time() * 1000)
-                        webm_filename = f"uploads/{sid}_{timestamp}.webm"
-                        with open(webm_filename, "wb") as f:
-                            f.write(audio_bytes.getbuffer())
-                        print(f"[DEBUG] Saved webm file: {webm_filename}", file=sys.stderr)
-
-                        # Convert webm to wav using ffmpeg for OpenAI transcription with better Opus handling
-                        import subprocess
-                        wav_filename = f"uploads/{sid}_{timestamp}.wav"
-
-                        # Use more robust FFmpeg command to handle Opus codec issues
-                        ffmpeg_cmd = [
-                            "ffmpeg", "-y", "-i", "pipe:0",
-                            "-vn",  # No video
-                            "-acodec", "pcm_s16le",  # Explicit audio codec
-                            "-ar", "16000",  # Sample rate
-                            "-ac", "1",  # Mono
-                            "-f", "wav",  # Output format
-                            "-loglevel", "error",  # Reduce FFmpeg output noise
-                            "pipe:1"
-                        ]
-
-                        with open(webm_filename, "rb") as webm_in:
-                            with open(wav_filename, "wb") as wav_out:
-                                result = subprocess.run(
-                                    ffmpeg_cmd,
-                                    input=webm_in.read(),
-                                    stdout=wav_out,
-                                    stderr=subprocess.PIPE
-                                )
-                                if result.returncode != 0:
-                                    print(f"[WARN] FFmpeg conversion warning: {result.stderr.decode()}", file=sys.stderr)
-
-                        # Verify the WAV file was created and has content
-                        if not os.path.exists(wav_filename) or os.path.getsize(wav_filename) < 1000:
-                            print(f"[ERROR] WAV file creation failed or too small", file=sys.stderr)
-                            socketio.emit('transcription_update', {'error': 'Audio conversion failed'}, room=sid)
+                        # Decode in memory; uploads only touch disk when persistence is enabled
+                        try:
+                            audio = audio_converter.convert_bytes(audio_view, suffix='.webm')
+                        except AudioConversionError as e:
+                            print(f"[WARN] FFmpeg conversion warning: {e}", file=sys.stderr)
+                            audio = None
+
+                        if audio is None or len(audio.wav_bytes) < 1000:
+                            print(f"[ERROR] WAV conversion failed or too small", file=sys.stderr)
+                            emit('transcription_update', {'error': 'Audio conversion failed'})
                             return
 
-                        print(f"[DEBUG] Saved wav file: {wav_filename} ({os.path.getsize(wav_filename)} bytes)", file=sys.stderr)
+                        print(f"[DEBUG] Converted audio: {audio.duration:.2f}s", file=sys.stderr)
 
-                        # If noise cancellation is requested, run denoising using noisereduce
+                        # If noise cancellation is requested, denoise with the session's noise profile
                         if noise_cancellation:
-                            denoised_wav_filename = wav_filename.replace('.wav', '_denoised.wav')
-                            try:
-                                import noisereduce as nr
-                                import librosa
-                                import soundfile as sf
-
-                                # Load audio file
-                                audio_data, sample_rate = librosa.load(wav_filename, sr=None)
-
-                                # Apply noise reduction
-                                reduced_noise = nr.reduce_noise(y=audio_data, sr=sample_rate)
-
-                                # Save denoised audio
-                                sf.write(denoised_wav_filename, reduced_noise, sample_rate)
-                                wav_filename = denoised_wav_filename
-                                print(f"[DEBUG] Audio denoised and saved: {denoised_wav_filename}", file=sys.stderr)
-                            except Exception as e:
-                                print(f"[WARN] Denoising failed: {e}", file=sys.stderr)
+                            audio = denoise_audio(audio, sid)
+
+                        if VOICE_UPLOAD_PERSIST:
+                            upload_id = id_generator.new_id()
+                            with open(f"uploads/{sid}_{upload_id}.webm", "wb") as f:
+                                f.write(audio_view)
+                            with open(f"uploads/{sid}_{upload_id}.wav", "wb") as f:
+                                f.write(audio.wav_bytes)
+                            print(f"[DEBUG] Saved upload files: uploads/{sid}_{upload_id}.*", file=sys.stderr)
+
+                        # Silence-only recordings are answered without any API call
+                        if not vad.analyze(audio.pcm, audio.sample_rate).has_speech():
+                            print(f"[DEBUG] No speech detected by VAD", file=sys.stderr)
+                            emit('transcription_update', {
+                                'error': 'No speech detected in audio',
+                                'question': '',
+                                'answer': '',
+                                'diarization': []
+                            })
+                            return
 
                         # Transcribe wav file - always try transcription first
-                        if wav_filename and os.path.exists(wav_filename):
-                            try:
-                                with open(wav_filename, "rb") as wav_file:
-                                    transcription = transcribe_audio(wav_file, language)
-                                print(f"[DEBUG] Transcription result: {transcription}", file=sys.stderr)
-
-                                # Extract text from transcription response
-                                if transcription and 'text' in transcription:
-                                    question = transcription['text'].strip()
-                                    print(f"[DEBUG] Extracted transcription text: '{question}'", file=sys.stderr)
-                                else:
-                                    print(f"[WARN] No text in transcription response: {transcription}", file=sys.stderr)
-                                    question = ""
-
-                            except Exception as transcription_error:
-                                print(f"[ERROR] Transcription failed: {transcription_error}", file=sys.stderr)
+                        try:
+                            transcription = transcribe_audio(audio.wav_file(), language)
+                            print(f"[DEBUG] Transcription result: {transcription}", file=sys.stderr)
+
+                            # Extract text from transcription response
+                            if transcription and 'text' in transcription:
+                                question = transcription['text'].strip()
+                                print(f"[DEBUG] Extracted transcription text: '{question}'", file=sys.stderr)
+                            else:
+                                print(f"[WARN] No text in transcription response: {transcription}", file=sys.stderr)
                                 question = ""
 
+                        except Exception as transcription_error:
+                            print(f"[ERROR] Transcription failed: {transcription_error}", file=sys.stderr)
+                            question = ""
+
                         # Try speaker diarization if requested or if we have text
                         if question.strip() and (diarization_only or streaming_diarization):
                             try:
-                                diarization_results = diarize_and_transcribe_streaming(wav_filename, language, segment_offset)
+                                diarization_results = diarize_and_transcribe_streaming(audio, language, segment_offset)
                                 if diarization_results:
                                     print(f"[DEBUG] Diarization results: {len(diarization_results)} segments", file=sys.stderr)
 
-                                    # For streaming mode, emit specific streaming event
-                                    if streaming_diarization:
-                                        # Initialize or update session state
-                                        if sid not in streaming_sessions:
-                                            streaming_sessions[sid] = []
-
-                                        # Add new segments to session
-                                        streaming_sessions[sid].extend(diarization_results)
-
-                                        socketio.emit('streaming_diarization_update', {
-                                            'diarization': diarization_results,
-                                            'accumulated_diarization': streaming_sessions[sid]
-                                        }, room=sid)
-
-                                        # Clean up files immediately for streaming
-                                        try:
-                                            if webm_filename and os.path.exists(webm_filename):
-                                                os.remove(webm_filename)
-                                            if wav_filename and os.path.exists(wav_filename):
-                                                os.remove(wav_filename)
-                                            if denoised_wav_filename and os.path.exists(denoised_wav_filename):
-                                                os.remove(denoised_wav_filename)
-                                        except Exception as del_err:
-                                            print(f"[ERROR] Could not delete streaming files: {del_err}", file=sys.stderr)
-
-                                        return  # Exit early for streaming mode
-
                                     # For file upload diarization-only mode
-                                    elif diarization_only:
-                                        socketio.emit('transcription_update', {
+                                    if diarization_only:
+                                        emit('transcription_update', {
                                             'question': '',
                                             'answer': '',
                                             'diarization': diarization_results
-                                        }, room=sid)
-
-                                        # Clean up files for diarization-only mode
-                                        try:
-                                            if webm_filename and os.path.exists(webm_filename):
-                                                os.remove(webm_filename)
-                                            if wav_filename and os.path.exists(wav_filename):
-                                                os.remove(wav_filename)
-                                            if denoised_wav_filename and os.path.exists(denoised_wav_filename):
-                                                os.remove(denoised_wav_filename)
-                                        except Exception as del_err:
-                                            print(f"[ERROR] Could not delete diarization files: {del_err}", file=sys.stderr)
-
+                                        })
                                         return  # Exit early for diarization-only mode
                                 else:
                                     print(f"[WARN] No diarization results obtained", file=sys.stderr)
                                     if diarization_only:
-                                        socketio.emit('transcription_update', {
+                                        emit('transcription_update', {
                                             'error': 'No speakers detected in audio',
                                             'question': '',
                                             'answer': '',
                                             'diarization': []
-                                        }, room=sid)
+                                        })
                                         return
                             except Exception as e:
                                 print(f"[WARN] Diarization failed: {e}", file=sys.stderr)
                                 if diarization_only or streaming_diarization:
-                                    socketio.emit('transcription_update', {
+                                    emit('transcription_update', {
                                         'error': f'Diarization failed: {str(e)}',
                                         'question': '',
                                         'answer': '',
                                         'diarization': []
-                                    }, room=sid)
+                                    })
                                     return
 
                         # Regular processing for main app (not diarization-only)
@@ -690,7 +861,7 @@ def register_socketio_events(socketio):
                             # Try regular diarization for context
                             if question.strip():
                                 try:
-                                    diarization_results = diarize_and_transcribe(wav_filename, language)
+                                    diarization_results = diarize_and_transcribe(audio, language)
                                     if diarization_results:
                                         # Compose speaker-labeled transcript
                                         speaker_question = '\n'.join([f"{seg['speaker']}: {seg['text']}" for seg in diarization_results])
@@ -702,11 +873,11 @@ def register_socketio_events(socketio):
                             # If we still don't have any question text, that's an error
                             if not question.strip():
                                 print(f"[ERROR] No transcription text obtained from audio", file=sys.stderr)
-                                socketio.emit('transcription_update', {
+                                emit('transcription_update', {
                                     'error': 'No speech detected in audio',
                                     'question': '',
                                     'answer': ''
-                                }, room=sid)
+                                })
                                 return
                 elif 'text' in payload:
                     # Text input
@@ -742,35 +913,26 @@ def register_socketio_events(socketio):
                 except Exception as llm_error:
                     print(f"[ERROR] LangChain/OpenAI error: {llm_error}", file=sys.stderr)
                     answer = "Error generating answer."
-            socketio.emit('transcription_update', {'question': question, 'answer': answer, 'diarization': diarization_results}, room=sid)
-
-            # Delete files after processing unless persistence is enabled
-            if is_webm and not VOICE_UPLOAD_PERSIST:
-                try:
-                    if webm_filename and os.path.exists(webm_filename):
-                        os.remove(webm_filename)
-                    if wav_filename and os.path.exists(wav_filename):
-                        os.remove(wav_filename)
-                    if noise_cancellation and denoised_wav_filename and os.path.exists(denoised_wav_filename):
-                        os.remove(denoised_wav_filename)
-                    print(f"[DEBUG] Deleted files for session: {sid}", file=sys.stderr)
-                except Exception as del_err:
-                    print(f"[ERROR] Could not delete files: {del_err}", file=sys.stderr)
+            emit('transcription_update', {'question': question, 'answer': answer, 'diarization': diarization_results})
         except Exception as e:
-            print(f"[ERROR] Error handling audio_blob: {e}", file=sys.stderr)
+            print(f"[ERROR] Error handling audio message: {e}", file=sys.stderr)
             emit('transcription_update', {'text': 'Error processing audio.'})
 
     # Audio Annotation System Events
     @socketio.on('annotation_audio_blob')
     def handle_annotation_audio(data):
-        import base64
         import sys
-        import json
-        import time
         from flask import request as flask_request
 
         sid = flask_request.sid if hasattr(flask_request, 'sid') else None
         print(f"[DEBUG] Received annotation audio for session: {sid}", file=sys.stderr)
+        return dispatch_audio_job(sid, process_annotation_audio, sid, data)
+
+    def process_annotation_audio(emit, sid, data):
+        """Convert and transcribe an annotation recording, run by the job dispatcher"""
+        import base64
+        import sys
+        import json
 
         try:
             payload = json.loads(data) if isinstance(data, str) else data
@@ -782,74 +944,40 @@ def register_socketio_events(socketio):
             pause_duration = payload.get('pause_duration', 2)
 
             if not all([project_id, audio_data]):
-                socketio.emit('annotation_error', {'error': 'Missing required data'}, room=sid)
+                emit('annotation_error', {'error': 'Missing required data'})
                 return
 
             # Convert audio and transcribe
-            audio_bytes = io.BytesIO(base64.b64decode(audio_data))
-            timestamp = int(time.time() * 1000)
-            temp_webm = f"uploads/annotation_temp_{sid}_{timestamp}.webm"
-            temp_wav = f"uploads/annotation_temp_{sid}_{timestamp}.wav"
-
-            # Save WebM
-            with open(temp_webm, "wb") as f:
-                f.write(audio_bytes.getbuffer())
-
-            # Convert to WAV
-            import subprocess
-            ffmpeg_cmd = [
-                "ffmpeg", "-y", "-i", temp_webm,
-                "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1",
-                temp_wav
-            ]
-
-            result = subprocess.run(ffmpeg_cmd, capture_output=True)
-            if result.returncode != 0:
-                print(f"[ERROR] FFmpeg conversion failed: {result.stderr.decode()}", file=sys.stderr)
-                socketio.emit('annotation_error', {'error': 'Audio conversion failed'}, room=sid)
+            try:
+                audio = audio_converter.convert_bytes(base64.b64decode(audio_data), suffix='.webm')
+            except AudioConversionError as e:
+                print(f"[ERROR] FFmpeg conversion failed: {e}", file=sys.stderr)
+                emit('annotation_error', {'error': 'Audio conversion failed'})
                 return
 
             # Transcribe
-            with open(temp_wav, 'rb') as wav_file:
-                transcription = transcribe_audio(wav_file, language)
+            transcription = transcribe_audio(audio.wav_file(), language)
 
             transcript = transcription.get('text', '') if transcription else ''
+            duration = audio.duration
 
-            # Calculate duration
-            duration = 0
-            try:
-                import librosa
-                audio_data_lib, sample_rate = librosa.load(temp_wav, sr=None)
-                duration = len(audio_data_lib) / sample_rate
-            except Exception as duration_error:
-                print(f"[WARN] Could not calculate duration: {duration_error}", file=sys.stderr)
-                duration = 0
-
-            # Read the processed WAV file for client
-            with open(temp_wav, 'rb') as wav_file:
-                processed_audio_data = base64.b64encode(wav_file.read()).decode('utf-8')
+            # Processed WAV for client
+            processed_audio_data = base64.b64encode(audio.wav_bytes).decode('utf-8')
 
             # Emit results back to client
-            socketio.emit('annotation_transcription_result', {
+            emit('annotation_transcription_result', {
                 'transcript': transcript,
                 'duration': duration,
                 'audio_data': processed_audio_data,
                 'recording_mode': recording_mode,
                 'language': language
-            }, room=sid)
+            })
 
             print(f"[INFO] Audio annotation processed successfully for session {sid}", file=sys.stderr)
 
-            # Clean up temp files
-            try:
-                os.remove(temp_webm)
-                os.remove(temp_wav)
-            except Exception as cleanup_error:
-                print(f"[WARN] Could not clean up temp files: {cleanup_error}", file=sys.stderr)
-
         except Exception as e:
             print(f"[ERROR] Annotation audio processing failed: {e}", file=sys.stderr)
-            socketio.emit('annotation_error', {'error': str(e)}, room=sid)
+            emit('annotation_error', {'error': str(e)})
 
     @socketio.on('disconnect')
     def handle_disconnect(reason=None):
@@ -857,12 +985,65 @@ def register_socketio_events(socketio):
         import sys
         from flask import request as flask_request
         sid = flask_request.sid if hasattr(flask_request, 'sid') else None
-        if sid and sid in streaming_sessions:
-            del streaming_sessions[sid]
+        if sid:
+            job_dispatcher.discard(sid)
+            decoder_gaps.discard(sid)
+            # Closing waits for ffmpeg and for a running decode, so keep it off the event loop
+            job_dispatcher.run_blocking(stream_decoders.close, sid)
+            noise_reducers.close(sid)
+            for stream_key in [key for key in frame_sequences if key[0] == sid]:
+                del frame_sequences[stream_key]
+        if sid and streaming_store.close(sid):
             print(f"[DEBUG] Cleaned up streaming session: {sid} (reason: {reason})", file=sys.stderr)
         else:
             print(f"[DEBUG] Disconnect event for session: {sid} (reason: {reason})", file=sys.stderr)
 
+# Readiness endpoint for load balancers and autoscaling
+@app.route('/api/ready', methods=['GET'])
+def get_readiness():
+    """Report which subsystems are warm; 503 until the required ones are"""
+    status = warmup.get_status()
+    return jsonify(dict(status, success=True)), 200 if status['ready'] else 503
+
+# Model registry introspection endpoint
+@app.route('/api/models/status', methods=['GET'])
+def get_models_status():
+    """Get speaker model load state, load time and memory for this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'models': model_registry.get_model_info(),
+            'diarization': diarization_engine.get_engine_info()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+# Transcription client metrics endpoint
+@app.route('/api/transcription/metrics', methods=['GET'])
+def get_transcription_metrics():
+    """Get Whisper API request counts and latency for this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'metrics': transcription_client.get_metrics()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+# Audio job dispatcher status endpoint
+@app.route('/api/jobs/status', methods=['GET'])
+def get_jobs_status():
+    """Get audio job queue depths and counters for this worker"""
+    try:
+        return jsonify({
+            'success': True,
+            'jobs': job_dispatcher.get_info(),
+            'streaming_sessions': streaming_store.get_info(),
+            'denoisers': noise_reducers.get_info()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 # Storage configuration endpoint
 @app.route('/api/storage/config', methods=['GET'])
 def get_storage_config():
@@ -926,8 +1107,7 @@ def upload_audios():
         for file in files:
             if file and file.filename:
                 # Generate unique filename
-                timestamp = int(time.time() * 1000)
-                filename = f"{timestamp}_{file.filename}"
+                filename = f"{id_generator.new_id()}_{file.filename}"
                 filepath = os.path.join(uploads_dir, filename)
 
                 # Save the file
@@ -958,50 +1138,26 @@ def transcribe_audio_file():
         if not audio_path or not os.path.exists(audio_path):
             return jsonify({'success': False, 'error': 'Audio file not found'})
 
-        # Get audio duration
+        # Convert to 16 kHz mono WAV in memory for the OpenAI API
         try:
-            import subprocess
-            result = subprocess.run([
-                'ffprobe', '-v', 'quiet', '-show_entries',
-                'format=duration', '-of', 'csv=p=0', audio_path
-            ], capture_output=True, text=True, check=True)
-            duration = float(result.stdout.strip())
-        except:
-            duration = 0
-
-        # For audio files, we might need to convert to WAV format for OpenAI API
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-            wav_path = temp_audio.name
-
-        try:
-            # Convert audio to WAV format if needed
-            subprocess.run([
-                'ffmpeg', '-y', '-i', audio_path,
-                '-ar', '16000', '-ac', '1', '-f', 'wav', wav_path
-            ], check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
+            audio = audio_converter.convert_file(audio_path)
+            wav_bytes = audio.wav_bytes
+            duration = audio.duration
+        except AudioConversionError:
             # If conversion fails, try using original file directly
-            wav_path = audio_path
+            with open(audio_path, 'rb') as audio_file:
+                wav_bytes = audio_file.read()
+            duration = probe_duration(audio_path)
 
         # Transcribe audio
         try:
-            with open(wav_path, 'rb') as audio_file:
-                transcription = transcribe_audio(audio_file, language)
+            transcription = transcribe_audio(wav_bytes, language)
             transcript = transcription.get('text', '')
         except Exception as e:
             return jsonify({'success': False, 'error': f'Transcription failed: {str(e)}'})
-        finally:
-            # Clean up temporary file if we created one
-            if wav_path != audio_path:
-                try:
-                    os.remove(wav_path)
-                except:
-                    pass
 
-        # Read audio file for storage
-        with open(wav_path if wav_path != audio_path else audio_path, 'rb') as audio_file:
-            audio_data = base64.b64encode(audio_file.read()).decode()
+        # Audio data for storage
+        audio_data = base64.b64encode(wav_bytes).decode()
 
         return jsonify({
             'success': True,
@@ -1029,8 +1185,7 @@ def batch_transcribe():
             return jsonify({'success': False, 'error': 'No audio files provided'})
 
         # Get project info
-        projects = database_manager.get_projects()
-        project = next((p for p in projects if str(p['id']) == str(project_id)), None)
+        project = database_manager.get_project(project_id)
 
         if not project:
             return jsonify({'success': False, 'error': 'Project not found'})
@@ -1048,39 +1203,23 @@ def batch_transcribe():
                     })
                     continue
 
-                # Get audio duration
+                # Convert to WAV in memory if possible
                 try:
-                    import subprocess
-                    result = subprocess.run([
-                        'ffprobe', '-v', 'quiet', '-show_entries',
-                        'format=duration', '-of', 'csv=p=0', audio_path
-                    ], capture_output=True, text=True, check=True)
-                    duration = float(result.stdout.strip())
-                except:
-                    duration = 0
-
-                # Convert to WAV if needed
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-                    wav_path = temp_audio.name
-
-                try:
-                    subprocess.run([
-                        'ffmpeg', '-y', '-i', audio_path,
-                        '-ar', '16000', '-ac', '1', '-f', 'wav', wav_path
-                    ], check=True, capture_output=True)
-                except subprocess.CalledProcessError:
+                    audio = audio_converter.convert_file(audio_path)
+                    wav_bytes = audio.wav_bytes
+                    duration = audio.duration
+                except AudioConversionError:
                     # If conversion fails, try using original file
-                    wav_path = audio_path
+                    with open(audio_path, 'rb') as audio_file_handle:
+                        wav_bytes = audio_file_handle.read()
+                    duration = probe_duration(audio_path)
 
                 # Transcribe audio
-                with open(wav_path, 'rb') as audio_file_handle:
-                    transcription = transcribe_audio(audio_file_handle, language)
+                transcription = transcribe_audio(wav_bytes, language)
                 transcript = transcription.get('text', '')
 
-                # Read audio data for saving
-                with open(wav_path, 'rb') as audio_file_handle:
-                    audio_data = base64.b64encode(audio_file_handle.read()).decode()
+                # Audio data for saving
+                audio_data = base64.b64encode(wav_bytes).decode()
 
                 transcribed_audios.append({
                     'original_name': audio_file.get('original_name'),
@@ -1090,13 +1229,6 @@ def batch_transcribe():
                     'language': language
                 })
 
-                # Clean up temporary file if we created one
-                if wav_path != audio_path:
-                    try:
-                        os.remove(wav_path)
-                    except:
-                        pass
-
             except Exception as e:
                 failed_audios.append({
                     'file': audio_file.get('original_name', 'Unknown'),
@@ -1128,8 +1260,7 @@ def save_batch_annotations():
             return jsonify({'success': False, 'error': 'No annotations provided'})
 
         # Get project info
-        projects = database_manager.get_projects()
-        project = next((p for p in projects if str(p['id']) == str(project_id)), None)
+        project = database_manager.get_project(project_id)
 
         if not project:
             return jsonify({'success': False, 'error': 'Project not found'})
@@ -1138,47 +1269,60 @@ def save_batch_annotations():
         saved_annotations = []
         failed_saves = []
 
+        # Create directories if they don't exist (for local storage)
+        if storage_manager.storage_mode == 'local':
+            os.makedirs(f"{workspace_path}/audio", exist_ok=True)
+
+        # Decode every file first; a bad item fails alone
+        prepared = []
         for annotation in annotations:
+            original_name = annotation.get('original_name', 'audio')
             try:
                 # Generate unique filename
-                timestamp = int(time.time() * 1000)
-                original_name = annotation.get('original_name', 'audio')
-                audio_filename = f"audio_{timestamp}_{original_name.replace('.', '_')}.wav"
-                audio_path = f"{workspace_path}/audio/{audio_filename}"
-
-                # Decode audio data
+                audio_filename = f"{id_generator.new_id('audio_')}_{original_name.replace('.', '_')}.wav"
                 audio_bytes = base64.b64decode(annotation.get('audio_data', ''))
-
-                # Create directories if they don't exist (for local storage)
-                if storage_manager.storage_mode == 'local':
-                    os.makedirs(workspace_path, exist_ok=True)
-                    os.makedirs(f"{workspace_path}/audio", exist_ok=True)
-
-                # Save audio file using storage manager
-                stored_path = storage_manager.save_file(audio_bytes, audio_path)
-
-                # Save to database
-                annotation_id = database_manager.save_annotation(
-                    str(project_id),
-                    audio_filename,
-                    audio_path,
-                    annotation.get('transcript', ''),
-                    'batch-audio',
-                    annotation.get('language', 'en'),
-                    annotation.get('duration', 0)
-                )
-
-                saved_annotations.append({
-                    'annotation_id': annotation_id,
+                prepared.append({
                     'original_name': original_name,
-                    'audio_filename': audio_filename
+                    'audio_bytes': audio_bytes,
+                    'record': {
+                        'audio_filename': audio_filename,
+                        'audio_path': f"{workspace_path}/audio/{audio_filename}",
+                        'transcript': annotation.get('transcript', ''),
+                        'recording_mode': 'batch-audio',
+                        'language': annotation.get('language', 'en'),
+                        'duration': annotation.get('duration') or probe_duration(audio_bytes)
+                    }
                 })
-
             except Exception as e:
-                failed_saves.append({
-                    'file': annotation.get('original_name', 'Unknown'),
-                    'error': str(e)
-                })
+                failed_saves.append({'file': original_name, 'error': str(e)})
+
+        # Save audio files in parallel, then insert every stored annotation in one database write
+        results = storage_manager.save_files([(item['audio_bytes'], item['record']['audio_path']) for item in prepared])
+        stored = []
+        for item, result in zip(prepared, results):
+            if isinstance(result, Exception):
+                failed_saves.append({'file': item['original_name'], 'error': str(result)})
+            else:
+                stored.append(item)
+
+        try:
+            annotation_ids = database_manager.save_annotations_bulk(str(project_id), [item['record'] for item in stored])
+        except Exception as e:
+            print(f"[ERROR] Bulk annotation insert failed: {e}", file=sys.stderr)
+            for item in stored:
+                try:
+                    storage_manager.delete_file(item['record']['audio_path'])
+                except Exception as delete_error:
+                    print(f"[WARN] Failed to delete {item['record']['audio_path']}: {delete_error}", file=sys.stderr)
+                failed_saves.append({'file': item['original_name'], 'error': str(e)})
+            stored, annotation_ids = [], []
+
+        for item, annotation_id in zip(stored, annotation_ids):
+            saved_annotations.append({
+                'annotation_id': annotation_id,
+                'original_name': item['original_name'],
+                'audio_filename': item['record']['audio_filename']
+            })
 
         return jsonify({
             'success': True,
@@ -1205,51 +1349,23 @@ def transcribe_batch_audio():
         # Decode audio data
         audio_bytes = base64.b64decode(audio_data)
 
-        # Create temporary files
-        timestamp = int(time.time() * 1000)
-        temp_webm = f"uploads/batch_temp_{timestamp}.webm"
-        temp_wav = f"uploads/batch_temp_{timestamp}.wav"
-
-        # Save webm file
-        with open(temp_webm, 'wb') as f:
-            f.write(audio_bytes)
-
-        # Convert to WAV using ffmpeg
-        import subprocess
+        # Convert to WAV in memory
         try:
-            subprocess.run([
-                'ffmpeg', '-y', '-i', temp_webm,
-                '-ar', '16000', '-ac', '1', '-f', 'wav', temp_wav
-            ], check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
+            audio = audio_converter.convert_bytes(audio_bytes, suffix='.webm')
+        except AudioConversionError:
             return jsonify({'success': False, 'error': 'Audio conversion failed'})
 
-        # Get audio duration
-        try:
-            import librosa
-            audio_data_lib, sample_rate = librosa.load(temp_wav, sr=None)
-            duration = len(audio_data_lib) / sample_rate
-        except:
-            duration = 0
+        duration = audio.duration
 
         # Transcribe audio
         try:
-            with open(temp_wav, 'rb') as wav_file:
-                transcription = transcribe_audio(wav_file, language)
+            transcription = transcribe_audio(audio.wav_file(), language)
             transcript = transcription.get('text', '')
         except Exception as e:
             return jsonify({'success': False, 'error': f'Transcription failed: {str(e)}'})
 
-        # Read processed WAV for storage
-        with open(temp_wav, 'rb') as wav_file:
-            processed_audio_data = base64.b64encode(wav_file.read()).decode()
-
-        # Clean up temp files
-        try:
-            os.remove(temp_webm)
-            os.remove(temp_wav)
-        except:
-            pass
+        # Processed WAV for storage
+        processed_audio_data = base64.b64encode(audio.wav_bytes).decode()
 
         return jsonify({
             'success': True,
@@ -1262,7 +1378,7 @@ def transcribe_batch_audio():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
-@app.route('/api/annotation/export-project/<int:project_id>', methods=['GET'])
+@app.route('/api/annotation/export-project/<project_id>', methods=['GET'])
 def export_project_data(project_id):
     """Export project data as ZIP file containing all audio files and CSV with annotations"""
     try:
@@ -1271,8 +1387,7 @@ def export_project_data(project_id):
         from io import StringIO
 
         # Get project info
-        projects = database_manager.get_projects()
-        project = next((p for p in projects if str(p['id']) == str(project_id)), None)
+        project = database_manager.get_project(project_id)
 
         if not project:
             return jsonify({'success': False, 'error': 'Project not found'}), 404
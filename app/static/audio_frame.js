@@ -0,0 +1,42 @@
+// Binary audio frames for Socket.IO
+// Frame layout: [uint16 big-endian header length][UTF-8 JSON header][raw audio bytes]
+// The header carries session, seq and codec plus the same options the JSON audio_blob payload uses.
+
+const AudioFrames = {
+    session: null,
+    seq: 0,
+    _queue: Promise.resolve(),
+
+    // Start a new client stream; the server tracks sequence numbers per stream
+    startSession: function() {
+        this.session = Date.now().toString(36) + Math.random().toString(36).slice(2, 8);
+        this.seq = 0;
+        return this.session;
+    },
+
+    encode: function(header, audioBuffer) {
+        const headerBytes = new TextEncoder().encode(JSON.stringify(header));
+        const frame = new Uint8Array(2 + headerBytes.length + audioBuffer.byteLength);
+        new DataView(frame.buffer).setUint16(0, headerBytes.length, false);
+        frame.set(headerBytes, 2);
+        frame.set(new Uint8Array(audioBuffer), 2 + headerBytes.length);
+        return frame.buffer;
+    },
+
+    // Emit a Blob as an audio_frame; frames leave in call order even though reading blobs is async
+    send: function(socket, blob, options) {
+        if (!this.session) {
+            this.startSession();
+        }
+        const header = Object.assign({
+            session: this.session,
+            seq: this.seq++,
+            codec: blob.type || 'audio/webm'
+        }, options || {});
+        this._queue = this._queue
+            .then(() => blob.arrayBuffer())
+            .then(buffer => socket.emit('audio_frame', this.encode(header, buffer)))
+            .catch(err => console.error('Failed to send audio frame:', err));
+        return this._queue;
+    }
+};
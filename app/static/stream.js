@@ -373,23 +373,18 @@ window.stopRecording = function() {
         mediaRecorder.onstop = () => {
             // Combine all audio chunks into a single blob
             lastAudioBlob = new Blob(audioChunks, { type: 'audio/webm' });
-            let reader = new FileReader();
-            reader.onload = function() {
-                // Convert audio to base64 and emit to server via socket
-                let base64data = btoa(String.fromCharCode(...new Uint8Array(reader.result)));
-                const language = window._selectedLanguage || 'en';
-
-                // Show progress bar for voice processing
-                showProgressBar('Processing your voice...', 'Converting speech to text and generating response...');
-
-                socket.emit('audio_blob', JSON.stringify({
-                    audio: base64data,
-                    language: language,
-                    noise_cancellation: isNoiseCancellationEnabled()
-                }));
-                document.getElementById('result').innerText = 'Uploading audio...';
-            };
-            reader.readAsArrayBuffer(lastAudioBlob);
+            const language = window._selectedLanguage || 'en';
+
+            // Show progress bar for voice processing
+            showProgressBar('Processing your voice...', 'Converting speech to text and generating response...');
+
+            // Emit raw audio bytes to server via socket
+            AudioFrames.startSession();
+            AudioFrames.send(socket, lastAudioBlob, {
+                language: language,
+                noise_cancellation: isNoiseCancellationEnabled()
+            });
+            document.getElementById('result').innerText = 'Uploading audio...';
         };
     }
     // Reset guard after short delay to allow new recordings
@@ -456,6 +451,13 @@ socket.on('transcription_update', function(data) {
     }
 });
 
+// Server queue for this session is full; the message was not processed
+socket.on('audio_backpressure', function(data) {
+    console.warn('[WARN] Server busy, audio rejected:', data);
+    hideProgressBar();
+    document.getElementById('result').innerText = 'Server is busy processing your earlier audio. Please try again in a moment.';
+});
+
 // Display diarization results (simplified for main page)
 function displayDiarizationResults(diarizationData) {
     const resultDiv = document.getElementById('result');
@@ -4,11 +4,13 @@ Handles both local file storage and AWS S3 storage based on configuration
 """
 
 import os
-import boto3
+import time
+import threading
 from botocore.exceptions import ClientError, NoCredentialsError
 from dotenv import load_dotenv
 import logging
-from typing import Optional, Union, BinaryIO
+from typing import Optional, Union, BinaryIO, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
 
 # Load environment variables
@@ -25,7 +27,7 @@ class StorageManager:
 
     def __init__(self):
         # Storage configuration from environment variables
-        self.storage_mode = os.getenv('STORAGE_MODE', 'local').lower()  # 'local' or 's3'
+        self._storage_mode = os.getenv('STORAGE_MODE', 'local').lower()  # 'local' or 's3'
 
         # S3 Configuration
         self.s3_bucket = os.getenv('S3_BUCKET_NAME')
@@ -36,14 +38,43 @@ class StorageManager:
         # Local storage configuration
         self.local_base_path = os.getenv('LOCAL_STORAGE_PATH', os.getcwd())
 
-        # Initialize S3 client if using S3 storage
+        # Parallel writes for save_files
+        self.write_concurrency = max(1, int(os.getenv('STORAGE_WRITE_CONCURRENCY', '8')))
+        self._write_executor = None
+
+        # The S3 client is created and checked on first use so importing this module stays fast
         self.s3_client = None
-        if self.storage_mode == 's3':
-            self._initialize_s3_client()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self.init_time_seconds = None
+
+    @property
+    def storage_mode(self) -> str:
+        """Active storage ('local' or 's3'), connecting to S3 on first access"""
+        self.ensure_initialized()
+        return self._storage_mode
+
+    def ensure_initialized(self):
+        """Create the S3 client and check bucket access, once per process"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            start = time.perf_counter()
+            if self._storage_mode == 's3':
+                self._initialize_s3_client()
+            self.init_time_seconds = time.perf_counter() - start
+            self._initialized = True
+
+    def is_initialized(self) -> bool:
+        return self._initialized
 
     def _initialize_s3_client(self):
         """Initialize AWS S3 client with error handling"""
         try:
+            import boto3
+
             if self.s3_access_key and self.s3_secret_key:
                 self.s3_client = boto3.client(
                     's3',
@@ -61,10 +92,10 @@ class StorageManager:
 
         except NoCredentialsError:
             logger.error("❌ AWS credentials not found. Falling back to local storage.")
-            self.storage_mode = 'local'
+            self._storage_mode = 'local'
         except Exception as e:
             logger.error(f"❌ Failed to initialize S3 client: {str(e)}. Falling back to local storage.")
-            self.storage_mode = 'local'
+            self._storage_mode = 'local'
 
     def _test_s3_connection(self):
         """Test S3 connection and bucket access"""
@@ -98,6 +129,31 @@ class StorageManager:
         else:
             return self._save_to_local(file_content, file_path)
 
+    def save_files(self, files: List[Tuple[Union[bytes, BinaryIO], str]]) -> List[Union[str, Exception]]:
+        """
+        Save several files in parallel
+
+        Args:
+            files: (file_content, file_path) pairs
+
+        Returns:
+            list: For each file, in order, the saved path/URL or the exception that stopped it
+        """
+        self.ensure_initialized()
+        if self._write_executor is None:
+            with self._init_lock:
+                if self._write_executor is None:
+                    self._write_executor = ThreadPoolExecutor(max_workers=self.write_concurrency,
+                                                              thread_name_prefix='storage-write')
+
+        def save(item):
+            try:
+                return self.save_file(*item)
+            except Exception as e:
+                return e
+
+        return list(self._write_executor.map(save, files))
+
     def load_file(self, file_path: str) -> Optional[bytes]:
         """
         Load file from configured storage
@@ -113,6 +169,38 @@ class StorageManager:
         else:
             return self._load_from_local(file_path)
 
+    def stat_file(self, file_path: str) -> Optional[dict]:
+        """
+        Get a stored file's size and validators without reading it
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            dict: size (bytes), etag and last_modified (epoch seconds), or None if not found
+        """
+        if self.storage_mode == 's3':
+            return self._stat_s3_file(file_path)
+        else:
+            return self._stat_local_file(file_path)
+
+    def load_file_range(self, file_path: str, start: int, end: int) -> Optional[bytes]:
+        """
+        Load part of a file from configured storage
+
+        Args:
+            file_path: Path to the file
+            start: First byte offset
+            end: Last byte offset, inclusive
+
+        Returns:
+            bytes: The requested bytes or None if not found
+        """
+        if self.storage_mode == 's3':
+            return self._load_range_from_s3(file_path, start, end)
+        else:
+            return self._load_range_from_local(file_path, start, end)
+
     def delete_file(self, file_path: str) -> bool:
         """
         Delete file from configured storage
@@ -195,6 +283,34 @@ class StorageManager:
                 logger.error(f"❌ Failed to load file from S3: {str(e)}")
                 raise e
 
+    def _load_range_from_s3(self, file_path: str, start: int, end: int) -> Optional[bytes]:
+        """Load a byte range from S3 with a ranged GET"""
+        try:
+            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=file_path, Range=f'bytes={start}-{end}')
+            return response['Body'].read()
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                logger.warning(f"File not found in S3: {file_path}")
+                return None
+            else:
+                logger.error(f"❌ Failed to load file range from S3: {str(e)}")
+                raise e
+
+    def _stat_s3_file(self, file_path: str) -> Optional[dict]:
+        """Size and validators of an S3 object from a HEAD request"""
+        try:
+            response = self.s3_client.head_object(Bucket=self.s3_bucket, Key=file_path)
+            return {
+                'size': response['ContentLength'],
+                'etag': response['ETag'].strip('"'),
+                'last_modified': response['LastModified'].timestamp()
+            }
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return None
+            logger.error(f"❌ Failed to stat file in S3: {str(e)}")
+            raise e
+
     def _delete_from_s3(self, file_path: str) -> bool:
         """Delete file from S3 bucket"""
         try:
@@ -262,6 +378,33 @@ class StorageManager:
             logger.error(f"❌ Failed to load file locally: {str(e)}")
             raise e
 
+    def _load_range_from_local(self, file_path: str, start: int, end: int) -> Optional[bytes]:
+        """Load a byte range from the local filesystem"""
+        full_path = os.path.join(self.local_base_path, file_path)
+
+        try:
+            with open(full_path, 'rb') as f:
+                f.seek(start)
+                return f.read(end - start + 1)
+        except FileNotFoundError:
+            logger.warning(f"File not found locally: {full_path}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Failed to load file range locally: {str(e)}")
+            raise e
+
+    def _stat_local_file(self, file_path: str) -> Optional[dict]:
+        """Size and validators of a local file; the ETag changes whenever the file is rewritten"""
+        try:
+            stat = os.stat(os.path.join(self.local_base_path, file_path))
+        except FileNotFoundError:
+            return None
+        return {
+            'size': stat.st_size,
+            'etag': f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            'last_modified': stat.st_mtime
+        }
+
     def _delete_from_local(self, file_path: str) -> bool:
         """Delete file from local filesystem"""
         full_path = os.path.join(self.local_base_path, file_path)
@@ -307,7 +450,9 @@ class StorageManager:
             's3_bucket': self.s3_bucket if self.storage_mode == 's3' else None,
             's3_region': self.s3_region if self.storage_mode == 's3' else None,
             'local_base_path': self.local_base_path if self.storage_mode == 'local' else None,
-            's3_available': self.s3_client is not None
+            's3_available': self.s3_client is not None,
+            'write_concurrency': self.write_concurrency,
+            'init_time_seconds': self.init_time_seconds
         }
 
 # Global storage manager instance
@@ -0,0 +1,286 @@
+"""
+Stream Decoder for Voice Stream Application
+Keeps one long-lived ffmpeg process per socket session and decodes incremental webm bytes to 16 kHz PCM
+"""
+
+import os
+import subprocess
+import threading
+import time
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STREAM_SAMPLE_RATE = 16000
+EBML_MAGIC = b'\x1A\x45\xDF\xA3'
+
+class PcmRingBuffer:
+    """
+    Fixed-capacity int16 ring buffer addressed by absolute sample position
+    """
+
+    def __init__(self, capacity_samples: int):
+        self.capacity = capacity_samples
+        self._buffer = np.zeros(capacity_samples, dtype=np.int16)
+        self.total_written = 0
+        self._lock = threading.Lock()
+
+    def write(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest audio when full"""
+        with self._lock:
+            skipped = max(0, len(samples) - self.capacity)
+            samples = samples[skipped:]
+            start = (self.total_written + skipped) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self._buffer[start:start + first] = samples[:first]
+            self._buffer[:len(samples) - first] = samples[first:]
+            self.total_written += skipped + len(samples)
+
+    def read_since(self, position: int) -> Tuple[np.ndarray, int]:
+        """
+        Copy out everything written after an absolute sample position
+
+        Args:
+            position: Absolute sample index returned by a previous read
+
+        Returns:
+            tuple: (samples, new position). Audio already overwritten is skipped.
+        """
+        with self._lock:
+            oldest = max(0, self.total_written - self.capacity)
+            if position < oldest:
+                logger.warning(f"PCM ring buffer overrun, dropped {oldest - position} samples")
+                position = oldest
+            count = self.total_written - position
+            start = position % self.capacity
+            first = min(count, self.capacity - start)
+            samples = np.concatenate((self._buffer[start:start + first], self._buffer[:count - first]))
+            return samples, self.total_written
+
+class StreamingDecoder:
+    """
+    One ffmpeg process fed webm bytes on stdin and producing s16le PCM on stdout
+    """
+
+    def __init__(self, session_id: str, buffer_seconds: float, quiet_seconds: float, max_wait_seconds: float):
+        self.session_id = session_id
+        self.stream_id: Optional[str] = None
+        self.base_offset = 0.0
+        self.quiet_seconds = quiet_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.ring = PcmRingBuffer(int(buffer_seconds * STREAM_SAMPLE_RATE))
+        self.last_used = time.monotonic()
+
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._bytes_fed = 0
+        self._read_position = 0
+        self._stream_start = 0
+        self._last_output = 0.0
+        self._awaiting_header = False
+        self._output_condition = threading.Condition()
+        self._decode_lock = threading.Lock()
+
+    def _start(self):
+        """Spawn ffmpeg and the thread that drains its stdout"""
+        self._process = subprocess.Popen(
+            [
+                'ffmpeg', '-loglevel', 'error',
+                '-fflags', 'nobuffer', '-probesize', '32768', '-analyzeduration', '0',
+                '-f', 'webm', '-i', 'pipe:0',
+                '-vn', '-acodec', 'pcm_s16le', '-ar', str(STREAM_SAMPLE_RATE), '-ac', '1',
+                '-flush_packets', '1', '-f', 's16le', 'pipe:1'
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        self._bytes_fed = 0
+        self._reader = threading.Thread(
+            target=self._drain_stdout, args=(self._process,),
+            name=f'ffmpeg-reader-{self.session_id}', daemon=True
+        )
+        self._reader.start()
+
+    def _drain_stdout(self, process: subprocess.Popen):
+        """Move decoded PCM from ffmpeg into the ring buffer until EOF"""
+        fd = process.stdout.fileno()
+        leftover = b''
+        while True:
+            data = os.read(fd, 65536)
+            if not data:
+                break
+            data = leftover + data
+            usable = len(data) - (len(data) % 2)
+            leftover = data[usable:]
+            if usable:
+                self.ring.write(np.frombuffer(data[:usable], dtype='<i2'))
+            with self._output_condition:
+                self._last_output = time.monotonic()
+                self._output_condition.notify_all()
+
+    def _stop_process(self):
+        """Close stdin so ffmpeg flushes its tail, then wait for the reader to finish"""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except Exception:
+            pass
+        try:
+            self._process.wait(timeout=self.max_wait_seconds)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        if self._reader is not None:
+            self._reader.join(timeout=self.max_wait_seconds)
+        self._process = None
+        self._reader = None
+
+    def _wait_for_output(self, fed_at: float):
+        """Block until ffmpeg has been quiet for quiet_seconds after the last feed, or max_wait elapses"""
+        deadline = fed_at + self.max_wait_seconds
+        with self._output_condition:
+            while True:
+                now = time.monotonic()
+                quiet_since = max(fed_at, self._last_output)
+                if now - quiet_since >= self.quiet_seconds or now >= deadline:
+                    return
+                self._output_condition.wait(timeout=min(deadline, quiet_since + self.quiet_seconds) - now)
+
+    def _stream_offset(self) -> float:
+        return self.base_offset + (self._read_position - self._stream_start) / STREAM_SAMPLE_RATE
+
+    def _begin_stream(self, stream_id: str, base_offset: float):
+        """Switch to another client stream, dropping the old stream's process and unread audio"""
+        self._stop_process()
+        self._read_position = self._stream_start = self.ring.total_written
+        self.stream_id = stream_id
+        self.base_offset = base_offset
+        self._awaiting_header = False
+
+    def decode_chunk(self, data, stream_id: str, base_offset: float = 0.0) -> Tuple[np.ndarray, float]:
+        """
+        Feed webm bytes and collect the PCM they produced
+
+        A chunk that starts with an EBML header while the decoder already holds
+        data is a new container (the client restarted its recorder), so the old
+        process is flushed and a fresh one started on the same timeline. A chunk
+        for a different stream id (a new recording, or a stream continued after
+        a reconnect) starts a new timeline at base_offset.
+
+        Args:
+            data: webm bytes (bytes, bytearray or memoryview)
+            stream_id: Client stream the chunk belongs to
+            base_offset: Stream time in seconds at which a new stream's audio starts
+
+        Returns:
+            tuple: (int16 samples decoded since the previous chunk, stream offset in seconds of the first sample)
+        """
+        with self._decode_lock:
+            self.last_used = time.monotonic()
+            if stream_id != self.stream_id:
+                self._begin_stream(stream_id, base_offset)
+            starts_container = bytes(data[:4]) == EBML_MAGIC
+            if self._awaiting_header:
+                if not starts_container:
+                    logger.info(f"Dropping {len(data)} bytes for {self.session_id} until the recorder restarts")
+                    return np.zeros(0, dtype=np.int16), self._stream_offset()
+                self._awaiting_header = False
+            if self._process is not None and (self._process.poll() is not None or
+                                              (self._bytes_fed and starts_container)):
+                self._stop_process()
+            if self._process is None:
+                self._start()
+
+            offset_seconds = self._stream_offset()
+            try:
+                self._process.stdin.write(data)
+                self._process.stdin.flush()
+                self._bytes_fed += len(data)
+            except (BrokenPipeError, OSError) as e:
+                logger.warning(f"ffmpeg decoder for {self.session_id} died: {e}")
+                self._stop_process()
+            self._wait_for_output(time.monotonic())
+
+            samples, self._read_position = self.ring.read_since(self._read_position)
+            return samples, offset_seconds
+
+    def restart(self):
+        """
+        Stop decoding the current container after bytes were lost from it
+
+        The timeline is kept; chunks are dropped until one starts with a new
+        EBML header, i.e. until the client restarts its recorder. This waits for
+        ffmpeg to exit, so call it from the session's job thread, not the event loop.
+        """
+        with self._decode_lock:
+            self._stop_process()
+            self._awaiting_header = True
+
+    def close(self):
+        """Stop the ffmpeg process"""
+        with self._decode_lock:
+            self._stop_process()
+
+class StreamDecoderManager:
+    """
+    Per-socket-session registry of StreamingDecoder instances
+    """
+
+    def __init__(self):
+        # Decoder configuration from environment variables
+        self.buffer_seconds = float(os.getenv('STREAM_DECODER_BUFFER_SECONDS', '120'))
+        self.quiet_seconds = float(os.getenv('STREAM_DECODER_QUIET_SECONDS', '0.15'))
+        self.max_wait_seconds = float(os.getenv('STREAM_DECODER_MAX_WAIT_SECONDS', '3'))
+        self.idle_timeout = float(os.getenv('STREAM_DECODER_IDLE_TIMEOUT', '300'))
+
+        self._decoders: Dict[str, StreamingDecoder] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> StreamingDecoder:
+        """Get the session's decoder, creating it on first use"""
+        self.evict_idle()
+        with self._lock:
+            decoder = self._decoders.get(session_id)
+            if decoder is None:
+                decoder = StreamingDecoder(session_id, self.buffer_seconds, self.quiet_seconds, self.max_wait_seconds)
+                self._decoders[session_id] = decoder
+            return decoder
+
+    def has(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._decoders
+
+    def close(self, session_id: str):
+        """Stop and forget the session's decoder"""
+        with self._lock:
+            decoder = self._decoders.pop(session_id, None)
+        if decoder is not None:
+            decoder.close()
+
+    def evict_idle(self):
+        """Close decoders whose session has not sent audio within idle_timeout"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [sid for sid, d in self._decoders.items() if now - d.last_used > self.idle_timeout]
+            decoders = [self._decoders.pop(sid) for sid in idle]
+        for decoder in decoders:
+            decoder.close()
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'active_decoders': len(self._decoders),
+                'buffer_seconds': self.buffer_seconds,
+                'idle_timeout': self.idle_timeout
+            }
+
+# Global stream decoder manager instance
+stream_decoders = StreamDecoderManager()
@@ -0,0 +1,179 @@
+"""
+Streaming Session state for Voice Stream Application
+Compact per-stream storage of diarized segments with sequence numbers, delta reads and idle eviction
+"""
+
+import os
+import time
+import threading
+import logging
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class StreamingSession:
+    """
+    Append-only segment log for one live stream
+
+    Every segment gets a monotonically increasing sequence number. Times are
+    kept in typed arrays and speakers as indexes into a small label table, so
+    memory per segment is little more than its text. Once the log exceeds
+    max_segments the oldest entries are dropped in batches; their sequence
+    numbers are never reused.
+    """
+
+    def __init__(self, max_segments: int):
+        self.max_segments = max_segments
+        self.first_seq = 0
+        # End in seconds of the audio decoded so far, so a stream resumed on a new socket keeps its timeline
+        self.audio_end = 0.0
+        # SpeakerTracker keeping speaker labels consistent across chunks, created on first use
+        self.speaker_tracker = None
+        self.last_used = time.monotonic()
+        self._starts = array('d')
+        self._ends = array('d')
+        self._speakers = array('H')
+        self._texts: List[str] = []
+        self._speaker_labels: List[str] = []
+        self._speaker_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def next_seq(self) -> int:
+        return self.first_seq + len(self._texts)
+
+    def _speaker_id(self, label: str) -> int:
+        speaker_id = self._speaker_ids.get(label)
+        if speaker_id is None:
+            speaker_id = len(self._speaker_labels)
+            self._speaker_labels.append(label)
+            self._speaker_ids[label] = speaker_id
+        return speaker_id
+
+    def _segment(self, index: int) -> Dict[str, Any]:
+        return {
+            'seq': self.first_seq + index,
+            'speaker': self._speaker_labels[self._speakers[index]],
+            'start': self._starts[index],
+            'end': self._ends[index],
+            'text': self._texts[index]
+        }
+
+    def append(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Store new segments
+
+        Args:
+            segments: Dicts with 'speaker', 'start', 'end' and 'text'
+
+        Returns:
+            list: The same segments with their assigned 'seq'
+        """
+        with self._lock:
+            self.last_used = time.monotonic()
+            stored = []
+            for segment in segments:
+                self._starts.append(float(segment['start']))
+                self._ends.append(float(segment['end']))
+                self._speakers.append(self._speaker_id(segment['speaker']))
+                self._texts.append(segment['text'])
+                stored.append(dict(segment, seq=self.next_seq - 1))
+
+            # Trim in batches so the front deletion cost is amortised
+            excess = len(self._texts) - self.max_segments
+            if excess > self.max_segments // 4:
+                del self._starts[:excess]
+                del self._ends[:excess]
+                del self._speakers[:excess]
+                del self._texts[:excess]
+                self.first_seq += excess
+            return stored
+
+    def since(self, seq: int, limit: int) -> Dict[str, Any]:
+        """
+        Read segments after a sequence number, for clients resynchronising
+
+        Args:
+            seq: Last sequence number the client holds (-1 for everything)
+            limit: Most segments to return
+
+        Returns:
+            dict: 'segments', 'last_seq', 'has_more' and 'truncated' (older segments were evicted)
+        """
+        with self._lock:
+            self.last_used = time.monotonic()
+            start = max(seq + 1, self.first_seq) - self.first_seq
+            end = min(len(self._texts), start + limit)
+            return {
+                'segments': [self._segment(i) for i in range(start, end)],
+                'last_seq': self.next_seq - 1,
+                'has_more': end < len(self._texts),
+                'truncated': seq + 1 < self.first_seq
+            }
+
+class StreamingSessionStore:
+    """
+    Registry of StreamingSession objects with TTL and size-based eviction
+    """
+
+    def __init__(self):
+        # Session store configuration from environment variables
+        self.ttl_seconds = float(os.getenv('STREAMING_SESSION_TTL', '1800'))
+        self.max_sessions = int(os.getenv('STREAMING_SESSION_MAX_SESSIONS', '1000'))
+        self.max_segments = int(os.getenv('STREAMING_SESSION_MAX_SEGMENTS', '20000'))
+        self.resync_limit = int(os.getenv('STREAMING_RESYNC_LIMIT', '500'))
+
+        self._sessions: "OrderedDict[str, StreamingSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+
+    def get(self, stream_id: str, create: bool = True):
+        """Get a stream's session, creating it on first use"""
+        self.evict_idle()
+        with self._lock:
+            session = self._sessions.get(stream_id)
+            if session is None and create:
+                session = StreamingSession(self.max_segments)
+                self._sessions[stream_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evictions += 1
+            if session is not None:
+                self._sessions.move_to_end(stream_id)
+            return session
+
+    def close(self, stream_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(stream_id, None) is not None
+
+    def evict_idle(self):
+        """Drop sessions unused for longer than the TTL, sweeping at most once a minute"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < min(60.0, self.ttl_seconds):
+                return
+            self._last_sweep = now
+            idle = [key for key, session in self._sessions.items() if now - session.last_used > self.ttl_seconds]
+            for key in idle:
+                del self._sessions[key]
+            self.evictions += len(idle)
+        if idle:
+            logger.info(f"Evicted {len(idle)} idle streaming sessions")
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'active_sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'max_segments': self.max_segments,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.evictions
+            }
+
+# Global streaming session store instance
+streaming_store = StreamingSessionStore()
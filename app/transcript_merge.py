@@ -0,0 +1,129 @@
+"""
+Transcript Merge for Voice Stream Application
+Stitches transcripts of overlapping audio windows into de-duplicated, correctly timed segments
+"""
+
+import re
+import logging
+from difflib import SequenceMatcher
+from typing import List, Dict, Any, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Words compared at each seam when aligning by text
+ALIGN_WINDOW_WORDS = 12
+
+def _normalize(word: str) -> str:
+    """Lowercase and strip punctuation for comparison"""
+    return re.sub(r"[^\w']", '', word.lower())
+
+def _timed_words(transcription: Dict[str, Any], start: float, end: float) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Turn one window's transcription into words with absolute times
+
+    Whisper verbose_json carries per-word timings but drops punctuation, so the
+    text tokens are used when they line up one-to-one with the timed words.
+    Without timings the words are spread evenly over the window.
+
+    Returns:
+        tuple: (list of {'word', 'start', 'end'}, whether times are real)
+    """
+    tokens = (transcription.get('text') or '').split()
+    words = transcription.get('words') or []
+    if words:
+        if len(words) == len(tokens):
+            labels = tokens
+        else:
+            labels = [w.get('word', '').strip() for w in words]
+        return [
+            {'word': label, 'start': start + float(w.get('start', 0)), 'end': start + float(w.get('end', 0))}
+            for label, w in zip(labels, words) if label
+        ], True
+
+    if not tokens:
+        return [], False
+    step = (end - start) / len(tokens)
+    return [
+        {'word': token, 'start': start + i * step, 'end': start + (i + 1) * step}
+        for i, token in enumerate(tokens)
+    ], False
+
+def _align_by_text(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]):
+    """
+    Find where the current window's words repeat the previous window's tail
+
+    Returns:
+        tuple: (words of previous to keep, index of the first new word in current), or None if no overlap was found
+    """
+    tail = previous[-ALIGN_WINDOW_WORDS:]
+    head = current[:ALIGN_WINDOW_WORDS]
+    matcher = SequenceMatcher(None, [_normalize(w['word']) for w in tail], [_normalize(w['word']) for w in head], autojunk=False)
+    match = matcher.find_longest_match(0, len(tail), 0, len(head))
+    # A single shared word is too weak to cut on unless it opens the window
+    if match.size == 0 or (match.size == 1 and match.b != 0):
+        return None
+    keep_previous = len(previous) - len(tail) + match.a + match.size
+    return keep_previous, match.b + match.size
+
+def _drop_repeated_seam(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> int:
+    """Number of leading words of current that repeat the end of previous across a time cut"""
+    longest = min(len(previous), len(current), ALIGN_WINDOW_WORDS)
+    for size in range(longest, 0, -1):
+        if [_normalize(w['word']) for w in previous[-size:]] == [_normalize(w['word']) for w in current[:size]]:
+            # A lone repeated word only counts if both copies sit at the same time
+            if size > 1 or abs(previous[-1]['start'] - current[0]['start']) < 0.5:
+                return size
+    return 0
+
+def merge_overlapping_transcripts(windows: List[Tuple[float, float]], transcriptions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge transcripts of overlapping windows so every spoken word appears once
+
+    Where two windows overlap, words are cut at the middle of the overlap
+    using word timestamps (each side contributes the half it heard with more
+    context), then any words repeated across the cut are dropped. Windows
+    without word timestamps are aligned on their text instead.
+
+    Args:
+        windows: (start, end) of each window in seconds, in order
+        transcriptions: API responses for each window, with optional 'words'
+
+    Returns:
+        list: One {'start', 'end', 'text'} per window that still has words, with times narrowed to those words
+    """
+    kept: List[List[Dict[str, Any]]] = []
+    previous_end = None
+    previous_timed = False
+
+    for (start, end), transcription in zip(windows, transcriptions):
+        words, timed = _timed_words(transcription or {}, start, end)
+
+        if kept and kept[-1] and words and previous_end is not None and start < previous_end:
+            previous = kept[-1]
+            if timed and previous_timed:
+                cut = (start + previous_end) / 2
+                previous = [w for w in previous if w['start'] < cut]
+                words = [w for w in words if w['start'] >= cut]
+                words = words[_drop_repeated_seam(previous, words):]
+            else:
+                alignment = _align_by_text(previous, words)
+                if alignment is not None:
+                    keep_previous, first_new = alignment
+                    previous = previous[:keep_previous]
+                    words = words[first_new:]
+            kept[-1] = previous
+
+        kept.append(words)
+        previous_end = end
+        previous_timed = timed
+
+    return [
+        {
+            'start': round(words[0]['start'], 3),
+            'end': round(words[-1]['end'], 3),
+            'text': ' '.join(w['word'] for w in words)
+        }
+        for words in kept if words
+    ]
@@ -0,0 +1,244 @@
+"""
+Transcription Cache for Voice Stream Application
+Content-addressed cache of Whisper results with an in-process LRU tier and an optional SQLite tier
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from app.audio_io import read_wav_info
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TranscriptionCache:
+    """
+    Caches transcription responses keyed by (PCM hash, language, model)
+    """
+
+    def __init__(self):
+        # Cache configuration from environment variables
+        self.cache_mode = os.getenv('TRANSCRIPTION_CACHE', 'memory').lower()  # 'off', 'memory' or 'sqlite'
+        self.max_entries = int(os.getenv('TRANSCRIPTION_CACHE_SIZE', '512'))
+        self.ttl_seconds = float(os.getenv('TRANSCRIPTION_CACHE_TTL', str(7 * 24 * 3600)))
+        self.sqlite_db_path = os.getenv('TRANSCRIPTION_CACHE_DB', 'transcription_cache.db')
+        self.sqlite_max_entries = int(os.getenv('TRANSCRIPTION_CACHE_DB_MAX_ENTRIES', '100000'))
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_prune = 0
+
+        # Hit/miss counters
+        self.memory_hits = 0
+        self.sqlite_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.cache_mode == 'sqlite':
+            self._initialize_sqlite_db()
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache_mode in ('memory', 'sqlite')
+
+    def _initialize_sqlite_db(self):
+        """Create the persistent cache table"""
+        try:
+            conn = sqlite3.connect(self.sqlite_db_path)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS transcription_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_transcription_cache_last_access ON transcription_cache (last_access)')
+            conn.commit()
+            conn.close()
+            logger.info(f"✅ Transcription cache database initialized: {self.sqlite_db_path}")
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize transcription cache database: {str(e)}. Using memory cache only.")
+            self.cache_mode = 'memory'
+
+    def make_key(self, audio_bytes: bytes, language: str, model: str, response_format: str = 'json') -> str:
+        """
+        Build a cache key from the audio content, language, model and response format
+
+        WAV input is hashed over its format fields and PCM payload only, so
+        re-encoded copies with different header chunks share a key.
+
+        Args:
+            audio_bytes: Audio file content
+            language: Transcription language
+            model: Transcription model name
+            response_format: Response variant, e.g. 'json' or 'verbose_json+word'
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        digest = hashlib.sha256()
+        info = read_wav_info(audio_bytes)
+        if info:
+            digest.update(f"pcm:{info['audio_format']}:{info['channels']}:{info['sample_rate']}:{info['bits_per_sample']}".encode())
+            digest.update(memoryview(audio_bytes)[info['data_offset']:info['data_offset'] + info['data_size']])
+        else:
+            digest.update(b'raw:')
+            digest.update(audio_bytes)
+        digest.update(f"|{language}|{model}".encode())
+        if response_format != 'json':
+            digest.update(f"|{response_format}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            dict: Cached response or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return response
+                del self._memory[key]
+
+        if self.cache_mode == 'sqlite':
+            response = self._get_sqlite(key, now)
+            if response is not None:
+                with self._lock:
+                    self.sqlite_hits += 1
+                    self._put_memory(key, response, now)
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, response: Dict[str, Any]):
+        """
+        Store a successful response
+
+        Args:
+            key: Key from make_key
+            response: Decoded API response
+        """
+        now = time.time()
+        with self._lock:
+            self._put_memory(key, response, now)
+        if self.cache_mode == 'sqlite':
+            self._put_sqlite(key, response, now)
+
+    def _put_memory(self, key: str, response: Dict[str, Any], now: float):
+        """Insert into the LRU tier, evicting the least recently used entries (lock held)"""
+        self._memory[key] = (response, now)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _get_sqlite(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """Read a non-expired entry from the SQLite tier"""
+        try:
+            conn = sqlite3.connect(self.sqlite_db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT response, created_at FROM transcription_cache WHERE cache_key = ?', (key,))
+            row = cursor.fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                conn.close()
+                return None
+            cursor.execute('UPDATE transcription_cache SET last_access = ? WHERE cache_key = ?', (now, key))
+            conn.commit()
+            conn.close()
+            return json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Transcription cache read failed: {str(e)}")
+            return None
+
+    def _put_sqlite(self, key: str, response: Dict[str, Any], now: float):
+        """Write an entry to the SQLite tier, pruning periodically"""
+        try:
+            conn = sqlite3.connect(self.sqlite_db_path)
+            conn.execute('''
+                INSERT OR REPLACE INTO transcription_cache (cache_key, response, created_at, last_access)
+                VALUES (?, ?, ?, ?)
+            ''', (key, json.dumps(response), now, now))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Transcription cache write failed: {str(e)}")
+            return
+
+        with self._lock:
+            self._puts_since_prune += 1
+            should_prune = self._puts_since_prune >= 100
+            if should_prune:
+                self._puts_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Remove expired entries and trim the SQLite tier to its size limit
+
+        Returns:
+            int: Number of rows removed
+        """
+        if self.cache_mode != 'sqlite':
+            return 0
+        try:
+            conn = sqlite3.connect(self.sqlite_db_path)
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM transcription_cache WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+            removed = cursor.rowcount
+            cursor.execute('''
+                DELETE FROM transcription_cache WHERE cache_key IN (
+                    SELECT cache_key FROM transcription_cache
+                    ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.sqlite_max_entries,))
+            removed += cursor.rowcount
+            conn.commit()
+            conn.close()
+            with self._lock:
+                self.evictions += removed
+            return removed
+        except Exception as e:
+            logger.warning(f"Transcription cache prune failed: {str(e)}")
+            return 0
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """Get current cache configuration and hit/miss counters"""
+        with self._lock:
+            lookups = self.memory_hits + self.sqlite_hits + self.misses
+            return {
+                'cache_mode': self.cache_mode,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'sqlite_db_path': self.sqlite_db_path if self.cache_mode == 'sqlite' else None,
+                'memory_hits': self.memory_hits,
+                'sqlite_hits': self.sqlite_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.memory_hits + self.sqlite_hits) / lookups if lookups else None
+            }
+
+# Global transcription cache instance
+transcription_cache = TranscriptionCache()
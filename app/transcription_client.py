@@ -0,0 +1,264 @@
+"""
+Transcription Client for Voice Stream Application
+Sends audio to the Whisper transcription API over a pooled keep-alive HTTP session
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import deque
+from typing import Optional, Dict, Any, BinaryIO, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv, find_dotenv
+
+from app.transcription_cache import transcription_cache
+from app.rate_control import TokenBucket, AdaptiveConcurrencyLimiter, backoff_delay, parse_retry_after
+
+# Load environment variables
+load_dotenv(find_dotenv())
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying, and the subset that signal provider overload
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+THROTTLE_STATUS_CODES = {429, 503}
+
+class TranscriptionAPIError(Exception):
+    """Raised when the API still returns an error after all retries"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Transcription API error {status_code}: {message}")
+        self.status_code = status_code
+
+class TranscriptionClient:
+    """
+    Whisper API client sharing one connection pool across all callers in the process
+    """
+
+    def __init__(self):
+        # Client configuration from environment variables
+        self.api_key = os.getenv('OPENAI_API_KEY')
+        self.base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
+        self.model = os.getenv('TRANSCRIPTION_MODEL', 'whisper-1')
+        self.concurrency = max(1, int(os.getenv('TRANSCRIPTION_CONCURRENCY', '4')))
+        # Leave headroom above the segment pool for socket handlers and batch endpoints
+        self.pool_size = max(1, int(os.getenv('TRANSCRIPTION_POOL_SIZE', str(self.concurrency + 4))))
+        self.connect_timeout = float(os.getenv('TRANSCRIPTION_CONNECT_TIMEOUT', '5'))
+        self.read_timeout = float(os.getenv('TRANSCRIPTION_READ_TIMEOUT', '60'))
+        self.max_retries = max(0, int(os.getenv('TRANSCRIPTION_MAX_RETRIES', '4')))
+        self.backoff_base = float(os.getenv('TRANSCRIPTION_BACKOFF_BASE', '0.5'))
+        self.backoff_cap = float(os.getenv('TRANSCRIPTION_BACKOFF_CAP', '30'))
+
+        self.session = self._create_session()
+
+        # Shared by every call site so the whole process stays under the provider limits
+        self.rate_limiter = TokenBucket(
+            rate_per_second=float(os.getenv('TRANSCRIPTION_REQUESTS_PER_MINUTE', '500')) / 60.0,
+            burst=int(os.getenv('TRANSCRIPTION_BURST', '10'))
+        )
+        self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+            initial=self.concurrency,
+            minimum=1,
+            maximum=self.pool_size
+        )
+
+        # Latency metrics
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self.request_count = 0
+        self.error_count = 0
+        self.total_latency = 0.0
+        self.status_counts: Dict[str, int] = {}
+        self.retry_count = 0
+
+    def _create_session(self) -> requests.Session:
+        """Create a requests session with a connection pool sized for the worker concurrency"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({'Authorization': f'Bearer {self.api_key}'})
+        return session
+
+    @property
+    def timeout(self):
+        """(connect, read) timeout tuple passed to every request"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def transcribe(self, audio_file: Union[bytes, BinaryIO], language: str = 'en', word_timestamps: bool = False) -> Dict[str, Any]:
+        """
+        Transcribe a WAV file with Whisper
+
+        Args:
+            audio_file: WAV content as bytes or file-like object
+            language: ISO-639-1 language code
+            word_timestamps: Request verbose_json with per-word 'words' timings
+
+        Returns:
+            dict: Decoded JSON response from the API
+
+        Raises:
+            TranscriptionAPIError: The API returned an error after all retries
+        """
+        # Read once so retries can resend the same body
+        audio_bytes = audio_file.read() if hasattr(audio_file, 'read') else bytes(audio_file)
+
+        response_format = 'verbose_json+word' if word_timestamps else 'json'
+        cache_key = None
+        if transcription_cache.enabled:
+            cache_key = transcription_cache.make_key(audio_bytes, language, self.model, response_format)
+            cached = transcription_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        files = {
+            'file': ('audio.wav', audio_bytes, 'audio/wav'),
+            'model': (None, self.model),
+            'language': (None, language)
+        }
+        if word_timestamps:
+            files['response_format'] = (None, 'verbose_json')
+            files['timestamp_granularities[]'] = (None, 'word')
+        response = self.post('audio/transcriptions', files=files)
+        if not response.ok:
+            raise TranscriptionAPIError(response.status_code, self._error_message(response))
+        result = response.json()
+
+        if cache_key and 'text' in result:
+            transcription_cache.put(cache_key, result)
+        return result
+
+    def speech(self, text: str, voice: str = 'alloy', model: str = 'tts-1', response_format: str = 'mp3') -> requests.Response:
+        """
+        Synthesize speech, returning a streaming response
+
+        Args:
+            text: Text to speak
+            voice: Voice name
+            model: TTS model name
+            response_format: Audio format of the response body
+
+        Returns:
+            requests.Response: Response to iterate with iter_content
+        """
+        data = {
+            'model': model,
+            'input': text,
+            'voice': voice,
+            'response_format': response_format
+        }
+        return self.post('audio/speech', json=data, stream=True)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        """
+        POST to an API path relative to the base URL
+
+        Each attempt waits for the shared rate limiter and concurrency limiter.
+        429/5xx responses and connection errors are retried with jittered
+        exponential backoff that honours Retry-After.
+
+        Args:
+            path: Path below the base URL, e.g. 'audio/transcriptions'
+            **kwargs: Passed through to requests.Session.post
+
+        Returns:
+            requests.Response: The final API response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        url = f"{self.base_url}/{path}"
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            self.concurrency_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(time.perf_counter() - start, 'exception')
+                self.concurrency_limiter.release()
+                if attempt == self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                logger.warning(f"{path} request failed ({e}), retrying in {delay:.2f}s")
+                self._sleep_before_retry(delay)
+                continue
+            except Exception:
+                self._record(time.perf_counter() - start, 'exception')
+                self.concurrency_limiter.release()
+                raise
+
+            self._record(time.perf_counter() - start, str(response.status_code))
+            self.concurrency_limiter.release(throttled=response.status_code in THROTTLE_STATUS_CODES)
+
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None and response.status_code == 429:
+                # Hold back every caller, not just this one
+                self.rate_limiter.pause(retry_after)
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap, retry_after)
+            logger.warning(f"{path} returned {response.status_code}, retrying in {delay:.2f}s")
+            response.close()
+            self._sleep_before_retry(delay)
+
+    def _sleep_before_retry(self, delay: float):
+        with self._metrics_lock:
+            self.retry_count += 1
+        time.sleep(delay)
+
+    def _error_message(self, response: requests.Response) -> str:
+        """Extract the provider's error message from a failed response"""
+        try:
+            return response.json().get('error', {}).get('message') or response.reason
+        except Exception:
+            return response.text[:200] or response.reason
+
+    def _record(self, latency: float, status: str):
+        """Record the outcome of one API call"""
+        with self._metrics_lock:
+            self.request_count += 1
+            self.total_latency += latency
+            self._latencies.append(latency)
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            if status == 'exception' or not status.startswith('2'):
+                self.error_count += 1
+
+    def _percentile(self, values, fraction: float) -> Optional[float]:
+        """Nearest-rank percentile of a sorted list"""
+        if not values:
+            return None
+        index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+        return values[index]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request counts and latency statistics for this process"""
+        with self._metrics_lock:
+            recent = sorted(self._latencies)
+            count = self.request_count
+            return {
+                'base_url': self.base_url,
+                'model': self.model,
+                'pool_size': self.pool_size,
+                'concurrency': self.concurrency,
+                'timeout': {'connect': self.connect_timeout, 'read': self.read_timeout},
+                'request_count': count,
+                'error_count': self.error_count,
+                'status_counts': dict(self.status_counts),
+                'retry_count': self.retry_count,
+                'rate_limiter': self.rate_limiter.get_info(),
+                'concurrency_limiter': self.concurrency_limiter.get_info(),
+                'mean_latency_seconds': self.total_latency / count if count else None,
+                'p50_latency_seconds': self._percentile(recent, 0.50),
+                'p95_latency_seconds': self._percentile(recent, 0.95),
+                'max_latency_seconds': recent[-1] if recent else None,
+                'cache': transcription_cache.get_cache_info()
+            }
+
+# Global transcription client instance
+transcription_client = TranscriptionClient()
@@ -0,0 +1,205 @@
+"""
+Voice Activity Detection for Voice Stream Application
+Vectorized frame-level energy and spectral-flatness VAD that turns audio into speech-aligned segments
+"""
+
+import os
+import logging
+from typing import List, Tuple, Optional, Dict, Any
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Frames per FFT block, bounding memory on hour-long inputs
+FFT_BLOCK_FRAMES = 8192
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Run-length encode a boolean mask into (starts, lengths, values)"""
+    if len(mask) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=bool)
+    boundaries = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.concatenate(([0], boundaries))
+    lengths = np.diff(np.concatenate((starts, [len(mask)])))
+    return starts, lengths, mask[starts]
+
+class SpeechMap:
+    """
+    Frame-level speech decisions for one buffer, with helpers to cut it into segments
+    """
+
+    def __init__(self, speech: np.ndarray, energy_db: np.ndarray, frame_seconds: float, duration: float):
+        self.speech = speech
+        self.energy_db = energy_db
+        self.frame_seconds = frame_seconds
+        self.duration = duration
+
+    @property
+    def regions(self) -> List[Tuple[float, float]]:
+        """Speech regions as (start, end) seconds"""
+        starts, lengths, values = _runs(self.speech)
+        return [
+            (round(float(s * self.frame_seconds), 3), round(float(min((s + n) * self.frame_seconds, self.duration)), 3))
+            for s, n in zip(starts[values], lengths[values])
+        ]
+
+    @property
+    def speech_seconds(self) -> float:
+        return float(self.speech.sum() * self.frame_seconds)
+
+    def has_speech(self) -> bool:
+        return bool(self.speech.any())
+
+    def _quietest_cut(self, start: float, end: float) -> float:
+        """Time of the lowest-energy frame between two times, to split away from words"""
+        first = int(start / self.frame_seconds)
+        last = max(first + 1, int(end / self.frame_seconds))
+        window = self.energy_db[first:last]
+        if len(window) == 0:
+            return end
+        return float((first + int(np.argmin(window))) * self.frame_seconds)
+
+    def segments(self, max_seconds: float, overlap_seconds: float = 0.0, max_gap_seconds: float = 1.0,
+                 within: Optional[Tuple[float, float]] = None) -> List[Tuple[float, float]]:
+        """
+        Build variable-length segments that follow speech
+
+        Nearby regions are packed together up to max_seconds. A region longer than
+        max_seconds is split at the quietest frame in the last third of each piece,
+        or, when overlap_seconds is set, into fixed windows overlapping by that much.
+
+        Args:
+            max_seconds: Longest segment
+            overlap_seconds: Overlap between pieces of one split region
+            max_gap_seconds: Largest silence allowed inside a packed segment
+            within: Optional (start, end) to restrict segmentation to
+
+        Returns:
+            list: (start, end) pairs in seconds, in order
+        """
+        regions = self.regions
+        if within is not None:
+            regions = [(max(s, within[0]), min(e, within[1])) for s, e in regions if e > within[0] and s < within[1]]
+
+        segments: List[Tuple[float, float]] = []
+        for start, end in regions:
+            if segments and start - segments[-1][1] <= max_gap_seconds and end - segments[-1][0] <= max_seconds:
+                segments[-1] = (segments[-1][0], end)
+                continue
+            while end - start > max_seconds:
+                if overlap_seconds:
+                    # The overlap already covers words on the seam
+                    cut = start + max_seconds
+                else:
+                    cut = self._quietest_cut(start + max_seconds * 2 / 3, start + max_seconds)
+                segments.append((round(start, 3), round(cut, 3)))
+                start = max(start + 0.5, cut - overlap_seconds)
+            segments.append((round(start, 3), round(end, 3)))
+        return segments
+
+class VoiceActivityDetector:
+    """
+    Energy plus spectral-flatness voice activity detector
+
+    Frames are scored in one pass over the whole buffer. A frame is speech when
+    it is louder than the estimated noise floor by energy_margin_db, above an
+    absolute floor, and tonal enough (low spectral flatness) to not be broadband
+    noise. Short gaps are bridged, short bursts dropped and regions padded.
+    """
+
+    def __init__(self):
+        # VAD configuration from environment variables
+        self.frame_ms = float(os.getenv('VAD_FRAME_MS', '20'))
+        self.energy_margin_db = float(os.getenv('VAD_ENERGY_MARGIN_DB', '12'))
+        self.absolute_floor_db = float(os.getenv('VAD_ABSOLUTE_FLOOR_DB', '-55'))
+        self.max_flatness = float(os.getenv('VAD_MAX_FLATNESS', '0.3'))
+        self.min_speech_ms = float(os.getenv('VAD_MIN_SPEECH_MS', '200'))
+        self.min_silence_ms = float(os.getenv('VAD_MIN_SILENCE_MS', '300'))
+        self.pad_ms = float(os.getenv('VAD_PAD_MS', '150'))
+
+    def _frame_features(self, samples: np.ndarray, frame_length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-frame energy in dBFS and spectral flatness"""
+        n_frames = len(samples) // frame_length
+        frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length)
+        energy_db = 10.0 * np.log10(np.maximum(np.mean(frames ** 2, axis=1), 1e-12))
+
+        window = np.hanning(frame_length).astype(np.float32)
+        flatness = np.empty(n_frames, dtype=np.float32)
+        for block in range(0, n_frames, FFT_BLOCK_FRAMES):
+            power = np.abs(np.fft.rfft(frames[block:block + FFT_BLOCK_FRAMES] * window, axis=1)) ** 2 + 1e-12
+            flatness[block:block + FFT_BLOCK_FRAMES] = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return energy_db, flatness
+
+    def _smooth(self, speech: np.ndarray) -> np.ndarray:
+        """Bridge short silences, drop short bursts, then pad speech regions"""
+        min_silence = int(self.min_silence_ms / self.frame_ms)
+        min_speech = int(self.min_speech_ms / self.frame_ms)
+        pad = int(self.pad_ms / self.frame_ms)
+
+        starts, lengths, values = _runs(speech)
+        interior = (np.arange(len(values)) > 0) & (np.arange(len(values)) < len(values) - 1)
+        values = values | (~values & interior & (lengths < min_silence))
+        speech = np.repeat(values, lengths)
+
+        starts, lengths, values = _runs(speech)
+        values = values & (lengths >= min_speech)
+        speech = np.repeat(values, lengths)
+
+        if pad and speech.any():
+            # Dilate by pad frames on each side with a cumulative sum over the mask
+            padded = np.concatenate((np.zeros(pad + 1, dtype=int), speech.astype(int), np.zeros(pad, dtype=int)))
+            cumulative = np.cumsum(padded)
+            speech = (cumulative[2 * pad + 1:] - cumulative[:len(speech)]) > 0
+        return speech
+
+    def analyze(self, samples, sample_rate: int) -> SpeechMap:
+        """
+        Find speech in a mono buffer
+
+        Args:
+            samples: Float samples in [-1, 1] or int16 PCM, shaped (samples,)
+            sample_rate: Sample rate in Hz
+
+        Returns:
+            SpeechMap: Frame decisions and segmentation helpers
+        """
+        samples = np.asarray(samples)
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        else:
+            samples = samples.astype(np.float32, copy=False)
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        frame_seconds = frame_length / sample_rate
+        duration = len(samples) / sample_rate
+
+        if len(samples) < frame_length:
+            return SpeechMap(np.zeros(0, dtype=bool), np.zeros(0, dtype=np.float32), frame_seconds, duration)
+
+        energy_db, flatness = self._frame_features(samples, frame_length)
+        noise_floor = np.percentile(energy_db, 10)
+        speech = (
+            (energy_db > noise_floor + self.energy_margin_db) &
+            (energy_db > self.absolute_floor_db) &
+            (flatness < self.max_flatness)
+        )
+        # Audio that is loud throughout has no quiet frames to estimate the floor from
+        if not speech.any() and np.percentile(energy_db, 90) - noise_floor < self.energy_margin_db:
+            speech = (energy_db > self.absolute_floor_db + self.energy_margin_db) & (flatness < self.max_flatness)
+
+        return SpeechMap(self._smooth(speech), energy_db, frame_seconds, duration)
+
+    def get_vad_info(self) -> Dict[str, Any]:
+        return {
+            'frame_ms': self.frame_ms,
+            'energy_margin_db': self.energy_margin_db,
+            'absolute_floor_db': self.absolute_floor_db,
+            'max_flatness': self.max_flatness,
+            'min_speech_ms': self.min_speech_ms,
+            'min_silence_ms': self.min_silence_ms,
+            'pad_ms': self.pad_ms
+        }
+
+# Global voice activity detector instance
+vad = VoiceActivityDetector()
@@ -0,0 +1,126 @@
+"""
+Warm-up for Voice Stream Application
+Loads heavy subsystems in the background after startup and reports which are ready
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Callable, Dict, Any, List
+
+from app.job_dispatcher import job_dispatcher
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class WarmupManager:
+    """
+    Registry of lazily loaded subsystems with background warm-up and readiness state
+
+    Every subsystem still loads itself on first use; warm-up only moves that
+    cost off the first request. A subsystem is reported warm as soon as its
+    check passes, whether warm-up or a request loaded it.
+    """
+
+    def __init__(self):
+        # Warm-up configuration from environment variables
+        self.enabled = os.getenv('WARMUP_ON_START', 'yes').lower() == 'yes'
+        self.subsystems = self._parse_list(os.getenv('WARMUP_SUBSYSTEMS', 'database,storage,torch'))
+        self.required = self._parse_list(os.getenv('READINESS_REQUIRED', 'database,storage'))
+
+        self._loaders: Dict[str, Callable] = {}
+        self._checks: Dict[str, Callable[[], bool]] = {}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.started_at = None
+
+    @staticmethod
+    def _parse_list(value: str) -> List[str]:
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    def register(self, name: str, loader: Callable, is_warm: Callable[[], bool]):
+        """
+        Register a subsystem
+
+        Args:
+            name: Subsystem name used in configuration and status
+            loader: Callable that loads the subsystem; safe to call more than once
+            is_warm: Callable returning whether the subsystem is loaded
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._checks[name] = is_warm
+            self._state.setdefault(name, {'warming': False, 'load_time_seconds': None, 'error': None})
+
+    def warm(self, name: str) -> bool:
+        """Load one subsystem now, recording its load time or error"""
+        with self._lock:
+            state = self._state[name]
+            state['warming'] = True
+        start = time.perf_counter()
+        try:
+            self._loaders[name]()
+            state['load_time_seconds'] = round(time.perf_counter() - start, 3)
+            state['error'] = None
+            logger.info(f"✅ Warmed {name} in {state['load_time_seconds']:.2f}s")
+            return True
+        except Exception as e:
+            state['error'] = str(e)
+            logger.error(f"❌ Warm-up of {name} failed: {str(e)}")
+            return False
+        finally:
+            state['warming'] = False
+
+    def _warm_all(self):
+        for name in self.subsystems:
+            if name in self._loaders and not self._checks[name]():
+                job_dispatcher.run_blocking(self.warm, name)
+
+    def start(self, socketio):
+        """
+        Warm the configured subsystems in a background task
+
+        With eventlet or gevent the task first runs once the server loop has
+        started, so the port is already listening; loaders run on a native thread.
+
+        Args:
+            socketio: Socket.IO server used to start the background task
+        """
+        if not self.enabled:
+            return
+        unknown = [name for name in self.subsystems if name not in self._loaders]
+        if unknown:
+            logger.warning(f"Unknown warm-up subsystems ignored: {', '.join(unknown)}")
+        self.started_at = time.time()
+        socketio.start_background_task(self._warm_all)
+
+    def subsystem_status(self, name: str) -> str:
+        state = self._state[name]
+        if self._checks[name]():
+            return 'warm'
+        if state['warming']:
+            return 'warming'
+        return 'failed' if state['error'] else 'cold'
+
+    def is_ready(self) -> bool:
+        """Whether every required subsystem is warm"""
+        return all(name in self._checks and self._checks[name]() for name in self.required)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            names = list(self._loaders)
+        return {
+            'ready': self.is_ready(),
+            'required': self.required,
+            'warmup_enabled': self.enabled,
+            'warmup_started_at': self.started_at,
+            'subsystems': {
+                name: dict(self._state[name], status=self.subsystem_status(name))
+                for name in names
+            }
+        }
+
+# Global warm-up manager instance
+warmup = WarmupManager()
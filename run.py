@@ -1,5 +1,7 @@
 from app import app, socketio
 from app.routes import register_socketio_events
+from app.model_registry import model_registry
+from app.warmup import warmup
 import os
 
 if __name__ == '__main__':
@@ -10,5 +12,11 @@ if __name__ == '__main__':
     # Register socket events
     register_socketio_events(socketio)
 
+    # Load heavy subsystems in the background once the server is listening;
+    # the speaker model is included when PRELOAD_SPEAKER_MODEL=yes
+    if model_registry.preload and 'speaker_model' not in warmup.subsystems:
+        warmup.subsystems.append('speaker_model')
+    warmup.start(socketio)
+
     # Run the app
     socketio.run(app, host='0.0.0.0', port=5050, debug=True)